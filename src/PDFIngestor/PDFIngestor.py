@@ -1,53 +1,126 @@
 from langchain_docling import DoclingLoader
 from langchain_docling.loader import ExportType
 from docling.chunking import HybridChunker
-from langchain_pinecone import PineconeEmbeddings
-from pinecone import Pinecone, ServerlessSpec
-from langchain_pinecone import PineconeVectorStore
+from docling.document_converter import DocumentConverter
+import hashlib
 import json
+import logging
 import os
-import time
+import re
+import threading
+from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import get_context
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
 import pymupdf  # PyMuPDF
 import os
 
+import constants
+from clients import get_agent, get_shared_embedding_backend
+from vector_store import get_vector_store
+from query_cache import get_index_versions
+from context_packer import count_tokens
+from pre_extraction import extract_items_by_chunk
+from requirement_index import get_requirement_index
+from PDFIngestor.ingestion_cache import IngestionCache
+
+logger = logging.getLogger(__name__)
+
+# Regex hit na ho tab bhi in words wale chunks LLM extraction mein jaate hai
+REQUIREMENT_KEYWORDS = re.compile(
+    r"\b(?:form|exhibit|attachment|appendix|certif\w*|licen[cs]\w*|"
+    r"registration|section|clause|insurance|bond|deadline|due)\b",
+    re.IGNORECASE,
+)
+
+
+def chunk_filename(doc):
+    """Chunk kis file se aaya hai"""
+
+    return os.path.basename(doc.metadata.get("source", ""))
+
+
+def chunk_source(doc):
+    """Chunk ka `source` metadata, wahi value jis par QueryAgent filter karta hai"""
+
+    return doc.metadata.get("source", "")
+
+
+def chunk_id_prefix(source):
+    """
+    Source ke saare chunk IDs ka common prefix, Pinecone list(prefix=...) ke liye.
+    Alag directories ki same naam wali PDFs ke IDs alag rehte hai, aur moved
+    file ke chunks naye source ke saath naye IDs par upsert hote hai.
+    """
+
+    return "src:" + quote(source, safe="") + "#"
+
+
+def legacy_chunk_id_prefix(filename):
+    # Purane sirf-basename wale IDs; quote ":" ko escape karta hai, toh yeh
+    # kabhi "src:" wale naye IDs se match nahi hote
+    return quote(filename, safe="") + "#"
+
+
+def chunk_id(doc):
+    """Source + normalised text hash se deterministic chunk ID"""
+
+    normalised = " ".join(doc.page_content.split())
+    text_hash = hashlib.sha256(normalised.encode("utf-8")).hexdigest()[:32]
+    return chunk_id_prefix(chunk_source(doc)) + text_hash
+
+
+def convert_pdf_to_chunks(path_to_pdf, tokenizer, max_tokens):
+    """Docling conversion + HybridChunker, module level taaki process pool mein chale"""
+
+    loader = DoclingLoader(
+        file_path=path_to_pdf,
+        export_type=ExportType.DOC_CHUNKS,
+        chunker=HybridChunker(tokenizer=tokenizer, max_tokens=max_tokens),
+    )
+
+    chunks = loader.load()
+
+    for doc in chunks:
+        if "dl_meta" in doc.metadata:
+            # doc.metadata["dl_meta"] = json.dumps(doc.metadata["dl_meta"])
+            doc.metadata["dl_meta"] = doc.metadata["dl_meta"]["origin"]["filename"]
+
+    return chunks
+
 
 class DataIngestor:
-    """Ye data ingest karega from files to Pinecone"""
+    """Ye data ingest karega from files to the vector index (Pinecone ya local)"""
 
-    def __init__(self):
+    def __init__(self, embedding_backend=None):
         """DataIngestor ko Initialise karega"""
 
-        self.embeddings = PineconeEmbeddings(
-            model="llama-text-embed-v2",
-            pinecone_api_key=os.environ.get("PINECONE_API_KEY"),
-            batch_size=32,
-            document_params={"input_type": "passage", "truncation": "END"},
-        )
+        # Default constants.EMBEDDING_BACKEND se aata hai ("pinecone" ya "local")
+        self.embeddings = embedding_backend or get_shared_embedding_backend()
 
-        self.pinecone = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+        # index_name -> VectorStore, index pehle write par hi banta hai
+        self.stores = {}
+        self.stores_lock = threading.Lock()
 
-    def load_pdf_into_docling_chunks(self, path_to_pdf):
-        """PDF ka docling banaega"""
+        self.cache = IngestionCache(constants.INGEST_CACHE_DIR)
 
-        loader = DoclingLoader(
-            file_path=path_to_pdf,
-            export_type=ExportType.DOC_CHUNKS,
-            chunker=HybridChunker(
-                tokenizer="sentence-transformers/all-MiniLM-L6-v2", max_tokens=1024
-            ),
-        )
+    def chunker_config(self):
+        """HybridChunker ki settings, cache key ka hissa hai"""
 
-        chunks = loader.load()
+        return {
+            "tokenizer": constants.EMBED_MODEL_ID,
+            "max_tokens": constants.CHUNK_MAX_TOKENS,
+        }
 
-        for doc in chunks:
-            if "dl_meta" in doc.metadata:
-                # doc.metadata["dl_meta"] = json.dumps(doc.metadata["dl_meta"])
-                doc.metadata["dl_meta"] = doc.metadata["dl_meta"]["origin"]["filename"]
+    def load_pdf_into_docling_chunks(self, path_to_pdf):
+        """PDF ka docling banaega"""
 
-        return chunks
+        config = self.chunker_config()
+        return convert_pdf_to_chunks(
+            path_to_pdf, config["tokenizer"], config["max_tokens"]
+        )
 
     # def load_pdf_into_docling_chunks(self, path_to_pdf):
     #     """Simple and fast PDF loader with basic chunking"""
@@ -66,46 +139,471 @@ class DataIngestor:
 
     #     return chunks
 
-    def load_chunks_into_pinecone(self, docling_chunks, index_name, namespace):
-        """Docling chunks ko Pinecone mein daal dega"""
+    def embed_chunks(self, docling_chunks):
+        """Chunks ke embeddings banaega"""
 
-        existing_indexes = [
-            index_info["name"] for index_info in self.pinecone.list_indexes()
-        ]
+        if not docling_chunks:
+            return []
 
-        if index_name not in existing_indexes:
-            self.pinecone.create_index(
-                name=index_name,
-                dimension=1024,
-                metric="cosine",
-                spec=ServerlessSpec(
-                    cloud=os.getenv("PINECONE_CLOUD"),
-                    region=os.getenv("PINECONE_REGION"),
-                ),
-            )
-            while not self.pinecone.describe_index(index_name).status["ready"]:
-                time.sleep(1)
+        return self.embeddings.embed_documents(
+            [doc.page_content for doc in docling_chunks]
+        )
+
+    def ensure_index(self, index_name):
+        """Index ka VectorStore handle, constants.VECTOR_STORE ke hisaab se"""
 
-        index = self.pinecone.Index(index_name)
+        with self.stores_lock:
+            if index_name not in self.stores:
+                self.stores[index_name] = get_vector_store(
+                    index_name, self.embeddings.dimension
+                )
+            return self.stores[index_name]
 
-        vectorStore = PineconeVectorStore.from_documents(
-            documents=docling_chunks,
-            index_name=index_name,
-            embedding=self.embeddings,
-            namespace=namespace,
+    def existing_chunk_ids(self, store, source, namespace):
+        """
+        Index mein is source ke already maujood chunk IDs, saath mein usi
+        basename ke purane format wale IDs (woh sab stale maane jaate hai)
+        """
+
+        return store.list_ids(chunk_id_prefix(source), namespace) | store.list_ids(
+            legacy_chunk_id_prefix(os.path.basename(source)), namespace
         )
 
-        # time.sleep(10)
+    def load_chunks_into_pinecone(
+        self,
+        docling_chunks,
+        index_name,
+        namespace,
+        vectors=None,
+        cache_key=None,
+    ):
+        """
+        Docling chunks ko vector index ke saath sync karega.
+
+        Sirf naye ya badle hue chunks embed + upsert hote hai, aur file ke jo
+        chunks ab document mein nahi hai unke vectors delete ho jate hai.
+        `vectors` na diye ho aur `cache_key` diya ho toh poore document ke
+        vectors ingestion cache mein bhi likh deta hai.
+        """
+
+        store = self.ensure_index(index_name)
+
+        # Same text wale chunks ek hi ID par map hote hai, pehla wala rakho
+        positions = {}
+        for position, doc in enumerate(docling_chunks):
+            positions.setdefault(chunk_id(doc), position)
+
+        existing = set()
+        for source in {chunk_source(doc) for doc in docling_chunks}:
+            existing |= self.existing_chunk_ids(store, source, namespace)
+
+        new_ids = [cid for cid in positions if cid not in existing]
+        stale_ids = list(existing - positions.keys())
+        new_chunks = [docling_chunks[positions[cid]] for cid in new_ids]
+
+        if vectors is None:
+            new_vectors = self.embed_chunks(new_chunks)
+        else:
+            new_vectors = [vectors[positions[cid]] for cid in new_ids]
+
+        self.upsert_vectors(store, new_ids, new_chunks, new_vectors, namespace)
+        store.delete(stale_ids, namespace)
+        if new_ids or stale_ids:
+            # QueryCache mein is file ke purane results invalid karo
+            get_index_versions().bump(
+                namespace, {chunk_filename(doc) for doc in docling_chunks}
+            )
+
+        if vectors is None and cache_key is not None:
+            # Unchanged chunks ke vectors embed karne ki jagah index se fetch karo
+            known = dict(zip(new_ids, new_vectors))
+            known.update(
+                store.fetch([cid for cid in positions if cid not in known], namespace)
+            )
+            if known.keys() >= positions.keys():
+                self.cache.put(
+                    cache_key,
+                    [docling_chunks[position] for position in positions.values()],
+                    [known[cid] for cid in positions],
+                )
+
+        self.index_requirements(docling_chunks, namespace)
 
         print("Index after upsert:")
-        print(self.pinecone.Index(index_name).describe_index_stats())
+        print(store.describe())
         print("\n")
 
+        return {
+            "upserted": len(new_ids),
+            "deleted": len(stale_ids),
+            "unchanged": len(positions) - len(new_ids),
+        }
+
+    def index_requirements(self, docling_chunks, namespace):
+        """
+        Per-file requirement index ko chunks ke saath sync karega.
+
+        Sirf woh chunks LLM extraction mein jaate hai jo pehle index nahi hue,
+        aur document se hat chuke chunks ki rows delete hoti hai.
+        """
+
+        if not constants.REQUIREMENT_INDEX_ENABLED:
+            return
+
+        texts_by_file = {}
+        for doc in docling_chunks:
+            texts_by_file.setdefault(chunk_filename(doc), {}).setdefault(
+                chunk_id(doc), doc.page_content
+            )
+
+        index = get_requirement_index()
+        for filename, texts in texts_by_file.items():
+            indexed = index.indexed_chunk_ids(namespace, filename)
+            index.remove_chunks(namespace, filename, indexed - texts.keys())
+            self.extract_requirements(
+                filename,
+                [(cid, text) for cid, text in texts.items() if cid not in indexed],
+                namespace,
+            )
+
+    def extract_requirements(self, filename, pending, namespace):
+        """(chunk_id, text) pairs se requirements nikal kar index mein likhega"""
+
+        if not pending:
+            return
+
+        regex_items = extract_items_by_chunk([text for _, text in pending])
+
+        # Jin chunks mein na regex hit hai na koi requirement keyword, unhe LLM
+        # ko bhejne ka fayda nahi; woh seedha khali result ke saath index hote hai
+        items_by_chunk = {
+            cid: []
+            for (cid, text), items in zip(pending, regex_items)
+            if not items and not REQUIREMENT_KEYWORDS.search(text)
+        }
+        candidates = [pair for pair in pending if pair[0] not in items_by_chunk]
+
+        if candidates:
+            # Import yahan taaki ingest-only setups ko Gemini deps ki zarurat na pade
+            from agents.requirement_extractor import RequirementExtractor
+
+            try:
+                items_by_chunk.update(
+                    get_agent(RequirementExtractor).extract(candidates)
+                )
+            except Exception:
+                # In chunks ki rows nahi likhi jaati, agla ingest inhe dobara try karega
+                logger.exception(
+                    f"Requirement extraction failed for {filename}; "
+                    f"{len(candidates)} of {len(pending)} chunks left unindexed."
+                )
+                return
+
+        # Regex wale items (durations, page limits, fonts, ...) bhi saath mein,
+        # LLM ne jo already pakda hai woh dobara nahi
+        for (cid, _), items in zip(pending, regex_items):
+            if cid not in items_by_chunk:
+                continue
+            known = {
+                (item["kind"], item["normalized"] or item["value"])
+                for item in items_by_chunk[cid]
+            }
+            items_by_chunk[cid].extend(
+                item
+                for item in items
+                if (item["kind"], item["normalized"] or item["value"]) not in known
+            )
+
+        get_requirement_index().add_chunks(namespace, filename, items_by_chunk)
+
+    def upsert_vectors(self, store, ids, docling_chunks, vectors, namespace):
+        """Chunks aur unke vectors ko index mein upsert karega"""
+
+        # PineconeVectorStore ki tarah text ko "text" metadata key mein rakhte hai;
+        # token_count ek hi baar yahan ginte hai, query time par packing ke liye
+        records = [
+            (
+                vector_id,
+                values,
+                {
+                    **doc.metadata,
+                    "text": doc.page_content,
+                    "token_count": count_tokens(doc.page_content),
+                },
+            )
+            for vector_id, doc, values in zip(ids, docling_chunks, vectors)
+        ]
+        store.upsert(records, namespace)
+
+    def iter_pdf_chunks(self, path_to_pdf, pages_per_batch=20):
+        """
+        PDF ke chunks page-range by page-range yield karega.
+
+        Poora document ek saath convert nahi hota, sirf `pages_per_batch` pages
+        ka Docling document memory mein rehta hai.
+        """
+
+        config = self.chunker_config()
+        converter = DocumentConverter()
+        chunker = HybridChunker(
+            tokenizer=config["tokenizer"], max_tokens=config["max_tokens"]
+        )
+        filename = os.path.basename(path_to_pdf)
+
+        with pymupdf.open(path_to_pdf) as pdf:
+            page_count = pdf.page_count
+
+        for first_page in range(1, page_count + 1, pages_per_batch):
+            last_page = min(first_page + pages_per_batch - 1, page_count)
+            dl_doc = converter.convert(
+                path_to_pdf, page_range=(first_page, last_page)
+            ).document
+
+            for chunk in chunker.chunk(dl_doc):
+                yield Document(
+                    page_content=chunker.contextualize(chunk=chunk),
+                    metadata={"source": path_to_pdf, "dl_meta": filename},
+                )
+
+            del dl_doc
+
+    @staticmethod
+    def page_count(path_to_pdf):
+        with pymupdf.open(path_to_pdf) as pdf:
+            return pdf.page_count
+
+    @staticmethod
+    def use_streaming(path_to_pdf):
+        """Itni badi PDF ki poora Docling document memory mein na laaya jaye"""
+
+        return (
+            DataIngestor.page_count(path_to_pdf) >= constants.INGEST_STREAMING_MIN_PAGES
+        )
+
+    def ingest_pdf_streaming(
+        self,
+        path_to_pdf,
+        index_name,
+        namespace,
+        pages_per_batch=None,
+        batch_size=64,
+    ):
+        """
+        Bade PDFs ke liye ingest, chunks ko `batch_size` ke batches mein embed
+        aur upsert karta hai taaki peak memory document size se independent rahe.
+
+        Cache hit hone par cache se hi upsert hota hai; miss par cache populate
+        nahi hota kyunki poore vectors kabhi memory mein ikatthe nahi hote.
+        """
+
+        cached = self.load_cached_chunks(self.cache_key(path_to_pdf), path_to_pdf)
+        if cached is not None:
+            chunks, vectors = cached
+            return self.load_chunks_into_pinecone(
+                chunks, index_name, namespace, vectors=vectors
+            )
+
+        return self.stream_into_index(
+            path_to_pdf, index_name, namespace, pages_per_batch, batch_size
+        )
+
+    def stream_into_index(
+        self, path_to_pdf, index_name, namespace, pages_per_batch=None, batch_size=64
+    ):
+        """Cache miss par page ranges convert karke batches mein upsert karega"""
+
+        pages_per_batch = pages_per_batch or constants.INGEST_PAGES_PER_BATCH
+        store = self.ensure_index(index_name)
+        filename = os.path.basename(path_to_pdf)
+        existing = self.existing_chunk_ids(store, path_to_pdf, namespace)
+        seen = set()
+        upserted = 0
+        batch = []
+
+        track_requirements = constants.REQUIREMENT_INDEX_ENABLED
+        indexed = (
+            get_requirement_index().indexed_chunk_ids(namespace, filename)
+            if track_requirements
+            else set()
+        )
+        pending_requirements = []
+
+        def flush(batch):
+            ids = [chunk_id(doc) for doc in batch]
+            self.upsert_vectors(store, ids, batch, self.embed_chunks(batch), namespace)
+            return len(batch)
+
+        for doc in self.iter_pdf_chunks(path_to_pdf, pages_per_batch):
+            cid = chunk_id(doc)
+            if cid in seen:
+                continue
+            seen.add(cid)
+
+            if track_requirements and cid not in indexed:
+                pending_requirements.append((cid, doc.page_content))
+                if len(pending_requirements) >= batch_size:
+                    self.extract_requirements(filename, pending_requirements, namespace)
+                    pending_requirements = []
+
+            if cid in existing:
+                continue
+
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                upserted += flush(batch)
+                batch = []
+
+        if batch:
+            upserted += flush(batch)
+
+        stale_ids = list(existing - seen)
+        store.delete(stale_ids, namespace)
+        if upserted or stale_ids:
+            get_index_versions().bump(namespace, [filename])
+
+        if track_requirements:
+            self.extract_requirements(filename, pending_requirements, namespace)
+            get_requirement_index().remove_chunks(namespace, filename, indexed - seen)
+
+        return {
+            "upserted": upserted,
+            "deleted": len(stale_ids),
+            "unchanged": len(seen) - upserted,
+        }
+
+    def cache_key(self, path_to_pdf):
+        """PDF ki ingestion cache key"""
+
+        return self.cache.make_key(
+            path_to_pdf, self.chunker_config(), self.embeddings.model
+        )
+
+    def load_cached_chunks(self, key, path_to_pdf):
+        """Cache hit par (chunks, vectors), source ko naye path par point karke"""
+
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+
+        chunks, vectors = cached
+        # Same bytes naye path se upload hue ho sakte hai, source update karo
+        for doc in chunks:
+            doc.metadata["source"] = path_to_pdf
+            if "dl_meta" in doc.metadata:
+                doc.metadata["dl_meta"] = os.path.basename(path_to_pdf)
+        return chunks, vectors
+
     def ingest_pdf(self, path_to_pdf, index_name, namespace):
-        """PDF ko ingest karega"""
+        """
+        PDF ko ingest karega, same PDF dobara aaye toh cache se uthaega.
+        Revised PDF (same filename) par sirf badle hue chunks embed hote hai.
+        INGEST_STREAMING_MIN_PAGES se badi PDF streaming path se jaati hai.
+        """
+
+        key = self.cache_key(path_to_pdf)
+        cached = self.load_cached_chunks(key, path_to_pdf)
+
+        if cached is not None:
+            chunks, vectors = cached
+            return self.load_chunks_into_pinecone(
+                chunks, index_name, namespace, vectors=vectors
+            )
+
+        if self.use_streaming(path_to_pdf):
+            logger.info(f"Streaming ingest for large PDF {path_to_pdf}.")
+            return self.stream_into_index(path_to_pdf, index_name, namespace)
 
         chunks = self.load_pdf_into_docling_chunks(path_to_pdf)
-        self.load_chunks_into_pinecone(chunks, index_name, namespace)
+        return self.load_chunks_into_pinecone(
+            chunks, index_name, namespace, cache_key=key
+        )
+
+    def ingest_many(
+        self, paths, index_name, namespace, max_workers=None, upsert_workers=2
+    ):
+        """
+        Bahut saari PDFs ek saath ingest karega.
+
+        Docling conversion process pool mein chalta hai, aur jaise hi koi PDF
+        convert hoti hai uska embedding + upsert thread pool mein chala jata hai,
+        toh file N+1 ka parsing file N ke upsert ke saath overlap karta hai.
+
+        Returns:
+            dict: path -> sync summary (upserted/deleted/unchanged), ya fail
+            hone par exception
+        """
+
+        config = self.chunker_config()
+        results = {}
+
+        # Har worker apne Docling + tokenizer models load karta hai, toh ginti
+        # bounded; spawn taaki Streamlit server ke threads/locks fork na ho
+        convert_pool = ProcessPoolExecutor(
+            max_workers=max_workers or constants.INGEST_CONVERT_WORKERS,
+            mp_context=get_context("spawn"),
+        )
+        upsert_pool = ThreadPoolExecutor(max_workers=upsert_workers)
+
+        with convert_pool, upsert_pool:
+            upserts = {}
+            conversions = {}
+
+            for path in paths:
+                key = self.cache_key(path)
+                cached = self.load_cached_chunks(key, path)
+
+                if cached is not None:
+                    chunks, vectors = cached
+                    future = upsert_pool.submit(
+                        self.load_chunks_into_pinecone,
+                        chunks,
+                        index_name,
+                        namespace,
+                        vectors=vectors,
+                    )
+                    upserts[future] = path
+                elif self.use_streaming(path):
+                    # Bade PDFs ke chunks process se wapas ek saath nahi aate
+                    future = upsert_pool.submit(
+                        self.stream_into_index, path, index_name, namespace
+                    )
+                    upserts[future] = path
+                else:
+                    future = convert_pool.submit(
+                        convert_pdf_to_chunks,
+                        path,
+                        config["tokenizer"],
+                        config["max_tokens"],
+                    )
+                    conversions[future] = (path, key)
+
+            for future in as_completed(conversions):
+                path, key = conversions[future]
+                try:
+                    chunks = future.result()
+                except Exception as e:
+                    logger.exception(f"Conversion failed for {path}.")
+                    results[path] = e
+                    continue
+
+                future = upsert_pool.submit(
+                    self.load_chunks_into_pinecone,
+                    chunks,
+                    index_name,
+                    namespace,
+                    cache_key=key,
+                )
+                upserts[future] = path
+
+            for future in as_completed(upserts):
+                path = upserts[future]
+                try:
+                    results[path] = future.result()
+                except Exception as e:
+                    logger.exception(f"Upsert failed for {path}.")
+                    results[path] = e
+
+        return results
 
 
 if __name__ == "__main__":
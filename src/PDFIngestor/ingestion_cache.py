@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+
+def hash_file(path):
+    """File bytes ka SHA-256, 1 MB blocks mein padh kar"""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestionCache:
+    """PDF ke chunks aur vectors ko disk par content-hash se cache karega"""
+
+    def __init__(self, cache_dir):
+        """Cache directory set karega"""
+
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, path_to_pdf, chunker_config, embedding_model):
+        """PDF hash, chunker config aur embedding model se cache key banega"""
+
+        payload = json.dumps(
+            {
+                "pdf": hash_file(path_to_pdf),
+                "chunker": chunker_config,
+                "embedding_model": embedding_model,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key):
+        """Cache hit par (chunks, vectors) dega, warna None"""
+
+        # langchain sirf yahan chahiye; hash_file ke importers (triage,
+        # result_store) ko iski zaroorat nahi
+        from langchain.schema import Document
+
+        entry_dir = self._entry_dir(key)
+        chunks_path = os.path.join(entry_dir, "chunks.json")
+        vectors_path = os.path.join(entry_dir, "vectors.npy")
+
+        if not (os.path.exists(chunks_path) and os.path.exists(vectors_path)):
+            return None
+
+        try:
+            with open(chunks_path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            vectors = np.load(vectors_path)
+        except (OSError, ValueError):
+            # Corrupt entry ko hata do, next ingest dobara bana dega
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        chunks = [
+            Document(page_content=record["page_content"], metadata=record["metadata"])
+            for record in records
+        ]
+        return chunks, vectors.tolist()
+
+    def put(self, key, chunks, vectors):
+        """Chunks aur vectors ko cache mein likhega (atomic rename ke saath)"""
+
+        entry_dir = self._entry_dir(key)
+        if os.path.exists(entry_dir):
+            return
+
+        parent = os.path.dirname(entry_dir)
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=parent)
+
+        try:
+            with open(os.path.join(tmp_dir, "chunks.json"), "w", encoding="utf-8") as f:
+                json.dump(
+                    [
+                        {"page_content": doc.page_content, "metadata": doc.metadata}
+                        for doc in chunks
+                    ],
+                    f,
+                )
+            np.save(
+                os.path.join(tmp_dir, "vectors.npy"),
+                np.asarray(vectors, dtype=np.float32),
+            )
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Doosre process ne pehle hi likh diya, ya disk issue - dono case mein skip
+            shutil.rmtree(tmp_dir, ignore_errors=True)
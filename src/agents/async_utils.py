@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+async def run_bounded(
+    calls: List[Callable[[], Awaitable[Any]]],
+    max_concurrency: int = 4,
+    timeout: Optional[float] = None,
+) -> List[Any]:
+    """
+    Run coroutine factories with at most `max_concurrency` in flight.
+
+    Results come back in input order. A call that exceeds `timeout` yields an
+    `{"error": ...}` dict like the agents' own failures. If any call raises,
+    or the awaiting task is cancelled, every call still in flight is cancelled
+    before the exception propagates, so no further LLM quota is spent.
+    """
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(call):
+        async with semaphore:
+            try:
+                if timeout is None:
+                    return await call()
+                return await asyncio.wait_for(call(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"Agent call timed out after {timeout}s.")
+                return {"error": f"Timed out after {timeout} seconds."}
+
+    tasks = [asyncio.ensure_future(run_one(call)) for call in calls]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class BatchInvokeMixin:
+    """Adds a bounded, order-preserving `abatch` to agents that define `ainvoke`."""
+
+    async def abatch(
+        self,
+        requests: List[Dict[str, Any]],
+        max_concurrency: int = 4,
+        timeout: Optional[float] = None,
+    ) -> List[Any]:
+        """Run `ainvoke` for each kwargs dict in `requests`, bounded and in order."""
+
+        return await run_bounded(
+            [lambda request=request: self.ainvoke(**request) for request in requests],
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+        )
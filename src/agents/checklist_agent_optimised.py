@@ -8,8 +8,14 @@ from pydantic import BaseModel, Field
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 
+import constants
 from agents.prompts import CHECKLIST_PROMPT, CHECKLIST_RAG_PROMPT
+from agents.async_utils import BatchInvokeMixin
+from agents.llm_cache import ainvoke_cached, cache_model_id, invoke_cached
 from agents.query_agent import QueryAgent
+from clients import get_query_agent
+from requirement_index import requirement_hints
+from pre_extraction import format_hints, normalize_date
 
 # --- Logging Configuration ---
 logging.basicConfig(level=logging.INFO)
@@ -34,12 +40,15 @@ class ChecklistReport(BaseModel):
 
 
 # --- Checklist Agent ---
-class ChecklistAgent:
+class ChecklistAgent(BatchInvokeMixin):
     """
     Uses Google Gemini to analyze RFP text and produce a structured checklist.
     """
 
-    def __init__(self, model: str = "gemini-2.0-flash"):
+    def __init__(self, model: str = "gemini-2.0-flash", query_agent: QueryAgent = None):
+        # Shared QueryAgent, har invoke par naye Pinecone clients nahi banenge
+        self.query_agent = query_agent or get_query_agent()
+
         google_api_key = os.getenv("GEMINI_API_KEY")
         if not google_api_key:
             logger.error("GEMINI_API_KEY environment variable is not set.")
@@ -52,6 +61,8 @@ class ChecklistAgent:
                 temperature=0,
                 convert_system_message_to_human=True,
             )
+            # Cache key ka hissa: same model + temperature + prompt => same output
+            self.model = cache_model_id(self.llm)
             self.structured_llm = self.llm.with_structured_output(ChecklistReport)
             logger.info(f"Initialized Gemini model '{model}' with structured output.")
         except Exception as e:
@@ -62,6 +73,30 @@ class ChecklistAgent:
             textwrap.dedent(CHECKLIST_PROMPT)
         )
 
+    @staticmethod
+    def with_requirement_hints(rfp_text: List[str], filename=None) -> List[str]:
+        """
+        Append ingest-time requirement index entries and regex-extracted values
+        so the LLM only has to judge them instead of finding them.
+        """
+
+        indexed = requirement_hints(filename, ["date", "form", "section"])
+        extracted = format_hints(
+            rfp_text, ["date", "duration", "page_limit", "font", "form"]
+        )
+        return rfp_text + [hints for hints in (indexed, extracted) if hints]
+
+    @staticmethod
+    def normalise_deadlines(report: ChecklistReport) -> Dict[str, Any]:
+        """Coerce deadlines the model wrote in prose into YYYY-MM-DD."""
+
+        result = report.dict()
+        for item in result["items"]:
+            normalised = normalize_date(item["deadline"] or "")
+            if normalised:
+                item["deadline"] = normalised
+        return result
+
     def invoke(self, rfp_text: str, filename=None) -> Dict[str, Any]:
         if not rfp_text.strip():
             logger.error("RFP text cannot be empty.")
@@ -70,16 +105,52 @@ class ChecklistAgent:
         logger.info("Running checklist analysis on RFP text...")
         try:
             # Comment Here
-            query_agent = QueryAgent()
-            rfp_text = query_agent.retrieve_relevant_data(
-                CHECKLIST_RAG_PROMPT, "test", filename, top_k=2
+            rfp_text = self.query_agent.retrieve_relevant_data(
+                CHECKLIST_RAG_PROMPT,
+                "test",
+                filename,
+                token_budget=constants.CONTEXT_TOKEN_BUDGETS["checklist"],
             )
+            rfp_text = self.with_requirement_hints(rfp_text, filename)
             print(rfp_text)
 
-            chain = self.prompt_template | self.structured_llm
-            response = chain.invoke({"rfp_text": rfp_text})
+            response = invoke_cached(
+                self.prompt_template,
+                self.structured_llm,
+                ChecklistReport,
+                self.model,
+                {"rfp_text": rfp_text},
+            )
+            logger.info("Received structured response from Gemini model.")
+            return self.normalise_deadlines(response)
+        except Exception as e:
+            logger.exception(f"Checklist generation failed: {e}")
+            return {"error": f"Checklist generation failed. Error: {str(e)}"}
+
+    async def ainvoke(self, rfp_text: str, filename=None) -> Dict[str, Any]:
+        if not rfp_text.strip():
+            logger.error("RFP text cannot be empty.")
+            return {"error": "RFP text cannot be empty."}
+
+        logger.info("Running async checklist analysis on RFP text...")
+        try:
+            rfp_text = await self.query_agent.aretrieve_relevant_data(
+                CHECKLIST_RAG_PROMPT,
+                "test",
+                filename,
+                token_budget=constants.CONTEXT_TOKEN_BUDGETS["checklist"],
+            )
+            rfp_text = self.with_requirement_hints(rfp_text, filename)
+
+            response = await ainvoke_cached(
+                self.prompt_template,
+                self.structured_llm,
+                ChecklistReport,
+                self.model,
+                {"rfp_text": rfp_text},
+            )
             logger.info("Received structured response from Gemini model.")
-            return response.dict()
+            return self.normalise_deadlines(response)
         except Exception as e:
             logger.exception(f"Checklist generation failed: {e}")
             return {"error": f"Checklist generation failed. Error: {str(e)}"}
@@ -5,8 +5,12 @@ from pydantic import BaseModel, Field
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
-from agents.prompts import COMPLIANCE_AGENT_PROMPT
+import constants
+from agents.compliance_reduce import assess_eligibility, merge_criteria, split_rfp_text
+from agents.prompts import COMPLIANCE_AGENT_PROMPT, COMPLIANCE_MAP_PROMPT
+from company_profile import CompanyProfile
 
 # from prompts import COMPLIANCE_AGENT_PROMPT
 import os
@@ -54,6 +58,9 @@ class ComplianceAgent:
     and returns a structured JSON compliance report with dynamically identified criteria.
     """
 
+    # Groq model ki context limit; isse lamba RFP excerpts mein map-reduce hoga
+    max_prompt_chars = 5000
+
     def __init__(self, model: str = "gemini-2.0-flash"):
         # google_api_key = os.getenv("GEMINI_API_KEY")
         # if not google_api_key:
@@ -84,6 +91,23 @@ class ComplianceAgent:
         self.prompt_template = ChatPromptTemplate.from_template(
             textwrap.dedent(COMPLIANCE_AGENT_PROMPT)
         )
+        self.map_prompt_template = ChatPromptTemplate.from_template(
+            textwrap.dedent(COMPLIANCE_MAP_PROMPT)
+        )
+
+    def _complete(self, prompt_template, rfp_text: str, company_profile: str):
+        return self.client.chat.completions.create(
+            model="qwen-qwq-32b",
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt_template.format(
+                        rfp_text=rfp_text, company_profile=company_profile
+                    ),
+                },
+            ],
+            response_model=ComplianceReport,
+        )
 
     def invoke(self, rfp_text: str, company_profile: str) -> Dict[str, Any]:
         # ... (invoke method remains the same) ...
@@ -91,10 +115,6 @@ class ComplianceAgent:
             logger.error("RFP text or Company Profile text is empty.")
             return {"error": "RFP or Company Profile text cannot be empty."}
 
-        if len(rfp_text) > 5000:
-            logger.error("RFP text is too long.")
-            rfp_text = rfp_text[:5000]
-
         # logger.info("Creating dynamic analysis chain with Google model...")
         # try:
         #     chain = self.prompt_template | self.structured_llm
@@ -113,17 +133,38 @@ class ComplianceAgent:
         #         "error": f"Failed to generate compliance report using Google model. Error: {str(e)}"
         #     }
         try:
-            response = self.client.chat.completions.create(
-                model="qwen-qwq-32b",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": self.prompt_template.format(
-                            rfp_text=rfp_text, company_profile=company_profile
+            if len(rfp_text) <= self.max_prompt_chars:
+                response = self._complete(
+                    self.prompt_template, rfp_text, company_profile
+                )
+                print(response)
+                return response
+
+            # Lamba RFP: truncate karne ki jagah har excerpt alag se, phir merge
+            excerpts = split_rfp_text(rfp_text, chunk_size=self.max_prompt_chars)
+            with ThreadPoolExecutor(
+                max_workers=max(
+                    1, min(constants.COMPLIANCE_MAP_CONCURRENCY, len(excerpts))
+                )
+            ) as executor:
+                partials = list(
+                    executor.map(
+                        lambda excerpt: self._complete(
+                            self.map_prompt_template, excerpt, company_profile
                         ),
-                    },
-                ],
-                response_model=ComplianceReport,
+                        excerpts,
+                    )
+                )
+            criteria = merge_criteria(
+                criterion
+                for partial in partials
+                for criterion in partial.compliance_criteria
+            )
+            response = ComplianceReport(
+                compliance_criteria=criteria,
+                overall_eligibility_assessment=assess_eligibility(
+                    criteria, CompanyProfile(company_profile).legal_name
+                ),
             )
             print(response)
             return response
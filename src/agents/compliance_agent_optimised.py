@@ -1,7 +1,9 @@
+import asyncio
 import os
 import logging
 import textwrap
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Union
 from enum import Enum
 
 from dotenv import load_dotenv
@@ -9,8 +11,21 @@ from pydantic import BaseModel, Field
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 
-from agents.prompts import COMPLIANCE_AGENT_PROMPT, COMPLIANCE_RAG_PROMPT
+import constants
+from agents.prompts import (
+    COMPLIANCE_AGENT_PROMPT,
+    COMPLIANCE_JUDGE_PROMPT,
+    COMPLIANCE_MAP_PROMPT,
+    COMPLIANCE_RAG_PROMPT,
+    COMPLIANCE_REQUIREMENTS_PROMPT,
+)
+from agents.async_utils import BatchInvokeMixin, run_bounded
+from agents.compliance_reduce import assess_eligibility, merge_criteria, split_rfp_text
+from agents.llm_cache import ainvoke_cached, cache_model_id, invoke_cached
 from agents.query_agent import QueryAgent
+from agents.verdict_cache import get_verdict_cache
+from company_profile import CompanyProfile
+from scoring import calculate_compliance_score
 
 # --- Logging Setup ---
 logger = logging.getLogger(__name__)
@@ -55,14 +70,56 @@ class ComplianceReport(BaseModel):
     )
 
 
+class RequirementItem(BaseModel):
+    criteria: str = Field(
+        description="Concise, generic label of the eligibility requirement (e.g., 'Experience Requirement')."
+    )
+    required: str = Field(
+        description="The specific requirement detail extracted directly from the RFP text."
+    )
+    importance: importanceEnum = Field(
+        description="The importance of the requirement according to the RFP"
+    )
+
+
+class RequirementList(BaseModel):
+    requirements: List[RequirementItem] = Field(
+        description="Eligibility requirements stated in the RFP text."
+    )
+
+
+class CriterionVerdict(BaseModel):
+    requirement: int = Field(description="Number of the requirement being judged.")
+    current: str = Field(
+        description="The corresponding detail from the company profile, or '(INFORMATION NOT FOUND!)'."
+    )
+    matches: bool = Field(
+        description="True if the company profile clearly satisfies the requirement."
+    )
+    corrective_steps: Optional[List[str]] = Field(
+        description="List of specific corrective steps to take if 'matches' is false."
+    )
+
+
+class VerdictList(BaseModel):
+    verdicts: List[CriterionVerdict] = Field(
+        description="One verdict per numbered requirement."
+    )
+
+
 # --- Compliance Agent ---
-class ComplianceAgent:
+class ComplianceAgent(BatchInvokeMixin):
     """
     Analyzes RFP text against company profile using Google Gemini
     and returns a structured JSON compliance report.
     """
 
-    def __init__(self, model: str = "gemini-1.5-flash-latest"):
+    def __init__(
+        self,
+        model: str = "gemini-1.5-flash-latest",
+        map_reduce_threshold: int = constants.COMPLIANCE_MAP_REDUCE_THRESHOLD,
+        map_concurrency: int = constants.COMPLIANCE_MAP_CONCURRENCY,
+    ):
         google_api_key = os.getenv("GEMINI_API_KEY")
 
         if not google_api_key:
@@ -76,7 +133,11 @@ class ComplianceAgent:
                 temperature=0,
                 convert_system_message_to_human=True,
             )
+            # Cache key ka hissa: same model + temperature + prompt => same output
+            self.model = cache_model_id(llm)
             self.structured_llm = llm.with_structured_output(ComplianceReport)
+            self.requirements_llm = llm.with_structured_output(RequirementList)
+            self.judge_llm = llm.with_structured_output(VerdictList)
             logger.info(f"Initialized Gemini model '{model}' with structured output.")
         except Exception as e:
             logger.exception("Failed to initialize Gemini model.")
@@ -85,9 +146,233 @@ class ComplianceAgent:
         self.prompt_template = ChatPromptTemplate.from_template(
             textwrap.dedent(COMPLIANCE_AGENT_PROMPT)
         )
+        self.map_prompt_template = ChatPromptTemplate.from_template(
+            textwrap.dedent(COMPLIANCE_MAP_PROMPT)
+        )
+        self.requirements_prompt_template = ChatPromptTemplate.from_template(
+            textwrap.dedent(COMPLIANCE_REQUIREMENTS_PROMPT)
+        )
+        self.judge_prompt_template = ChatPromptTemplate.from_template(
+            textwrap.dedent(COMPLIANCE_JUDGE_PROMPT)
+        )
+        self.verdicts = get_verdict_cache()
+        # Isse lambe RFP ek prompt mein nahi bheje jayenge, excerpts mein jayenge
+        self.map_reduce_threshold = map_reduce_threshold
+        self.map_concurrency = map_concurrency
+
+    def use_map_reduce(self, rfp_text: str) -> bool:
+        return len(rfp_text) > self.map_reduce_threshold
+
+    def _map_inputs(self, rfp_text: str, company_profile: str) -> List[Dict[str, str]]:
+        excerpts = split_rfp_text(rfp_text)
+        logger.info(f"Map-reduce compliance over {len(excerpts)} RFP excerpts.")
+        return [
+            {"rfp_text": excerpt, "company_profile": company_profile}
+            for excerpt in excerpts
+        ]
+
+    def _map_one(self, inputs: Dict[str, str]) -> ComplianceReport:
+        return invoke_cached(
+            self.map_prompt_template,
+            self.structured_llm,
+            ComplianceReport,
+            self.model,
+            inputs,
+        )
+
+    @staticmethod
+    def _reduce(
+        partials: List[ComplianceReport], legal_name: str = ""
+    ) -> Dict[str, Any]:
+        criteria = merge_criteria(
+            criterion
+            for partial in partials
+            for criterion in partial.compliance_criteria
+        )
+        report = ComplianceReport(
+            compliance_criteria=criteria,
+            overall_eligibility_assessment=assess_eligibility(criteria, legal_name),
+        )
+        return report.dict()
+
+    def map_reduce(self, rfp_text: str, company_profile: str) -> Dict[str, Any]:
+        """Extract criteria per excerpt in parallel, then merge them into one report."""
+
+        map_inputs = self._map_inputs(rfp_text, company_profile)
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.map_concurrency, len(map_inputs)))
+        ) as executor:
+            partials = list(executor.map(self._map_one, map_inputs))
+        return self._reduce(partials, CompanyProfile(company_profile).legal_name)
+
+    async def amap_reduce(self, rfp_text: str, company_profile: str) -> Dict[str, Any]:
+        map_inputs = self._map_inputs(rfp_text, company_profile)
+        partials = await run_bounded(
+            [
+                lambda inputs=inputs: ainvoke_cached(
+                    self.map_prompt_template,
+                    self.structured_llm,
+                    ComplianceReport,
+                    self.model,
+                    inputs,
+                )
+                for inputs in map_inputs
+            ],
+            max_concurrency=self.map_concurrency,
+        )
+        failed = [partial for partial in partials if isinstance(partial, dict)]
+        if failed:
+            raise RuntimeError(failed[0].get("error", "Map step failed."))
+        return self._reduce(partials, CompanyProfile(company_profile).legal_name)
+
+    def extract_requirements(self, rfp_text: str) -> List[RequirementItem]:
+        """
+        Profile-independent step: list the RFP's eligibility requirements.
+
+        Long RFPs are extracted per excerpt in parallel and merged. The LLM
+        cache key depends only on the RFP text, so every profile shares it.
+        """
+
+        excerpts = (
+            split_rfp_text(rfp_text) if self.use_map_reduce(rfp_text) else [rfp_text]
+        )
+
+        def extract(excerpt):
+            return invoke_cached(
+                self.requirements_prompt_template,
+                self.requirements_llm,
+                RequirementList,
+                self.model,
+                {"rfp_text": excerpt},
+            ).requirements
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.map_concurrency, len(excerpts)))
+        ) as executor:
+            partials = list(executor.map(extract, excerpts))
+
+        return merge_criteria(item for partial in partials for item in partial)
+
+    def judge(
+        self, requirements: List[RequirementItem], profile: CompanyProfile
+    ) -> List[ComplianceCriterion]:
+        """
+        Judge each requirement against the profile. Verdicts already cached for
+        this (requirement, profile version) skip the LLM; the rest go out in a
+        single call.
+        """
+
+        verdicts = [
+            self.verdicts.get(item.required, profile.version) for item in requirements
+        ]
+        pending = [i for i, verdict in enumerate(verdicts) if verdict is None]
+        logger.info(
+            f"{len(requirements) - len(pending)}/{len(requirements)} criteria "
+            "resolved from the verdict cache."
+        )
+
+        if pending:
+            numbered = "\n".join(
+                f"{number}. {requirements[i].criteria}: {requirements[i].required}"
+                for number, i in enumerate(pending, start=1)
+            )
+            response = invoke_cached(
+                self.judge_prompt_template,
+                self.judge_llm,
+                VerdictList,
+                self.model,
+                {"company_profile": profile.prompt_text(), "requirements": numbered},
+            )
+            for verdict in response.verdicts:
+                if not 1 <= verdict.requirement <= len(pending):
+                    continue
+                i = pending[verdict.requirement - 1]
+                verdicts[i] = verdict.dict(exclude={"requirement"})
+                self.verdicts.put(
+                    requirements[i].required, profile.version, verdicts[i]
+                )
+
+        return [
+            ComplianceCriterion(
+                criteria=item.criteria,
+                required=item.required,
+                importance=item.importance,
+                **(
+                    verdict
+                    or {
+                        "current": "(INFORMATION NOT FOUND!)",
+                        "matches": False,
+                        "corrective_steps": None,
+                    }
+                ),
+            )
+            for item, verdict in zip(requirements, verdicts)
+        ]
+
+    def evaluate(self, rfp_text: str, profile: CompanyProfile) -> Dict[str, Any]:
+        """Two-step compliance report: extract requirements once, then judge."""
+
+        criteria = self.judge(self.extract_requirements(rfp_text), profile)
+        return ComplianceReport(
+            compliance_criteria=criteria,
+            overall_eligibility_assessment=assess_eligibility(
+                criteria, profile.legal_name
+            ),
+        ).dict()
+
+    def evaluate_many(
+        self,
+        rfp_text: str,
+        profiles: Dict[str, CompanyProfile],
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Evaluate one RFP against several company profiles.
+
+        The RFP's requirements are extracted once and shared; each profile then
+        costs only a judgement call (or none, when its verdicts are cached).
+
+        Returns:
+            name -> {"report": ComplianceReport dict, "score": calculate_compliance_score
+            result}, or {"error": ...} for a profile that failed
+        """
+
+        if not rfp_text or not profiles:
+            logger.error("RFP text or company profiles are empty.")
+            return {}
+
+        try:
+            requirements = self.extract_requirements(rfp_text)
+        except Exception as e:
+            logger.exception("Requirement extraction failed.")
+            error = {"error": f"Failed to extract requirements: {str(e)}"}
+            return {name: error for name in profiles}
+
+        def evaluate_one(profile):
+            try:
+                criteria = self.judge(requirements, profile)
+                report = ComplianceReport(
+                    compliance_criteria=criteria,
+                    overall_eligibility_assessment=assess_eligibility(
+                        criteria, profile.legal_name
+                    ),
+                ).dict()
+                return {"report": report, "score": calculate_compliance_score(report)}
+            except Exception as e:
+                logger.exception("Compliance judgement failed.")
+                return {"error": f"Failed to generate compliance report: {str(e)}"}
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers or min(self.map_concurrency, len(profiles))
+        ) as executor:
+            results = executor.map(evaluate_one, profiles.values())
+            return dict(zip(profiles, results))
 
     def invoke(
-        self, rfp_text: str, company_profile: str, filename=None
+        self,
+        rfp_text: str,
+        company_profile: Union[str, CompanyProfile],
+        filename=None,
     ) -> Dict[str, Any]:
         if not rfp_text or not company_profile:
             logger.error("RFP text or Company Profile text is empty.")
@@ -103,9 +388,51 @@ class ComplianceAgent:
             # )
             # print(rfp_text)
 
-            chain = self.prompt_template | self.structured_llm
-            response = chain.invoke(
-                {"rfp_text": rfp_text, "company_profile": company_profile}
+            if isinstance(company_profile, CompanyProfile):
+                return self.evaluate(rfp_text, company_profile)
+
+            if self.use_map_reduce(rfp_text):
+                return self.map_reduce(rfp_text, company_profile)
+
+            response = invoke_cached(
+                self.prompt_template,
+                self.structured_llm,
+                ComplianceReport,
+                self.model,
+                {"rfp_text": rfp_text, "company_profile": company_profile},
+            )
+            logger.info("Received structured response successfully.")
+            return response.dict()
+        except Exception as e:
+            logger.exception("Error during Gemini model invocation.")
+            return {"error": f"Failed to generate compliance report: {str(e)}"}
+
+    async def ainvoke(
+        self,
+        rfp_text: str,
+        company_profile: Union[str, CompanyProfile],
+        filename=None,
+    ) -> Dict[str, Any]:
+        if not rfp_text or not company_profile:
+            logger.error("RFP text or Company Profile text is empty.")
+            return {"error": "RFP or Company Profile text cannot be empty."}
+
+        try:
+            logger.info("Creating and invoking async analysis chain...")
+            if isinstance(company_profile, CompanyProfile):
+                # Thread offload, not async-native: the two-step evaluate path
+                # (requirements + verdict caches, judge calls) is sync only
+                return await asyncio.to_thread(self.evaluate, rfp_text, company_profile)
+
+            if self.use_map_reduce(rfp_text):
+                return await self.amap_reduce(rfp_text, company_profile)
+
+            response = await ainvoke_cached(
+                self.prompt_template,
+                self.structured_llm,
+                ComplianceReport,
+                self.model,
+                {"rfp_text": rfp_text, "company_profile": company_profile},
             )
             logger.info("Received structured response successfully.")
             return response.dict()
@@ -0,0 +1,123 @@
+import copy
+import re
+from typing import Any, Iterable, List
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+import constants
+
+_IMPORTANCE_RANK = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
+
+
+def split_rfp_text(
+    rfp_text: str,
+    chunk_size: int = constants.COMPLIANCE_CHUNK_CHARS,
+    chunk_overlap: int = constants.COMPLIANCE_CHUNK_OVERLAP,
+) -> List[str]:
+    """Split RFP text into overlapping excerpts for the map step."""
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=["\n\n", "\n", ". ", " "],
+    )
+    return splitter.split_text(rfp_text)
+
+
+def _normalise(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", str(text).lower()).split())
+
+
+def _importance_rank(criterion: Any) -> int:
+    importance = getattr(criterion, "importance", None)
+    importance = getattr(importance, "value", importance)
+    return _IMPORTANCE_RANK.get(str(importance).upper(), 0)
+
+
+def _matches(criterion: Any) -> bool:
+    # Unjudged requirements (no `matches` yet) only compete on importance
+    return getattr(criterion, "matches", True)
+
+
+def merge_criteria(criteria: Iterable[Any]) -> List[Any]:
+    """
+    Deduplicate criteria extracted from separate excerpts.
+
+    Criteria with the same normalised label, or the same normalised requirement
+    text, are treated as one. When duplicates disagree the failing one wins
+    (a requirement met in one excerpt but not another is not safely met), and
+    the merged criterion keeps the highest importance seen. First-seen order
+    is preserved.
+    """
+
+    merged: List[Any] = []
+    index_by_key = {}
+
+    for criterion in criteria:
+        keys = [
+            "label:" + _normalise(criterion.criteria),
+            "required:" + _normalise(criterion.required),
+        ]
+        position = next(
+            (index_by_key[key] for key in keys if key in index_by_key), None
+        )
+
+        if position is None:
+            position = len(merged)
+            merged.append(criterion)
+        else:
+            kept = merged[position]
+            if _matches(kept) and not _matches(criterion):
+                replacement = criterion
+            elif _matches(kept) == _matches(criterion):
+                replacement = (
+                    criterion
+                    if _importance_rank(criterion) > _importance_rank(kept)
+                    else kept
+                )
+            else:
+                replacement = kept
+
+            # Failing criterion jeete tab bhi sabse zyada importance bani rahe
+            other = kept if replacement is criterion else criterion
+            if _importance_rank(other) > _importance_rank(replacement):
+                replacement = copy.copy(replacement)
+                replacement.importance = other.importance
+            merged[position] = replacement
+
+        for key in keys:
+            index_by_key.setdefault(key, position)
+
+    return merged
+
+
+def assess_eligibility(criteria: Iterable[Any], legal_name: str = "") -> str:
+    """
+    Eligibility summary built from the merged criteria.
+
+    Same rule as the compliance prompt: any unmet HIGH criterion (or one with
+    no recognisable importance) makes the company ineligible. The sentence
+    names the company and how many of those criteria are not met.
+    """
+
+    name = (legal_name or "").strip() or "Company name not found"
+    high = [
+        criterion
+        for criterion in criteria
+        if _importance_rank(criterion) in (0, _IMPORTANCE_RANK["HIGH"])
+    ]
+    unmet = [criterion for criterion in high if not criterion.matches]
+
+    if not unmet:
+        return (
+            f"{name} appears eligible: all {len(high)} high-importance "
+            "criteria are met."
+        )
+
+    labels = ", ".join(str(criterion.criteria) for criterion in unmet[:3])
+    if len(unmet) > 3:
+        labels += f" and {len(unmet) - 3} more"
+    return (
+        f"{name} appears ineligible: {len(unmet)} of {len(high)} "
+        f"high-importance criteria are not met ({labels})."
+    )
@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+import constants
+from clients import get_shared
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """
+    Persistent SQLite cache for structured LLM outputs.
+
+    Entries are keyed by model, the rendered prompt and the output schema, so a
+    warm hit returns the stored Pydantic object without calling the model.
+    Old entries expire after `ttl` seconds and the least recently used ones
+    are evicted once the cache holds more than `max_entries`.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self.db_path = db_path or constants.LLM_CACHE_DB
+        self.ttl = ttl if ttl is not None else constants.LLM_CACHE_TTL
+        self.max_entries = max_entries or constants.LLM_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, schema TEXT, value TEXT, "
+                "created_at REAL, accessed_at REAL)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+            )
+
+    @staticmethod
+    def make_key(model: str, prompt: str, schema: Type[BaseModel]) -> str:
+        schema_json = json.dumps(schema.model_json_schema(), sort_keys=True)
+        digest = hashlib.sha256()
+        for part in (model, schema.__name__, schema_json, prompt):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str, schema: Type[BaseModel]) -> Optional[BaseModel]:
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key=?", (key,)
+            ).fetchone()
+
+            if row is None or row[1] + self.ttl <= now:
+                self.misses += 1
+                return None
+
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE llm_cache SET accessed_at=? WHERE key=?", (now, key)
+                )
+            self.hits += 1
+
+        return schema.model_validate_json(row[0])
+
+    def put(self, key: str, response: BaseModel) -> None:
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?)",
+                (key, type(response).__name__, response.model_dump_json(), now, now),
+            )
+            self.conn.execute(
+                "DELETE FROM llm_cache WHERE created_at <= ?", (now - self.ttl,)
+            )
+            self.conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide LLM response cache."""
+
+    return get_shared("llm_cache", LLMResponseCache)
+
+
+def cache_model_id(llm: Any) -> str:
+    """
+    Model part of the cache key, read off the configured LLM so the cached
+    outputs always match its sampling temperature.
+    """
+
+    return f"{llm.model}@temperature={llm.temperature}"
+
+
+def invoke_cached(
+    prompt_template, structured_llm, schema, model: str, inputs: Dict[str, Any]
+) -> BaseModel:
+    """Run `prompt_template | structured_llm`, served from the cache when warm."""
+
+    cache = get_llm_cache()
+    key = cache.make_key(model, prompt_template.format(**inputs), schema)
+
+    cached = cache.get(key, schema)
+    if cached is not None:
+        logger.info(f"LLM cache hit for {schema.__name__}.")
+        return cached
+
+    response = (prompt_template | structured_llm).invoke(inputs)
+    cache.put(key, response)
+    return response
+
+
+async def ainvoke_cached(
+    prompt_template, structured_llm, schema, model: str, inputs: Dict[str, Any]
+) -> BaseModel:
+    """
+    Async twin of `invoke_cached`. The model call is awaited natively; the
+    SQLite cache read and write run in a worker thread so they never block
+    the event loop.
+    """
+
+    cache = get_llm_cache()
+    key = cache.make_key(model, prompt_template.format(**inputs), schema)
+
+    cached = await asyncio.to_thread(cache.get, key, schema)
+    if cached is not None:
+        logger.info(f"LLM cache hit for {schema.__name__}.")
+        return cached
+
+    response = await (prompt_template | structured_llm).ainvoke(inputs)
+    await asyncio.to_thread(cache.put, key, response)
+    return response
@@ -248,10 +248,113 @@ COMPLIANCE_AGENT_PROMPT = """
 Look for 7 Highly important fields.
 """
 
+COMPLIANCE_MAP_PROMPT = """
+    Role:
+    You are a meticulous Compliance Analyst AI. You are given ONE EXCERPT of a larger Request for Proposal (RFP) and the full Company Profile. Other excerpts are analysed separately and the results are merged afterwards.
+
+    Objective:
+    Identify ONLY the eligibility requirements that are explicitly stated in this excerpt and compare each one against the Company Profile. Do not guess requirements that may appear elsewhere in the RFP. If the excerpt contains no eligibility requirements, return an empty "compliance_criteria" list.
+
+    Inputs:
+
+    Company Profile Text:
+    text
+    {company_profile}
+
+    RFP Excerpt:
+    text
+    {rfp_text}
+
+    Instructions:
+
+    1. For each eligibility requirement in the excerpt (service scope, minimum experience, location, certifications or licenses, insurance limits, mandatory forms, personnel qualifications, financial proof), create a criterion with:
+       - "criteria": A concise, generic label (e.g., "Experience Requirement", "HUB Certification") so the same requirement found in different excerpts gets the same label.
+       - "required": The exact detail from the RFP excerpt.
+       - "current": The matching detail from the Company Profile or "(INFORMATION NOT FOUND!)" if absent.
+       - "matches": true only if the Company Profile clearly satisfies the requirement; otherwise false.
+       - "importance": HIGH for potential disqualifiers, MEDIUM for significant requirements, LOW for minor ones.
+       - "corrective_steps": Actionable steps if "matches" is false.
+    2. Never include references as a compliance criterion.
+    3. Set "overall_eligibility_assessment" to "eligible" or "ineligible" based only on the criteria from this excerpt.
+
+    Output Format:
+    Return only a valid JSON object conforming to the ComplianceReport schema (without any additional text).
+"""
+
+COMPLIANCE_REQUIREMENTS_PROMPT = """
+    Role:
+    You are a meticulous Compliance Analyst AI. You are given the text (or one excerpt) of a Request for Proposal (RFP).
+
+    Objective:
+    List every eligibility requirement stated in the text. Do NOT judge any company against them; that happens in a separate step. If the text contains no eligibility requirements, return an empty "requirements" list.
+
+    RFP Text:
+    text
+    {rfp_text}
+
+    Instructions:
+    For each requirement (service scope, minimum experience, location, certifications or licenses, insurance limits, mandatory forms, personnel qualifications, financial proof), return:
+       - "criteria": A concise, generic label (e.g., "Experience Requirement", "HUB Certification").
+       - "required": The exact requirement detail from the RFP.
+       - "importance": HIGH for potential disqualifiers, MEDIUM for significant requirements, LOW for minor ones.
+    Never include references as a requirement.
+
+    Output Format:
+    Return only a valid JSON object conforming to the RequirementList schema (without any additional text).
+"""
+
+COMPLIANCE_JUDGE_PROMPT = """
+    Role:
+    You are a meticulous Compliance Analyst AI. You are given a numbered list of RFP eligibility requirements and a Company Profile.
+
+    Objective:
+    Decide for each requirement whether the Company Profile satisfies it, based only on the Company Profile.
+
+    Company Profile:
+    text
+    {company_profile}
+
+    Requirements:
+    {requirements}
+
+    Instructions:
+    Return one verdict per requirement with:
+       - "requirement": The number of the requirement.
+       - "current": The matching detail from the Company Profile or "(INFORMATION NOT FOUND!)" if absent.
+       - "matches": true only if the Company Profile clearly satisfies the requirement; otherwise false.
+       - "corrective_steps": Actionable steps if "matches" is false.
+
+    Output Format:
+    Return only a valid JSON object conforming to the VerdictList schema (without any additional text).
+"""
+
 COMPLIANCE_RAG_PROMPT = """eligible to bid on the RFP. (e.g., state registration, certifications, past performance requirements). Identify any deal-breakers early in the process. must-have qualifications, certifications, and experience needed to bid. Principal Business Address, Company Length of Existence, Years of Experience in Temporary Staffing, DUNS Number, CAGE Code, SAM.gov Registration Date, NAICS Codes, State of Incorporation, Bank Letter of Creditworthiness, State Registration Number, Services Provided, Business Structure, W-9 Form, Certificate of Insurance, Licenses, Historically Underutilized Business/DBE Status,Key Personnel, MBE Certification, Craft CMS 3 Experience, Website Centralization, Hosting and Cloud Services, Website Security, Insurance Coverage, Native American Preference"""
 
 # COMPLIANCE_RAG_PROMPT = """Retrieve all content related to vendor eligibility and compliance requirements for proposal submission. Focus on sections that mention mandatory qualifications, certifications, registrations, or past performance criteria. Identify any legal or regulatory deal-breakers that could disqualify a bidder. Summarize must-have eligibility conditions and flag anything that suggests ConsultAdd may not meet submission requirements."""
 
+REQUIREMENT_EXTRACTION_PROMPT = """
+You are an information extraction assistant for government Request for Proposals (RFPs).
+
+Below are numbered excerpts from one RFP. From each excerpt extract every:
+- **date**: deadlines, due dates, question cut-offs, pre-bid meetings, contract start/end dates.
+- **amount**: monetary amounts such as insurance limits, bonds, budgets, penalties and fees.
+- **form**: required forms, attachments or exhibits (e.g. "HSD Form A", "W-9", "Exhibit C").
+- **certification**: required certifications, licenses or registrations (e.g. "HUB", "ISO 9001", "SAM.gov registration").
+- **section**: section or clause references that impose a requirement (e.g. "Section 4.2").
+
+For each item return:
+1. **excerpt** - The number of the excerpt it was found in.
+2. **kind** - One of: `date`, `amount`, `form`, `certification`, `section`.
+3. **value** - The text exactly as written in the excerpt.
+4. **normalized** - For dates `YYYY-MM-DD`, for amounts a plain number in USD (e.g. `1000000`), otherwise the canonical name.
+5. **description** - A short phrase saying what the item is for (e.g. "Proposal submission deadline").
+
+Only extract what is explicitly written. Excerpts with nothing relevant contribute no items.
+
+RFP Excerpts:
+{excerpts}
+"""
+
 CHECKLIST_PROMPT = """
 You are an intelligent assistant trained to extract and structure submission checklists from government Request for Proposals (RFPs).
 
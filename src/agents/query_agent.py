@@ -1,20 +1,38 @@
-from pinecone import Pinecone
 import constants
+from clients import get_pinecone_client, get_shared_embedding_backend
+from vector_store import get_vector_store
+from query_cache import get_index_versions, get_query_cache
+from context_packer import ContextPacker
+import logging
+import os
 import textwrap
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
-import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from langchain.memory import ConversationBufferMemory
 
+logger = logging.getLogger(__name__)
+
 
 class QueryAgent:
     """Agent jo database ko query karega and relevant results return karega"""
 
-    def __init__(self):
+    def __init__(self, embedding_backend=None, query_cache=None):
         """Initialize karo QueryAgent class ko"""
 
-        self.pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-        self.index = self.pc.Index("rfp-agent")
+        # DataIngestor wala hi backend hona chahiye, warna vectors match nahi honge
+        self.embedder = embedding_backend or get_shared_embedding_backend()
+        self.store = get_vector_store(constants.RFP_INDEX_NAME, self.embedder.dimension)
+
+        # Same query + file + index version ka result dobara compute nahi hota
+        self.cache = query_cache or get_query_cache()
+        self.versions = get_index_versions()
+
+        # Reranker ke liye hi Pinecone client chahiye, offline mode mein nahi
+        self.pc = (
+            get_pinecone_client() if constants.RERANKER_BACKEND == "pinecone" else None
+        )
 
         # self.llm = ChatGoogleGenerativeAI(
         #     model=constants.QUERY_AGENT_MODEL,
@@ -38,45 +56,107 @@ class QueryAgent:
 
     #     return (result.queries, result.namespaces)
 
-    def query_database(self, query, namespace, top_k, filename=None):
-        """Database ko query karega and top_k results return karega"""
+    # Ingest ke sources: repo/CLI ke PDFs files/ mein, UI uploads UPLOAD_DIR mein
+    SOURCE_DIRS = ("files", constants.UPLOAD_DIR)
 
-        query_embedding = self.pc.inference.embed(
-            model=constants.PINECONE_EMBEDDING_MODEL,
-            inputs=[query],
-            parameters={"input_type": "query"},
-        )
+    def source_filter(self, filename):
+        """Filename ke hisaab se metadata filter"""
 
         if filename:
-            filename = "files/" + filename
-            filterr = {"source": filename}
-        else:
-            filterr = None
+            return {
+                "source": {
+                    "$in": [
+                        os.path.join(directory, filename)
+                        for directory in self.SOURCE_DIRS
+                    ]
+                }
+            }
+        return None
 
-        intermediate_results = self.index.query(
-            namespace=namespace,
-            vector=query_embedding[0].values,
+    @staticmethod
+    def candidate_count(top_k, token_budget):
+        """Budget mode mein top_k candidate pool hai, warna seedha result count"""
+
+        if top_k is not None:
+            return top_k
+        return constants.CONTEXT_CANDIDATE_POOL if token_budget else 7
+
+    def query_database(self, query, namespace, top_k, filename=None, token_budget=None):
+        """
+        Database ko query karega and top_k results return karega.
+
+        `token_budget` diya ho toh top_k reranked candidates mein se utne tokens
+        tak ka context pack hota hai (near-duplicates hata ke).
+        """
+
+        top_k = self.candidate_count(top_k, token_budget)
+        key = self.cache_key(query, namespace, filename, top_k, token_budget)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        query_embedding = self.embedder.embed_query(query)
+
+        result = self.search_and_rerank(
+            query,
+            query_embedding,
+            namespace,
+            top_k,
+            self.source_filter(filename),
+            token_budget,
+        )
+        self.cache.put(key, result)
+        return result
+
+    def cache_key(self, query, namespace, filename, top_k, token_budget=None):
+        """Query cache key, index version ke saath taaki ingest ke baad invalid ho"""
+
+        return self.cache.make_key(
+            query,
+            namespace,
+            filename,
+            top_k if token_budget is None else [top_k, token_budget],
+            self.versions.get(namespace, filename),
+            self.embedder.model,
+        )
+
+    def search_and_rerank(
+        self, query, query_embedding, namespace, top_k, filterr, token_budget=None
+    ):
+        """Ek embedded query ke liye vector search + rerank (+ budget packing)"""
+
+        matches = self.store.query(
+            vector=query_embedding,
             top_k=top_k,
-            include_values=False,
-            include_metadata=True,
+            namespace=namespace,
             filter=filterr,
         )
 
-        if not intermediate_results["matches"]:
+        if not matches:
             return "No relevant data found"
 
-        reranked_results = self.pc.inference.rerank(
-            model=constants.PINECONE_RERANKER_MODEL,
-            query=query,
-            documents=[
-                match["metadata"]["text"] for match in intermediate_results["matches"]
-            ],
-            top_n=top_k,
-            return_documents=True,
-            parameters={"truncate": "END"},
-        )
+        ranked = self.rerank(query, matches, top_k)
 
-        retrieved_results = [item["document"]["text"] for item in reranked_results.data]
+        if token_budget:
+            packed = ContextPacker(token_budget).pack(
+                [
+                    {
+                        "text": match["metadata"]["text"],
+                        "token_count": match["metadata"].get("token_count"),
+                    }
+                    for match in ranked
+                ]
+            )
+            logger.info(
+                f"Packed {packed['packed']}/{len(ranked)} chunks, "
+                f"{packed['used_tokens']}/{packed['budget']} tokens "
+                f"({packed['fill_ratio']:.0%}), dropped "
+                f"{packed['dropped_duplicates']} duplicates and "
+                f"{packed['dropped_over_budget']} over budget."
+            )
+            retrieved_results = packed["texts"]
+        else:
+            retrieved_results = [match["metadata"]["text"] for match in ranked]
 
         retrieved_results_str = "---\n" + query + "\n"
         retrieved_results_str += "\n".join(retrieved_results)
@@ -84,7 +164,26 @@ class QueryAgent:
 
         return retrieved_results_str
 
-    def retrieve_relevant_data(self, user_query, namespace, filename=None, top_k=7):
+    def rerank(self, query, matches, top_k):
+        """Reranker se matches ko order karega, offline mode mein vector order"""
+
+        if self.pc is None:
+            return matches[:top_k]
+
+        reranked_results = self.pc.inference.rerank(
+            model=constants.PINECONE_RERANKER_MODEL,
+            query=query,
+            documents=[match["metadata"]["text"] for match in matches],
+            top_n=top_k,
+            return_documents=False,
+            parameters={"truncate": "END"},
+        )
+
+        return [matches[item["index"]] for item in reranked_results.data]
+
+    def retrieve_relevant_data(
+        self, user_query, namespace, filename=None, top_k=None, token_budget=None
+    ):
         """User query ke hisaab se relevant data retrieve karega"""
 
         # queries, namespaces = self.choose_query_and_namespace(user_query)
@@ -93,7 +192,124 @@ class QueryAgent:
 
         # for query, namespace in zip(queries, namespaces):
         retrieved_data.append(
-            self.query_database(user_query, namespace, top_k, filename)
+            self.query_database(user_query, namespace, top_k, filename, token_budget)
         )
 
         return retrieved_data
+
+    def retrieve_many(
+        self,
+        queries,
+        namespace,
+        filename=None,
+        top_k=None,
+        max_workers=8,
+        token_budget=None,
+        on_result=None,
+    ):
+        """
+        Bahut saari queries ek round mein: saari queries ek hi batched embed call
+        mein, phir vector search + rerank har query ke liye parallel threads mein.
+
+        `top_k` ek int ho sakta hai ya har query ke liye alag list
+        (e.g. checklist ke liye 2, risk ke liye 10). `token_budget` bhi same
+        tarah int ya list ho sakta hai. `on_result(i, context)` har query ke
+        complete hote hi bulaya jata hai, baaki queries ka intezaar kiye bina.
+
+        Returns:
+            list[str]: har query ka retrieved context, `queries` ke order mein
+        """
+
+        queries = list(queries)
+        if not queries:
+            return []
+
+        budgets = (
+            list(token_budget)
+            if isinstance(token_budget, (list, tuple))
+            else [token_budget] * len(queries)
+        )
+        top_ks = (
+            list(top_k) if isinstance(top_k, (list, tuple)) else [top_k] * len(queries)
+        )
+        top_ks = [self.candidate_count(k, b) for k, b in zip(top_ks, budgets)]
+        keys = [
+            self.cache_key(query, namespace, filename, k, b)
+            for query, k, b in zip(queries, top_ks, budgets)
+        ]
+        results = [self.cache.get(key) for key in keys]
+        if on_result:
+            for i, result in enumerate(results):
+                if result is not None:
+                    on_result(i, result)
+
+        # Sirf cache miss wali queries embed aur search hongi
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+
+        query_embeddings = self.embedder.embed_queries([queries[i] for i in pending])
+        filterr = self.source_filter(filename)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+            futures = {
+                pool.submit(
+                    self.search_and_rerank,
+                    queries[i],
+                    embedding,
+                    namespace,
+                    top_ks[i],
+                    filterr,
+                    budgets[i],
+                ): i
+                for i, embedding in zip(pending, query_embeddings)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                self.cache.put(keys[i], results[i])
+                if on_result:
+                    on_result(i, results[i])
+
+        return results
+
+    async def aquery_database(
+        self, query, namespace, top_k, filename=None, token_budget=None
+    ):
+        """query_database ka async version (Pinecone client sync hai, thread mein chalega)"""
+
+        return await asyncio.to_thread(
+            self.query_database, query, namespace, top_k, filename, token_budget
+        )
+
+    async def aretrieve_relevant_data(
+        self, user_query, namespace, filename=None, top_k=None, token_budget=None
+    ):
+        """retrieve_relevant_data ka async version (aquery_database se thread offload)"""
+
+        return [
+            await self.aquery_database(
+                user_query, namespace, top_k, filename, token_budget
+            )
+        ]
+
+    async def aretrieve_many(
+        self,
+        queries,
+        namespace,
+        filename=None,
+        top_k=None,
+        max_workers=8,
+        token_budget=None,
+    ):
+        """retrieve_many ka async version: async-native nahi, poora round ek thread mein"""
+
+        return await asyncio.to_thread(
+            self.retrieve_many,
+            queries,
+            namespace,
+            filename,
+            top_k,
+            max_workers,
+            token_budget,
+        )
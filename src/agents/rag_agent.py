@@ -6,11 +6,13 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 import logging
 
+from agents.async_utils import BatchInvokeMixin
+
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
-class RAGAgent:
+class RAGAgent(BatchInvokeMixin):
 
     def __init__(
         self, model: str = "gemini-1.5-flash-latest"
@@ -78,6 +80,24 @@ class RAGAgent:
                 "error": f"Failed to generate checklist using Google model. Error: {str(e)}"
             }
 
+    async def ainvoke(self, context: str, question: str) -> Dict[str, Any]:
+
+        if not context or not question:
+            logger.error("Context or question is empty.")
+            return {"error": "Context and question must be provided."}
+
+        try:
+            chain = self.prompt_template | self.llm
+            logger.info("Invoking async analysis chain...")
+            response = await chain.ainvoke({"context": context, "question": question})
+            return response.content
+
+        except Exception as e:
+            logger.exception(f"Error invoking RAG agent with Google model: {e}")
+            return {
+                "error": f"Failed to generate answer using Google model. Error: {str(e)}"
+            }
+
 
 if __name__ == "__main__":
     # Example usage
@@ -1,43 +1,91 @@
-from google import genai
+import asyncio
 from google.genai import types
 from dotenv import load_dotenv
-import os
 from pydantic import BaseModel
 
+from agents.llm_cache import get_llm_cache
+from clients import get_genai_client
+
 load_dotenv()
 
+REFERENCES_MODEL = "gemini-2.0-flash"
+REFERENCES_PROMPT = (
+    "Share me all the links related articles, news, etc related to the RPF below.--\n"
+)
+
 
 class LinksFormat(BaseModel):
     links: list[str]
 
 
-def get_references(context: str):
+def _references_key(context: str):
+    # Same RFP opening -> same links, dono Gemini calls skip ho jaati hai
+    cache = get_llm_cache()
+    return cache, cache.make_key(
+        REFERENCES_MODEL, REFERENCES_PROMPT + context, LinksFormat
+    )
+
 
-    client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+def _search_request(context: str):
+    """Google Search grounding wali pehli call ke arguments"""
 
-    response = client.models.generate_content(
-        model="gemini-2.0-flash",
-        contents="Share me all the links related articles, news, etc related to the RPF below.--\n"
-        + context,
-        config=types.GenerateContentConfig(
+    return {
+        "model": REFERENCES_MODEL,
+        "contents": REFERENCES_PROMPT + context,
+        "config": types.GenerateContentConfig(
             tools=[types.Tool(google_search=types.GoogleSearchRetrieval)]
         ),
-    )
+    }
+
 
-    response = client.models.generate_content(
-        model="gemini-2.0-flash",
-        contents=f"Structure the links in a list format with its components as links. {response}",
-        config={
+def _structure_request(search_response):
+    """Search response ko LinksFormat mein structure karne wali call"""
+
+    return {
+        "model": REFERENCES_MODEL,
+        "contents": f"Structure the links in a list format with its components as links. {search_response}",
+        "config": {
             "response_mime_type": "application/json",
             "response_schema": LinksFormat,
         },
-    )
+    }
 
-    # print(response.parsed.links)
 
+def _store_links(cache, key, response):
+    cache.put(key, response.parsed)
     return response.parsed.links
 
 
+def get_references(context: str):
+
+    cache, key = _references_key(context)
+    cached = cache.get(key, LinksFormat)
+    if cached is not None:
+        return cached.links
+
+    client = get_genai_client()
+    response = client.models.generate_content(**_search_request(context))
+    response = client.models.generate_content(**_structure_request(response))
+    return _store_links(cache, key, response)
+
+
+async def aget_references(context: str):
+    """
+    Async version of `get_references` using the genai aio client. Cache reads
+    and writes (SQLite) run in a worker thread.
+    """
+
+    cache, key = _references_key(context)
+    cached = await asyncio.to_thread(cache.get, key, LinksFormat)
+    if cached is not None:
+        return cached.links
+
+    client = get_genai_client()
+    response = await client.aio.models.generate_content(**_search_request(context))
+    response = await client.aio.models.generate_content(**_structure_request(response))
+    return await asyncio.to_thread(_store_links, cache, key, response)
+
+
 if __name__ == "__main__":
     context = (
         "RPF: The RPF is a document that outlines the requirements and expectations for a project or initiative. "
@@ -1,4 +1,7 @@
-import matplotlib.pyplot as plt
+import os
+import time
+import uuid
+from functools import lru_cache
 from reportlab.platypus import (
     SimpleDocTemplate,
     Paragraph,
@@ -13,9 +16,7 @@ from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import inch
 from io import BytesIO
-import pandas as pd
 
-import matplotlib.pyplot as plt
 from reportlab.platypus import (
     SimpleDocTemplate,
     Paragraph,
@@ -31,15 +32,16 @@ from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import inch
 from io import BytesIO
-import pandas as pd
 from textwrap import wrap
 
+import constants
+from agents.report_charts import eligibility_counts, render_charts, value_counts
+
 
 def wrap_text(text, width=60):
     return "\n".join(wrap(str(text), width=width))
 
 
-import matplotlib.pyplot as plt
 from reportlab.platypus import (
     SimpleDocTemplate,
     Paragraph,
@@ -55,48 +57,97 @@ from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import inch
 from io import BytesIO
-import pandas as pd
 
 
-def generate_pdf_report(data, filename="rfp_report.pdf"):
+def new_report_path(output_dir=None):
+    """
+    Unique per-job path under the managed report directory, so concurrent
+    sessions never write to the same file. Reports older than
+    REPORT_OUTPUT_TTL are cleaned up on the way.
+    """
+
+    output_dir = output_dir or constants.REPORT_OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+
+    cutoff = time.time() - constants.REPORT_OUTPUT_TTL
+    for name in os.listdir(output_dir):
+        path = os.path.join(output_dir, name)
+        try:
+            if name.endswith(".pdf") and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            continue
+
+    return os.path.join(output_dir, f"report-{uuid.uuid4().hex}.pdf")
+
+
+def build_pdf_report(data) -> bytes:
+    """Build the report entirely in memory and return the PDF bytes."""
+
+    buffer = BytesIO()
     doc = SimpleDocTemplate(
-        filename,
+        buffer,
         pagesize=A4,
         rightMargin=30,
         leftMargin=30,
         topMargin=30,
         bottomMargin=18,
     )
-    styles = getSampleStyleSheet()
-    story = []
+    doc.build(build_report_story(data))
+    return buffer.getvalue()
 
-    # Custom styles
-    title_style = ParagraphStyle(
-        name="Title", fontSize=20, textColor=colors.HexColor("#2E86C1"), spaceAfter=20
-    )
-    h2_style = ParagraphStyle(
-        name="Heading2",
-        fontSize=14,
-        textColor=colors.HexColor("#1ABC9C"),
-        spaceAfter=10,
-    )
-    normal_style = styles["BodyText"]
 
-    story.append(Paragraph("RFP Compliance Report", title_style))
-    story.append(Spacer(1, 6))
+def generate_pdf_report(data, filename=None):
+    """
+    Build the report and write it to `filename`, or to a fresh per-job path
+    under REPORT_OUTPUT_DIR when no filename is given.
 
-    # 1️⃣ Eligibility Section
-    story.append(Paragraph("1. Eligibility Assessment", h2_style))
+    Returns:
+        str: path of the written PDF
+    """
+
+    pdf_bytes = build_pdf_report(data)
+    filename = filename or new_report_path()
+
+    tmp_path = f"{filename}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pdf_bytes)
+    os.replace(tmp_path, filename)
+
+    print(f"✅ PDF successfully generated: {filename}")
+    return filename
+
+
+@lru_cache(maxsize=None)
+def report_styles():
+    """Shared paragraph styles; reportlab only reads them while building."""
+
+    styles = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            name="Title",
+            fontSize=20,
+            textColor=colors.HexColor("#2E86C1"),
+            spaceAfter=20,
+        ),
+        "h2": ParagraphStyle(
+            name="Heading2",
+            fontSize=14,
+            textColor=colors.HexColor("#1ABC9C"),
+            spaceAfter=10,
+        ),
+        "normal": styles["BodyText"],
+    }
+
+
+def eligibility_section(eligibility):
+    styles = report_styles()
+    normal_style = styles["normal"]
 
     eligibility_data = [
         ["Criteria", "Required", "Current", "Matches", "Corrective Steps"]
     ]
-    match_count = mismatch_count = 0
-    for item in data["eligibility"]["compliance_criteria"]:
-        if item["matches"]:
-            match_count += 1
-        else:
-            mismatch_count += 1
+    for item in eligibility["compliance_criteria"]:
         eligibility_data.append(
             [
                 Paragraph(item["criteria"], normal_style),
@@ -119,42 +170,23 @@ def generate_pdf_report(data, filename="rfp_report.pdf"):
             ]
         )
     )
-    story.append(eligibility_table)
-    story.append(Spacer(1, 6))
-    story.append(
+    return [
+        Paragraph("1. Eligibility Assessment", styles["h2"]),
+        eligibility_table,
+        Spacer(1, 6),
         Paragraph(
-            f"<b>Summary:</b> {data['eligibility']['overall_eligibility_assessment']}",
+            f"<b>Summary:</b> {eligibility['overall_eligibility_assessment']}",
             normal_style,
-        )
-    )
+        ),
+    ]
 
-    # Eligibility donut chart
-    story.append(Spacer(1, 10))
-    story.append(Paragraph("    Eligibility Match Overview", h2_style))
-    plt.figure(figsize=(3.5, 3.5))
-    plt.pie(
-        [match_count, mismatch_count],
-        labels=["Match", "Mismatch"],
-        colors=["#2ECC71", "#E74C3C"],
-        autopct="%1.1f%%",
-        startangle=140,
-        wedgeprops={"width": 0.4},
-    )
-    plt.title("Eligibility Match Ratio")
-    buffer = BytesIO()
-    plt.savefig(buffer, format="PNG")
-    plt.close()
-    buffer.seek(0)
-    story.append(Image(buffer, width=3.5 * inch, height=3.5 * inch))
 
-    story.append(Spacer(1, 14))
+def checklist_section(checklist):
+    styles = report_styles()
+    normal_style = styles["normal"]
 
-    # 2️⃣ Checklist Section
-    story.append(Paragraph("2. Submission Checklist", h2_style))
     checklist_data = [["Task", "Priority", "Deadline"]]
-
-    print(data)
-    for item in data["checklist"]["items"]:
+    for item in checklist["items"]:
         checklist_data.append(
             [
                 Paragraph(item["task"], normal_style),
@@ -175,30 +207,15 @@ def generate_pdf_report(data, filename="rfp_report.pdf"):
             ]
         )
     )
-    story.append(checklist_table)
-
-    # Checklist pie chart
-    story.append(Spacer(1, 10))
-    story.append(Paragraph("    Task Priority Distribution", h2_style))
-    checklist_df = pd.DataFrame(data["checklist"]["items"])
-    plt.figure(figsize=(4, 4))
-    checklist_df["priority"].value_counts().plot(
-        kind="pie", autopct="%1.1f%%", colors=["#F1C40F", "#E74C3C", "#2ECC71"]
-    )
-    plt.ylabel("")
-    plt.title("Checklist Priorities")
-    pie_buffer = BytesIO()
-    plt.savefig(pie_buffer, format="PNG")
-    plt.close()
-    pie_buffer.seek(0)
-    story.append(Image(pie_buffer, width=3.5 * inch, height=3.5 * inch))
+    return [Paragraph("2. Submission Checklist", styles["h2"]), checklist_table]
 
-    story.append(Spacer(1, 14))
 
-    # 3️⃣ Risk Analysis
-    story.append(Paragraph("3. Risk Analysis", h2_style))
+def risk_section(risk_analysis):
+    styles = report_styles()
+    normal_style = styles["normal"]
+
     risk_data = [["Description", "Severity", "Mitigation Strategy"]]
-    for risk in data["risk_analysis"]["identified_risks"]:
+    for risk in risk_analysis["identified_risks"]:
         risk_data.append(
             [
                 Paragraph(risk["risk_description"], normal_style),
@@ -219,38 +236,88 @@ def generate_pdf_report(data, filename="rfp_report.pdf"):
             ]
         )
     )
-    story.append(risk_table)
-
-    # Risk bar chart
-    story.append(Spacer(1, 10))
-    story.append(Paragraph("    Risk Severity Overview", h2_style))
-    risk_df = pd.DataFrame(data["risk_analysis"]["identified_risks"])
-    severity_count = risk_df["severity"].value_counts()
-    plt.figure(figsize=(5, 3))
-    severity_count.plot(kind="bar", color="#E67E22")
-    plt.title("Risk Severity Levels")
-    plt.ylabel("Count")
-    plt.xticks(rotation=0)
-    bar_buffer = BytesIO()
-    plt.savefig(bar_buffer, format="PNG")
-    plt.close()
-    bar_buffer.seek(0)
-    story.append(Image(bar_buffer, width=4 * inch, height=3 * inch))
+    return [Paragraph("3. Risk Analysis", styles["h2"]), risk_table]
 
-    story.append(Spacer(1, 14))
 
-    # 4️⃣ References
-    story.append(Paragraph("4. Relevant References", h2_style))
-    references = data["references"]
+def references_section(references):
+    styles = report_styles()
     bullet_list = ListFlowable(
-        [ListItem(Paragraph(link, normal_style)) for link in references],
+        [ListItem(Paragraph(link, styles["normal"])) for link in references],
         bulletType="bullet",
     )
-    story.append(bullet_list)
+    return [Paragraph("4. Relevant References", styles["h2"]), bullet_list]
 
-    # Build the document
-    doc.build(story)
-    print(f"✅ PDF successfully generated: {filename}")
+
+def chart_block(title, png, width, height):
+    # Images har build mein naye, PNG bytes ChartCache se aate hai
+    return [
+        Spacer(1, 10),
+        Paragraph(f"    {title}", report_styles()["h2"]),
+        Image(BytesIO(png), width=width, height=height),
+    ]
+
+
+def build_report_story(data):
+    """
+    Reportlab flowables for the whole report.
+
+    Building the flowables is cheap next to doc.build's layout, so sections
+    are rebuilt every time; only the chart PNGs come from a cache.
+    """
+
+    styles = report_styles()
+
+    # Saare charts pehle hi concurrently render (ya cache se) ho jaate hai
+    charts = render_charts(
+        {
+            "eligibility": (
+                "eligibility_donut",
+                eligibility_counts(data["eligibility"]["compliance_criteria"]),
+            ),
+            "priority": (
+                "priority_pie",
+                value_counts(data["checklist"]["items"], "priority"),
+            ),
+            "severity": (
+                "severity_bar",
+                value_counts(data["risk_analysis"]["identified_risks"], "severity"),
+            ),
+        }
+    )
+
+    story = [Paragraph("RFP Compliance Report", styles["title"]), Spacer(1, 6)]
+
+    # 1️⃣ Eligibility Section
+    story += eligibility_section(data["eligibility"])
+    story += chart_block(
+        "Eligibility Match Overview",
+        charts["eligibility"],
+        width=3.5 * inch,
+        height=3.5 * inch,
+    )
+    story.append(Spacer(1, 14))
+
+    # 2️⃣ Checklist Section
+    story += checklist_section(data["checklist"])
+    story += chart_block(
+        "Task Priority Distribution",
+        charts["priority"],
+        width=3.5 * inch,
+        height=3.5 * inch,
+    )
+    story.append(Spacer(1, 14))
+
+    # 3️⃣ Risk Analysis
+    story += risk_section(data["risk_analysis"])
+    story += chart_block(
+        "Risk Severity Overview", charts["severity"], width=4 * inch, height=3 * inch
+    )
+    story.append(Spacer(1, 14))
+
+    # 4️⃣ References
+    story += references_section(list(data["references"]))
+
+    return story
 
 
 if __name__ == "__main__":
@@ -309,4 +376,4 @@ if __name__ == "__main__":
         "references": ["https://example.com/link1", "https://example.com/link2"],
     }
 
-    generate_pdf_report(input_data)
+    generate_pdf_report(input_data, filename="rfp_report.pdf")
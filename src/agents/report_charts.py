@@ -0,0 +1,200 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import constants
+from clients import get_shared
+
+logger = logging.getLogger(__name__)
+
+# Bump when a chart's look changes so cached PNGs are not reused
+CHART_STYLE_VERSION = 1
+
+
+def eligibility_counts(criteria):
+    """[(label, count)] for the eligibility donut."""
+
+    matched = sum(1 for item in criteria if item["matches"])
+    return [("Match", matched), ("Mismatch", len(criteria) - matched)]
+
+
+def value_counts(items, key):
+    """Most-common-first counts of `item[key]`, like pandas' value_counts."""
+
+    return Counter(item[key] for item in items).most_common()
+
+
+def _no_data(ax):
+    ax.text(0.5, 0.5, "No data", ha="center", va="center")
+    ax.set_axis_off()
+
+
+def _draw_eligibility_donut(fig, counts):
+    ax = fig.add_subplot()
+    labels, values = zip(*counts)
+    if not any(values):
+        _no_data(ax)
+    else:
+        ax.pie(
+            values,
+            labels=labels,
+            colors=["#2ECC71", "#E74C3C"],
+            autopct="%1.1f%%",
+            startangle=140,
+            wedgeprops={"width": 0.4},
+        )
+    ax.set_title("Eligibility Match Ratio")
+
+
+def _draw_priority_pie(fig, counts):
+    ax = fig.add_subplot()
+    if not counts:
+        _no_data(ax)
+    else:
+        labels, values = zip(*counts)
+        ax.pie(
+            values,
+            labels=labels,
+            autopct="%1.1f%%",
+            colors=["#F1C40F", "#E74C3C", "#2ECC71"],
+        )
+    ax.set_title("Checklist Priorities")
+
+
+def _draw_severity_bar(fig, counts):
+    ax = fig.add_subplot()
+    if not counts:
+        _no_data(ax)
+    else:
+        labels, values = zip(*counts)
+        ax.bar(labels, values, color="#E67E22")
+        ax.set_ylabel("Count")
+        ax.tick_params(axis="x", labelrotation=0)
+    ax.set_title("Risk Severity Levels")
+
+
+# kind -> (draw function, figure size in inches)
+CHARTS = {
+    "eligibility_donut": (_draw_eligibility_donut, (3.5, 3.5)),
+    "priority_pie": (_draw_priority_pie, (4, 4)),
+    "severity_bar": (_draw_severity_bar, (5, 3)),
+}
+
+
+def render_chart(kind, counts):
+    """
+    Render one chart to PNG bytes.
+
+    Uses a standalone Figure with an Agg canvas instead of pyplot's global
+    state, so several charts can render at once in a thread or process pool.
+    """
+
+    draw, figsize = CHARTS[kind]
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    draw(fig, counts)
+
+    buffer = BytesIO()
+    fig.savefig(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class ChartCache:
+    """
+    Rendered chart PNGs keyed by chart kind and the counts behind it.
+
+    A small in-memory LRU sits in front of a directory of PNG files, so a
+    report regenerated after an edit that leaves the counts alone reuses the
+    chart without drawing it again.
+    """
+
+    def __init__(self, cache_dir=None, max_entries=64):
+        self.cache_dir = cache_dir or constants.CHART_CACHE_DIR
+        self.max_entries = max_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(kind, counts):
+        payload = json.dumps([CHART_STYLE_VERSION, kind, counts])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".png")
+
+    def get(self, key):
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+
+        try:
+            with open(self._path(key), "rb") as f:
+                png = f.read()
+        except OSError:
+            return None
+
+        self._remember(key, png)
+        return png
+
+    def put(self, key, png):
+        self._remember(key, png)
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(png)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not write chart cache entry: {e}")
+
+    def _remember(self, key, png):
+        with self.lock:
+            self.memory[key] = png
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_entries:
+                self.memory.popitem(last=False)
+
+
+def get_chart_cache():
+    """Process-wide chart cache."""
+
+    return get_shared("chart_cache", ChartCache)
+
+
+def render_charts(specs, max_workers=None, cache=None):
+    """
+    Render several charts concurrently, skipping any whose counts are cached.
+
+    Args:
+        specs: name -> (kind, counts)
+
+    Returns:
+        name -> PNG bytes
+    """
+
+    cache = cache or get_chart_cache()
+    keys = {
+        name: cache.make_key(kind, counts) for name, (kind, counts) in specs.items()
+    }
+    pngs = {name: cache.get(key) for name, key in keys.items()}
+    missing = [name for name, png in pngs.items() if png is None]
+
+    if missing:
+        workers = max_workers or constants.CHART_RENDER_WORKERS
+        with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as pool:
+            rendered = pool.map(lambda name: render_chart(*specs[name]), missing)
+            for name, png in zip(missing, rendered):
+                cache.put(keys[name], png)
+                pngs[name] = png
+
+    logger.info(f"Rendered {len(missing)}/{len(specs)} charts, rest from cache.")
+    return pngs
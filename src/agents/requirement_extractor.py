@@ -0,0 +1,138 @@
+import os
+import logging
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Dict, List, Tuple
+
+from pydantic import BaseModel, Field
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.prompts import ChatPromptTemplate
+
+import constants
+from agents.prompts import REQUIREMENT_EXTRACTION_PROMPT
+from agents.llm_cache import cache_model_id, invoke_cached
+
+logger = logging.getLogger(__name__)
+
+
+# --- Pydantic Models ---
+class RequirementKind(Enum):
+    DATE = "date"
+    AMOUNT = "amount"
+    FORM = "form"
+    CERTIFICATION = "certification"
+    SECTION = "section"
+
+
+class ExtractedRequirement(BaseModel):
+    excerpt: int = Field(description="Number of the excerpt the item was found in.")
+    kind: RequirementKind = Field(description="Type of the extracted item.")
+    value: str = Field(description="The item exactly as written in the excerpt.")
+    normalized: str = Field(
+        description="YYYY-MM-DD for dates, plain USD number for amounts, canonical name otherwise."
+    )
+    description: str = Field(description="Short phrase saying what the item is for.")
+
+
+class ExtractedRequirements(BaseModel):
+    items: List[ExtractedRequirement] = Field(
+        description="All requirement items found in the excerpts."
+    )
+
+
+# --- Requirement Extractor ---
+class RequirementExtractor:
+    """
+    Extracts dates, amounts, forms, certifications and section references from
+    RFP chunks once at ingest time, tagged by chunk ID.
+    """
+
+    def __init__(self, model: str = constants.REQUIREMENT_EXTRACT_MODEL):
+        google_api_key = os.getenv("GEMINI_API_KEY")
+        if not google_api_key:
+            logger.error("GEMINI_API_KEY environment variable is not set.")
+            raise ValueError("GEMINI_API_KEY environment variable must be set.")
+
+        llm = ChatGoogleGenerativeAI(
+            model=model,
+            google_api_key=google_api_key,
+            temperature=0,
+            convert_system_message_to_human=True,
+        )
+        # Cache key ka hissa: same model + temperature + prompt => same output
+        self.model = cache_model_id(llm)
+        self.structured_llm = llm.with_structured_output(ExtractedRequirements)
+        self.prompt_template = ChatPromptTemplate.from_template(
+            textwrap.dedent(REQUIREMENT_EXTRACTION_PROMPT)
+        )
+
+    @staticmethod
+    def batches(chunks: List[Tuple[str, str]], max_chars: int):
+        """(chunk_id, text) pairs ko ~max_chars ke batches mein group karega"""
+
+        batch, size = [], 0
+        for chunk in chunks:
+            if batch and size + len(chunk[1]) > max_chars:
+                yield batch
+                batch, size = [], 0
+            batch.append(chunk)
+            size += len(chunk[1])
+        if batch:
+            yield batch
+
+    def extract_batch(self, batch: List[Tuple[str, str]]) -> Dict[str, List[dict]]:
+        excerpts = "\n\n".join(
+            f"[Excerpt {number}]\n{text}" for number, (_, text) in enumerate(batch)
+        )
+        response = invoke_cached(
+            self.prompt_template,
+            self.structured_llm,
+            ExtractedRequirements,
+            self.model,
+            {"excerpts": excerpts},
+        )
+
+        items_by_chunk = {cid: [] for cid, _ in batch}
+        for item in response.items:
+            if not 0 <= item.excerpt < len(batch):
+                logger.warning(f"Dropping item with unknown excerpt {item.excerpt}.")
+                continue
+            items_by_chunk[batch[item.excerpt][0]].append(
+                {
+                    "kind": item.kind.value,
+                    "value": item.value,
+                    "normalized": item.normalized,
+                    "description": item.description,
+                }
+            )
+        return items_by_chunk
+
+    def extract(
+        self,
+        chunks: List[Tuple[str, str]],
+        max_chars: int = constants.REQUIREMENT_EXTRACT_BATCH_CHARS,
+        max_workers: int = constants.REQUIREMENT_EXTRACT_WORKERS,
+    ) -> Dict[str, List[dict]]:
+        """
+        Args:
+            chunks: (chunk_id, text) pairs
+
+        Returns:
+            chunk_id -> extracted items; failed batches are left out so they
+            get retried on the next ingest
+        """
+
+        batches = list(self.batches(chunks, max_chars))
+        if not batches:
+            return {}
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+            futures = [pool.submit(self.extract_batch, batch) for batch in batches]
+            for future in futures:
+                try:
+                    results.update(future.result())
+                except Exception as e:
+                    logger.exception(f"Requirement extraction failed for a batch: {e}")
+        return results
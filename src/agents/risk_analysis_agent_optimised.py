@@ -7,8 +7,14 @@ from pydantic import BaseModel, Field
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 
+import constants
 from agents.prompts import RISK_ANALYSIS_PROMPT, RISK_ANALYSIS_RAG_PROMPT
+from agents.async_utils import BatchInvokeMixin
+from agents.llm_cache import ainvoke_cached, cache_model_id, invoke_cached
 from agents.query_agent import QueryAgent
+from clients import get_query_agent
+from requirement_index import requirement_hints
+from pre_extraction import format_hints
 
 # --- Logging Setup ---
 logging.basicConfig(level=logging.INFO)
@@ -34,11 +40,17 @@ class RiskAnalysisReport(BaseModel):
     )
 
 
-class RiskAnalysisAgent:
+class RiskAnalysisAgent(BatchInvokeMixin):
     """Analyzes RFP and Company Profile texts to identify potential risks for the bidding company using Google Gemini."""
 
-    def __init__(self, model: str = "gemini-1.5-flash-latest"):
+    def __init__(
+        self, model: str = "gemini-1.5-flash-latest", query_agent: QueryAgent = None
+    ):
+        # Shared QueryAgent, har invoke par naye Pinecone clients nahi banenge
+        self.query_agent = query_agent or get_query_agent()
         self.llm = self._initialize_llm(model)
+        # Cache key ka hissa: same model + temperature + prompt => same output
+        self.model = cache_model_id(self.llm)
         self.structured_llm = self.llm.with_structured_output(RiskAnalysisReport)
         self.prompt_template = self._build_prompt()
 
@@ -65,6 +77,17 @@ class RiskAnalysisAgent:
 
         return ChatPromptTemplate.from_template(template)
 
+    @staticmethod
+    def with_requirement_hints(rfp_text: List[str], filename=None) -> List[str]:
+        """
+        Append ingest-time requirement index entries and regex-extracted values
+        so the LLM only has to judge them instead of finding them.
+        """
+
+        indexed = requirement_hints(filename, ["amount", "certification", "form"])
+        extracted = format_hints(rfp_text, ["amount", "duration"])
+        return rfp_text + [hints for hints in (indexed, extracted) if hints]
+
     def invoke(
         self, rfp_text: str, company_profile: str, filename=None
     ) -> Dict[str, Any]:
@@ -76,15 +99,54 @@ class RiskAnalysisAgent:
             logger.info("Running risk analysis...")
 
             # Comment Here
-            query_agent = QueryAgent()
-            rfp_text = query_agent.retrieve_relevant_data(
-                RISK_ANALYSIS_RAG_PROMPT, "test", filename, top_k=10
+            rfp_text = self.query_agent.retrieve_relevant_data(
+                RISK_ANALYSIS_RAG_PROMPT,
+                "test",
+                filename,
+                token_budget=constants.CONTEXT_TOKEN_BUDGETS["risk_analysis"],
             )
+            rfp_text = self.with_requirement_hints(rfp_text, filename)
             print(rfp_text)
 
-            chain = self.prompt_template | self.structured_llm
-            result = chain.invoke(
-                {"rfp_text": rfp_text, "company_profile": company_profile}
+            result = invoke_cached(
+                self.prompt_template,
+                self.structured_llm,
+                RiskAnalysisReport,
+                self.model,
+                {"rfp_text": rfp_text, "company_profile": company_profile},
+            )
+            logger.info("Risk analysis completed successfully.")
+            return result.dict()
+        except Exception as e:
+            logger.exception(f"Risk analysis failed: {e}")
+            return {
+                "error": f"Failed to generate risk analysis report. Error: {str(e)}"
+            }
+
+    async def ainvoke(
+        self, rfp_text: str, company_profile: str, filename=None
+    ) -> Dict[str, Any]:
+        if not rfp_text or not company_profile:
+            logger.error("RFP or Company Profile text cannot be empty.")
+            return {"error": "RFP or Company Profile text cannot be empty."}
+
+        try:
+            logger.info("Running async risk analysis...")
+
+            rfp_text = await self.query_agent.aretrieve_relevant_data(
+                RISK_ANALYSIS_RAG_PROMPT,
+                "test",
+                filename,
+                token_budget=constants.CONTEXT_TOKEN_BUDGETS["risk_analysis"],
+            )
+            rfp_text = self.with_requirement_hints(rfp_text, filename)
+
+            result = await ainvoke_cached(
+                self.prompt_template,
+                self.structured_llm,
+                RiskAnalysisReport,
+                self.model,
+                {"rfp_text": rfp_text, "company_profile": company_profile},
             )
             logger.info("Risk analysis completed successfully.")
             return result.dict()
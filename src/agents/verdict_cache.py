@@ -0,0 +1,122 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import constants
+from clients import get_shared
+
+logger = logging.getLogger(__name__)
+
+# Words that never change what a requirement asks for
+_FILLER = {
+    "a",
+    "an",
+    "the",
+    "of",
+    "in",
+    "for",
+    "with",
+    "must",
+    "shall",
+    "should",
+    "be",
+    "have",
+    "has",
+    "is",
+    "are",
+    "required",
+    "requirement",
+    "bidder",
+    "offeror",
+    "vendor",
+    "proposer",
+    "contractor",
+    "respondent",
+}
+
+
+def normalise_requirement(text: str) -> str:
+    """'Minimum of 3 years experience.' and 'minimum 3 years experience' map together."""
+
+    words = re.sub(r"[^a-z0-9$.]+", " ", text.lower()).replace(". ", " ").split()
+    return " ".join(word.strip(".") for word in words if word not in _FILLER)
+
+
+class VerdictCache:
+    """
+    Persistent cache of criterion -> match verdicts.
+
+    Entries are keyed by the normalised requirement text and the company
+    profile version, so the same requirement seen in another RFP resolves
+    without an LLM call until the profile file changes.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl: Optional[int] = None):
+        self.db_path = db_path or constants.VERDICT_CACHE_DB
+        self.ttl = ttl if ttl is not None else constants.VERDICT_CACHE_TTL
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "key TEXT PRIMARY KEY, requirement TEXT, profile_version TEXT, "
+                "value TEXT, created_at REAL)"
+            )
+
+    @staticmethod
+    def make_key(requirement: str, profile_version: str) -> str:
+        payload = json.dumps([normalise_requirement(requirement), profile_version])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, requirement: str, profile_version: str) -> Optional[Dict[str, Any]]:
+        key = self.make_key(requirement, profile_version)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value, created_at FROM verdicts WHERE key=?", (key,)
+            ).fetchone()
+
+            if row is None or row[1] + self.ttl <= time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def put(
+        self, requirement: str, profile_version: str, verdict: Dict[str, Any]
+    ) -> None:
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?)",
+                (
+                    self.make_key(requirement, profile_version),
+                    normalise_requirement(requirement),
+                    profile_version,
+                    json.dumps(verdict),
+                    time.time(),
+                ),
+            )
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+def get_verdict_cache() -> VerdictCache:
+    """Process-wide criterion verdict cache."""
+
+    return get_shared("verdict_cache", VerdictCache)
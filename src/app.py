@@ -12,6 +12,7 @@ from langchain.chains.question_answering import load_qa_chain
 from langchain.prompts import PromptTemplate
 from dotenv import load_dotenv
 from main import QueryAgent
+import constants
 
 load_dotenv()
 # os.getenv("GEMINI_API_KEY")
@@ -21,22 +22,22 @@ load_dotenv()
 
 from PDFIngestor.PDFIngestor import DataIngestor
 from agents.rag_agent import RAGAgent
+from clients import get_agent, get_query_agent, get_shared
 
-data_ingestor = DataIngestor()
-query_agent = QueryAgent()
+data_ingestor = get_shared("data_ingestor", DataIngestor)
 
 
 def use_rag_agent(question: str) -> str:
     """Uses the RAG agent to analyze the context and answer the question."""
-    query_agent = QueryAgent()
-    context = query_agent.retrieve_relevant_data(user_query=question, namespace="test")
+    context = get_query_agent().retrieve_relevant_data(
+        user_query=question, namespace="test"
+    )
 
     context = context = "\n\n".join(context)
     if context == "No relevant data found":
         return context
 
-    rag_agent = RAGAgent()
-    response = rag_agent.invoke(context, question)
+    response = get_agent(RAGAgent).invoke(context, question)
 
     return response
 
@@ -73,26 +74,27 @@ def main():
         )
         if st.button("Submit & Process"):
             with st.spinner("Processing..."):
-                uploaded_file = pdf_docs[0]  # your UploadedFile object
-
                 # Save to a temp location (e.g., inside a temp_files/ folder)
                 save_dir = "temp_files"
                 os.makedirs(save_dir, exist_ok=True)
 
-                save_path = os.path.join(save_dir, uploaded_file.name)
+                abs_paths = []
+                for uploaded_file in pdf_docs:
+                    save_path = os.path.join(save_dir, uploaded_file.name)
 
-                # Write the file content
-                with open(save_path, "wb") as f:
-                    f.write(uploaded_file.read())
+                    # Write the file content
+                    with open(save_path, "wb") as f:
+                        f.write(uploaded_file.read())
 
-                # Now you can get the absolute path
-                abs_path = os.path.abspath(save_path)
-                print(abs_path)
+                    abs_paths.append(os.path.abspath(save_path))
+                print(abs_paths)
 
-                # print(pdf_docs[0])
-                # pdf_docs[0] = os.path.abspath(pdf_docs[0])
-                # print(pdf_docs[0])
-                raw_text = data_ingestor.ingest_pdf(abs_path, "rfp-agent", "test")
+                results = data_ingestor.ingest_many(
+                    abs_paths, constants.RFP_INDEX_NAME, "test"
+                )
+                for path, result in results.items():
+                    if isinstance(result, Exception):
+                        st.error(f"{os.path.basename(path)}: {result}")
                 st.success("Done")
 
     # Main content area for displaying chat messages
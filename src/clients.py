@@ -0,0 +1,110 @@
+# Process-wide registry: clients aur agents ek baar bante hai aur phir share
+# hote hai (st.cache_resource jaisa contract), toh hot path par HTTP clients,
+# TLS sessions aur index handles dobara nahi bante.
+
+import os
+import sqlite3
+import threading
+
+import constants
+
+_registry = {}
+# Har key ka apna lock: ek dheema factory (model load, client init) baaki keys
+# ke get_shared ko block nahi karta. RLock taaki factory andar se get_shared
+# bula sake.
+_key_locks = {}
+_registry_lock = threading.Lock()
+
+
+def get_shared(key, factory):
+    """`key` ke liye ek hi instance banaega aur wahi lautaega"""
+
+    with _registry_lock:
+        if key in _registry:
+            return _registry[key]
+        key_lock = _key_locks.setdefault(key, threading.RLock())
+
+    # factory() global lock ke bahar chalta hai, sirf isi key ke callers rukte hai
+    with key_lock:
+        with _registry_lock:
+            if key in _registry:
+                return _registry[key]
+        instance = factory()
+        with _registry_lock:
+            _registry[key] = instance
+        return instance
+
+
+def clear_shared():
+    """Registry khali karega (tests / config change ke baad)"""
+
+    with _registry_lock:
+        _registry.clear()
+        _key_locks.clear()
+
+
+def connect_sqlite(path):
+    """
+    Threads ke beech share hone wala SQLite connection, WAL mode mein. Callers
+    apne lock ke peeche use karte hai.
+    """
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def get_pinecone_client():
+    """
+    Shared Pinecone client. `pool_threads` sirf async_req / parallel upsert
+    wale thread pool ka size hai; HTTP connections client ke andar reuse hote
+    hai kyunki client ek hi baar banta hai.
+    """
+
+    def factory():
+        from pinecone import Pinecone
+
+        return Pinecone(
+            api_key=os.getenv("PINECONE_API_KEY"),
+            pool_threads=constants.PINECONE_POOL_THREADS,
+        )
+
+    return get_shared("pinecone", factory)
+
+
+def get_genai_client():
+    """Shared google-genai client (reference agent ke liye)"""
+
+    def factory():
+        from google import genai
+
+        return genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+
+    return get_shared("genai", factory)
+
+
+def get_shared_embedding_backend(name=None):
+    """Shared embedding backend, local model sirf ek baar load hota hai"""
+
+    from embeddings import get_embedding_backend
+
+    name = name or constants.EMBEDDING_BACKEND
+    return get_shared(("embeddings", name), lambda: get_embedding_backend(name))
+
+
+def get_query_agent():
+    """Shared QueryAgent"""
+
+    from agents.query_agent import QueryAgent
+
+    return get_shared("query_agent", QueryAgent)
+
+
+def get_agent(agent_cls, **kwargs):
+    """Shared agent instance per (class, constructor kwargs)"""
+
+    key = ("agent", agent_cls, tuple(sorted(kwargs.items())))
+    return get_shared(key, lambda: agent_cls(**kwargs))
@@ -0,0 +1,172 @@
+import hashlib
+import os
+import re
+import threading
+
+import constants
+
+# company_profile.txt mein ek line label, agli line uski value. Yahan ek baar
+# parse hota hai aur mtime badalne par hi dobara padha jata hai.
+
+DEFAULT_PROFILE_PATH = os.path.join(os.path.dirname(__file__), "company_profile.txt")
+
+# Structured field -> labels jinme se koi bhi profile mein ho sakta hai
+FIELD_LABELS = {
+    "legal_name": ["company legal name", "legal name", "company name"],
+    "address": ["principal business address", "address"],
+    "duns": ["duns number", "duns"],
+    "uei": ["uei", "unique entity id"],
+    "cage": ["cage code", "cage"],
+    "naics": ["naics codes", "naics code", "naics"],
+    "sam_registration": ["sam.gov registration date", "sam registration"],
+    "state_of_incorporation": ["state of incorporation"],
+    "years_in_business": ["company length of existence", "years in business"],
+    "years_of_experience": [
+        "years of experience in temporary staffing",
+        "years of experience",
+    ],
+    "services": ["services provided", "services offered"],
+    "business_structure": ["business structure"],
+    "insurance": ["certificate of insurance", "insurance coverage", "insurance"],
+    "licenses": ["licenses", "license"],
+    "hub_status": ["historically underutilized business/dbe status", "hub status"],
+    "w9": ["w-9 form", "w9"],
+}
+
+
+class CompanyProfile:
+    """Parsed company profile: label -> value fields aur structured accessors"""
+
+    def __init__(self, text, path=None):
+        self.path = path
+        self.text = text
+        self.fields, self.notes = self.parse(text)
+        self.version = hashlib.sha256(
+            " ".join(text.split()).encode("utf-8")
+        ).hexdigest()[:16]
+
+    @staticmethod
+    def parse(text):
+        """Alternate label/value lines ko dict mein; bachi hui akeli line notes mein"""
+
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        fields = {}
+        notes = []
+
+        # "Label: value" wale profiles bhi chalne chahiye
+        if lines and all(":" in line for line in lines):
+            for line in lines:
+                label, value = line.split(":", 1)
+                fields[label.strip()] = value.strip()
+            return fields, notes
+
+        for i in range(0, len(lines) - 1, 2):
+            fields[lines[i]] = lines[i + 1]
+        if len(lines) % 2:
+            notes.append(lines[-1])
+        return fields, notes
+
+    def get(self, field, default=""):
+        """Structured field (FIELD_LABELS ki key) ya seedha label"""
+
+        labels = FIELD_LABELS.get(field, [field])
+        lowered = {label.lower(): value for label, value in self.fields.items()}
+        for label in labels:
+            if label in lowered:
+                return lowered[label]
+        return default
+
+    @property
+    def legal_name(self):
+        return self.get("legal_name")
+
+    @property
+    def naics_codes(self):
+        return re.findall(r"\b\d{6}\b", self.get("naics"))
+
+    @property
+    def years_in_business(self):
+        match = re.search(r"\d+(?:\.\d+)?", self.get("years_in_business"))
+        return float(match.group()) if match else None
+
+    @property
+    def certifications(self):
+        """Jo certifications/licenses profile mein 'not certified' nahi hai"""
+
+        found = []
+        for label, value in self.fields.items():
+            if re.search(r"certif|licen[cs]e", label, re.IGNORECASE) and not re.match(
+                r"\s*(not|no)\b", value, re.IGNORECASE
+            ):
+                found.append(f"{label}: {value}")
+        return found
+
+    def structured(self):
+        """Saare structured fields ek dict mein (UI / debugging ke liye)"""
+
+        data = {field: self.get(field) for field in FIELD_LABELS}
+        data["naics_codes"] = self.naics_codes
+        data["years_in_business"] = self.years_in_business
+        data["certifications"] = self.certifications
+        return data
+
+    def prompt_text(self):
+        """Prompt ke liye compact 'Label: value' text"""
+
+        lines = [f"{label}: {value}" for label, value in self.fields.items()]
+        lines.extend(self.notes)
+        return "\n".join(lines)
+
+    def __bool__(self):
+        return bool(self.fields or self.notes)
+
+
+_profiles = {}
+_profiles_lock = threading.Lock()
+
+
+def load_company_profile(path=None):
+    """
+    Process-wide parsed profile. Har call par sirf os.stat hota hai; file ka
+    mtime badla ho tabhi dobara padh kar parse karega.
+    """
+
+    path = os.path.abspath(path or DEFAULT_PROFILE_PATH)
+    mtime = os.path.getmtime(path)
+
+    with _profiles_lock:
+        cached = _profiles.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        profile = CompanyProfile(f.read(), path=path)
+
+    with _profiles_lock:
+        _profiles[path] = (mtime, profile)
+    return profile
+
+
+def load_company_profiles(directory=None, include_default=True):
+    """
+    Directory ke saare *.txt profiles (aur default profile), legal name ->
+    CompanyProfile. Legal name na mile toh file ka naam key banta hai.
+    """
+
+    paths = [DEFAULT_PROFILE_PATH] if include_default else []
+    directory = directory or constants.COMPANY_PROFILES_DIR
+    if os.path.isdir(directory):
+        paths.extend(
+            os.path.join(directory, name)
+            for name in sorted(os.listdir(directory))
+            if name.endswith(".txt")
+        )
+
+    profiles = {}
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        profile = load_company_profile(path)
+        name = profile.legal_name or os.path.splitext(os.path.basename(path))[0]
+        profiles.setdefault(name, profile)
+    return profiles
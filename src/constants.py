@@ -1,4 +1,122 @@
+import os
+
 EMBED_MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
 PINECONE_EMBEDDING_MODEL = "llama-text-embed-v2"
 PINECONE_INDEX_NAME = "legalaibot-litigation"
 PINECONE_RERANKER_MODEL = "bge-reranker-v2-m3"
+
+CHUNK_MAX_TOKENS = 1024
+INGEST_CACHE_DIR = os.getenv("INGEST_CACHE_DIR", ".cache/ingest")
+# UI uploads yahan content hash ke naam se (untracked, repo ki files/ se alag)
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", ".cache/uploads")
+# ingest_many ke Docling conversion processes (har ek apne models load karta hai)
+INGEST_CONVERT_WORKERS = int(os.getenv("INGEST_CONVERT_WORKERS", "2"))
+# Itne ya zyada pages wali PDF page-range streaming se ingest hoti hai, taaki
+# poora Docling document ek saath memory mein na aaye
+INGEST_STREAMING_MIN_PAGES = int(os.getenv("INGEST_STREAMING_MIN_PAGES", "60"))
+INGEST_PAGES_PER_BATCH = int(os.getenv("INGEST_PAGES_PER_BATCH", "20"))
+
+RFP_INDEX_NAME = os.getenv("RFP_INDEX_NAME", "rfp-agent")
+
+# "pinecone" (hosted inference) ya "local" (sentence-transformers on CPU)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "pinecone")
+LOCAL_EMBEDDING_BATCH_SIZE = int(os.getenv("LOCAL_EMBEDDING_BATCH_SIZE", "64"))
+LOCAL_EMBEDDING_THREADS = int(os.getenv("LOCAL_EMBEDDING_THREADS", "0"))
+
+# "pinecone" (serverless index) ya "local" (embedded NumPy index on disk)
+VECTOR_STORE = os.getenv("VECTOR_STORE", "pinecone")
+LOCAL_INDEX_DIR = os.getenv("LOCAL_INDEX_DIR", ".cache/vector_index")
+# "exact" (brute-force matmul) ya "hnsw" (hnswlib, bade corpora ke liye)
+LOCAL_INDEX_MODE = os.getenv("LOCAL_INDEX_MODE", "exact")
+# Itne se zyada segments hone par sabse chhote segments merge hote hai
+LOCAL_INDEX_MAX_SEGMENTS = int(os.getenv("LOCAL_INDEX_MAX_SEGMENTS", "8"))
+# Segment ki itni fraction rows delete ho chuki ho toh woh dobara likha jata hai
+LOCAL_INDEX_MAX_DEAD_FRACTION = float(os.getenv("LOCAL_INDEX_MAX_DEAD_FRACTION", "0.3"))
+# Doosre process ke writes dekhne ke liye manifest ka stat itne seconds mein ek baar
+LOCAL_INDEX_RECHECK_INTERVAL = float(os.getenv("LOCAL_INDEX_RECHECK_INTERVAL", "1.0"))
+
+# "pinecone" ya "none" (vector score order hi rakho, fully offline)
+RERANKER_BACKEND = os.getenv("RERANKER_BACKEND", "pinecone")
+
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "512"))
+QUERY_CACHE_TTL = int(os.getenv("QUERY_CACHE_TTL", "3600"))
+# Khali ho toh sirf in-process LRU tier chalega
+QUERY_CACHE_DB = os.getenv("QUERY_CACHE_DB", ".cache/query_cache.sqlite")
+INDEX_VERSIONS_DB = os.getenv("INDEX_VERSIONS_DB", ".cache/index_versions.sqlite")
+
+# Shared Pinecone client ke async requests (async_req) wale thread pool ka size
+PINECONE_POOL_THREADS = int(os.getenv("PINECONE_POOL_THREADS", "8"))
+
+RAG_NAMESPACE = "test"
+
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", ".cache/llm_cache.sqlite")
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+# RFP text isse lamba ho toh compliance map-reduce mode mein chalega
+COMPLIANCE_MAP_REDUCE_THRESHOLD = int(
+    os.getenv("COMPLIANCE_MAP_REDUCE_THRESHOLD", "60000")
+)
+COMPLIANCE_CHUNK_CHARS = int(os.getenv("COMPLIANCE_CHUNK_CHARS", "12000"))
+COMPLIANCE_CHUNK_OVERLAP = int(os.getenv("COMPLIANCE_CHUNK_OVERLAP", "500"))
+COMPLIANCE_MAP_CONCURRENCY = int(os.getenv("COMPLIANCE_MAP_CONCURRENCY", "4"))
+
+# Har agent ke RAG context ka token budget (EMBED_MODEL_ID tokenizer se gina hua)
+CONTEXT_TOKEN_BUDGETS = {
+    "checklist": int(os.getenv("CHECKLIST_CONTEXT_TOKENS", "2500")),
+    "risk_analysis": int(os.getenv("RISK_CONTEXT_TOKENS", "8000")),
+    "chat": int(os.getenv("CHAT_CONTEXT_TOKENS", "3000")),
+}
+# Budget mode mein itne reranked candidates mein se pack hota hai
+CONTEXT_CANDIDATE_POOL = int(os.getenv("CONTEXT_CANDIDATE_POOL", "20"))
+CONTEXT_DEDUPE_THRESHOLD = float(os.getenv("CONTEXT_DEDUPE_THRESHOLD", "0.8"))
+
+# Ingest par per-file requirement index (dates, amounts, forms, certifications,
+# sections). Har ingest par Gemini calls hoti hai, isliye default band
+REQUIREMENT_INDEX_ENABLED = os.getenv("REQUIREMENT_INDEX_ENABLED", "0") == "1"
+REQUIREMENT_INDEX_DB = os.getenv(
+    "REQUIREMENT_INDEX_DB", ".cache/requirement_index.sqlite"
+)
+REQUIREMENT_EXTRACT_MODEL = os.getenv("REQUIREMENT_EXTRACT_MODEL", "gemini-2.0-flash")
+# Ek extraction call mein itne characters ke chunks jaate hai
+REQUIREMENT_EXTRACT_BATCH_CHARS = int(
+    os.getenv("REQUIREMENT_EXTRACT_BATCH_CHARS", "12000")
+)
+REQUIREMENT_EXTRACT_WORKERS = int(os.getenv("REQUIREMENT_EXTRACT_WORKERS", "4"))
+
+# Criterion -> verdict cache, key (normalised requirement, profile version)
+VERDICT_CACHE_DB = os.getenv("VERDICT_CACHE_DB", ".cache/verdict_cache.sqlite")
+VERDICT_CACHE_TTL = int(os.getenv("VERDICT_CACHE_TTL", str(30 * 24 * 3600)))
+
+# Teaming partners / doosri entities ke profiles (har file ek company)
+COMPANY_PROFILES_DIR = os.getenv(
+    "COMPANY_PROFILES_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "company_profiles"),
+)
+
+# Isse kam compliance score par UI "not eligible" dikhata hai
+ELIGIBILITY_SCORE_THRESHOLD = float(os.getenv("ELIGIBILITY_SCORE_THRESHOLD", "50"))
+
+# Report charts ke rendered PNGs, counts ke hash se
+CHART_CACHE_DIR = os.getenv("CHART_CACHE_DIR", ".cache/charts")
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", "3"))
+
+# generate_pdf_report ke per-job PDFs yahan, itne seconds baad saaf
+REPORT_OUTPUT_DIR = os.getenv("REPORT_OUTPUT_DIR", ".cache/reports")
+REPORT_OUTPUT_TTL = int(os.getenv("REPORT_OUTPUT_TTL", str(24 * 3600)))
+
+# Agent results ka server-side store, key (PDF hash, profile version, agent version)
+RESULT_STORE_ENABLED = os.getenv("RESULT_STORE_ENABLED", "1") == "1"
+RESULT_STORE_DB = os.getenv("RESULT_STORE_DB", ".cache/result_store.sqlite")
+RESULT_STORE_TTL = int(os.getenv("RESULT_STORE_TTL", str(30 * 24 * 3600)))
+# Stored results ke format mein breaking change ho toh badhao
+RESULT_STORE_VERSION = 1
+
+# Local job queue (SQLite job table + worker pool) jisse UI sirf status poll karti hai
+JOB_QUEUE_DB = os.getenv("JOB_QUEUE_DB", ".cache/job_queue.sqlite")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# Itne seconds tak done job bhi duplicate submits ko collapse karta hai
+JOB_DONE_TTL = int(os.getenv("JOB_DONE_TTL", "3600"))
+# Itne purane "running" jobs ko atka hua maana jata hai (owner zinda ho tab bhi)
+JOB_STALE_AFTER = int(os.getenv("JOB_STALE_AFTER", "1800"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
@@ -0,0 +1,101 @@
+import logging
+from functools import lru_cache
+
+import constants
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _tokenizer():
+    """HybridChunker wala hi tokenizer, taaki ingest aur packing ki ginti same ho"""
+
+    try:
+        from transformers import AutoTokenizer
+    except ImportError:
+        return None
+    return AutoTokenizer.from_pretrained(constants.EMBED_MODEL_ID)
+
+
+def count_tokens(text):
+    """Text ke tokens ginega, tokenizer na mile toh ~4 chars/token ka andaaza"""
+
+    tokenizer = _tokenizer()
+    if tokenizer is None:
+        return max(1, len(text) // 4)
+    return len(tokenizer.encode(text, add_special_tokens=False, verbose=False))
+
+
+def _shingles(text, size=5):
+    words = text.lower().split()
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def _similarity(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ContextPacker:
+    """
+    Reranked chunks ko token budget mein greedily pack karega.
+
+    Chunks rerank order mein aate hai; jo budget mein fit ho aur pehle chune
+    gaye kisi chunk ka near-duplicate na ho, woh le liya jata hai. Bada chunk
+    fit na ho toh skip hota hai aur agle chhote chunks try hote hai.
+    """
+
+    def __init__(self, budget, dedupe_threshold=None):
+        self.budget = budget
+        self.dedupe_threshold = (
+            constants.CONTEXT_DEDUPE_THRESHOLD
+            if dedupe_threshold is None
+            else dedupe_threshold
+        )
+
+    def pack(self, chunks):
+        """
+        Args:
+            chunks: rerank order mein `{"text", "token_count"?}` dicts;
+                `token_count` ingest par metadata mein store hota hai, purane
+                records ke liye yahin gin liya jata hai
+
+        Returns:
+            dict: `texts` (packed, rerank order mein) aur fill report
+        """
+
+        texts, kept_shingles = [], []
+        used = duplicates = over_budget = 0
+
+        for chunk in chunks:
+            text = chunk["text"]
+            tokens = chunk.get("token_count") or count_tokens(text)
+
+            shingles = _shingles(text)
+            if any(
+                _similarity(shingles, kept) >= self.dedupe_threshold
+                for kept in kept_shingles
+            ):
+                duplicates += 1
+                continue
+
+            if used + tokens > self.budget:
+                over_budget += 1
+                continue
+
+            texts.append(text)
+            kept_shingles.append(shingles)
+            used += tokens
+
+        return {
+            "texts": texts,
+            "budget": self.budget,
+            "used_tokens": used,
+            "fill_ratio": round(used / self.budget, 3) if self.budget else 0.0,
+            "packed": len(texts),
+            "dropped_duplicates": duplicates,
+            "dropped_over_budget": over_budget,
+        }
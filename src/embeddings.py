@@ -0,0 +1,115 @@
+import constants
+
+
+class EmbeddingBackend:
+    """Embedding backend ka common interface, ingest aur query dono ke liye"""
+
+    model = None
+    dimension = None
+
+    def embed_documents(self, texts):
+        """Passages ke embeddings"""
+
+        raise NotImplementedError
+
+    def embed_queries(self, texts):
+        """Queries ke embeddings, ek hi batched call mein"""
+
+        raise NotImplementedError
+
+    def embed_query(self, text):
+        """Single query ka embedding"""
+
+        return self.embed_queries([text])[0]
+
+
+class PineconeEmbeddingBackend(EmbeddingBackend):
+    """Pinecone hosted inference se embeddings"""
+
+    def __init__(
+        self,
+        model=constants.PINECONE_EMBEDDING_MODEL,
+        batch_size=96,
+        pinecone_client=None,
+    ):
+        from clients import get_pinecone_client
+
+        self.model = model
+        self.dimension = 1024
+        self.batch_size = batch_size
+        self.pc = pinecone_client or get_pinecone_client()
+
+    def _embed(self, texts, input_type):
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            response = self.pc.inference.embed(
+                model=self.model,
+                inputs=texts[start : start + self.batch_size],
+                parameters={"input_type": input_type, "truncate": "END"},
+            )
+            vectors.extend(item.values for item in response)
+        return vectors
+
+    def embed_documents(self, texts):
+        return self._embed(list(texts), "passage")
+
+    def embed_queries(self, texts):
+        return self._embed(list(texts), "query")
+
+
+class LocalEmbeddingBackend(EmbeddingBackend):
+    """sentence-transformers model CPU par, bina network ke embeddings"""
+
+    def __init__(
+        self,
+        model=constants.EMBED_MODEL_ID,
+        batch_size=constants.LOCAL_EMBEDDING_BATCH_SIZE,
+        num_threads=constants.LOCAL_EMBEDDING_THREADS,
+    ):
+        # Optional dependency, sirf local backend ke liye chahiye
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        self.model = model
+        self.batch_size = batch_size
+        self.encoder = SentenceTransformer(model, device="cpu")
+        self.dimension = self.encoder.get_sentence_embedding_dimension()
+
+    def _embed(self, texts):
+        if not texts:
+            return []
+
+        # Normalised vectors, toh cosine aur dot product same ho jate hai
+        return self.encoder.encode(
+            list(texts),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        ).tolist()
+
+    def embed_documents(self, texts):
+        return self._embed(texts)
+
+    def embed_queries(self, texts):
+        return self._embed(texts)
+
+
+EMBEDDING_BACKENDS = {
+    "pinecone": PineconeEmbeddingBackend,
+    "local": LocalEmbeddingBackend,
+}
+
+
+def get_embedding_backend(name=None, **kwargs):
+    """Config ke hisaab se embedding backend banaega"""
+
+    name = name or constants.EMBEDDING_BACKEND
+    if name not in EMBEDDING_BACKENDS:
+        raise ValueError(
+            f"Unknown embedding backend '{name}', expected one of {list(EMBEDDING_BACKENDS)}"
+        )
+    return EMBEDDING_BACKENDS[name](**kwargs)
@@ -1,28 +1,43 @@
 import streamlit as st
 from dotenv import load_dotenv
+import hashlib
 import os
+import time
+import uuid
 import pymupdf
+import constants
 from streamlit_pdf_viewer import pdf_viewer
 
-from agents.compliance_agent_optimised import ComplianceAgent
-from agents.checklist_agent_optimised import ChecklistAgent
 from scoring import calculate_compliance_score
-from agents.risk_analysis_agent_optimised import RiskAnalysisAgent
 from agents.rag_agent import RAGAgent
-from agents.query_agent import QueryAgent
-from agents.report_agent import generate_pdf_report
-from agents.reference_agent import get_references
+from clients import get_agent, get_query_agent
+from job_queue import ACTIVE_STATUSES
+from pipeline import (
+    RFPAnalysisPipeline,
+    get_analysis_queue,
+    stage_submission,
+    submit_compare_profiles,
+    submit_ingest,
+    submit_stage,
+)
+from requirement_index import get_requirement_index
+from result_store import get_result_store
+from company_profile import (
+    CompanyProfile,
+    load_company_profile,
+    load_company_profiles,
+)
 
 load_dotenv()
 
 
-def get_company_profile() -> str:
+def get_company_profile() -> CompanyProfile:
+    # Parsed profile process mein cached hai, file badalne par hi dobara parse hoga
     path = os.path.join(os.path.dirname(__file__), "company_profile.txt")
     if not os.path.exists(path):
         st.error(f"Company profile file not found: {path}")
-        return ""
-    with open(path, "r") as file:
-        return file.read()
+        return CompanyProfile("")
+    return load_company_profile(path)
 
 
 def extract_text_from_pdf(pdf_path: str) -> str:
@@ -38,16 +53,18 @@ def extract_text_from_pdf(pdf_path: str) -> str:
 
 
 def use_rag_agent(question: str, filename=None) -> str:
-    query_agent = QueryAgent()
     context = "\n\n".join(
-        query_agent.retrieve_relevant_data(
-            user_query=question, namespace="test", filename=filename, top_k=3
+        get_query_agent().retrieve_relevant_data(
+            user_query=question,
+            namespace="test",
+            filename=filename,
+            token_budget=constants.CONTEXT_TOKEN_BUDGETS["chat"],
         )
     )
     return (
         context
         if context == "No relevant data found"
-        else RAGAgent().invoke(context, question)
+        else get_agent(RAGAgent).invoke(context, question)
     )
 
 
@@ -56,11 +73,10 @@ def init_session_state():
         "pdf_text": "",
         "process_stage": "upload_file",
         "pdf_path": None,
-        "company_profile": get_company_profile(),
         "compliance_dict": "",
         "checklist_agent_response": "",
         "risk_analysis_response": "",
-        "report_pdf_path": "",
+        "report_pdf": b"",
         "messages": [
             {
                 "role": "assistant",
@@ -68,12 +84,173 @@ def init_session_state():
             }
         ],
         "filename": None,
+        "pdf_hash": None,
+        "jobs": {},
+        # Upload par ResultStore se mile stage results; None = abhi dekha nahi
+        "stored_results": None,
     }
     for key, value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = value
 
 
+STAGE_LABELS = {
+    "ingest": "Document ingestion",
+    "compliance": "Compliance check",
+    "checklist": "Checklist",
+    "risk_analysis": "Risk analysis",
+    "references": "References",
+    "report": "Report",
+    "compare_profiles": "Profile comparison",
+}
+
+
+def submit_analysis():
+    """
+    Pehle ResultStore: is PDF + profile ke jo stages stored hai woh turant
+    session mein, bina kisi job ya vector DB call ke. Sirf missing stages
+    queue hote hai, aur ingest tabhi jab checklist/risk mein se koi missing ho
+    (woh ingest job ke follow-ups hai). Same PDF ke duplicate submits ek hi
+    job par collapse hote hai.
+    """
+
+    profile = get_company_profile()
+    stored = (
+        get_result_store().get_many(
+            RFPAnalysisPipeline.STAGES, st.session_state.pdf_hash, profile
+        )
+        if constants.RESULT_STORE_ENABLED
+        else {}
+    )
+    st.session_state.stored_results = stored
+
+    args = (
+        st.session_state.pdf_path,
+        st.session_state.pdf_hash,
+        profile,
+        st.session_state.filename,
+    )
+    jobs = {}
+    rag_stages = [
+        stage for stage in RFPAnalysisPipeline.RAG_STAGES if stage not in stored
+    ]
+    if rag_stages:
+        jobs["ingest"] = submit_ingest(
+            source_path(st.session_state.filename),
+            st.session_state.pdf_hash,
+            follow_ups=[stage_submission(stage, *args) for stage in rag_stages],
+        )
+    for stage in RFPAnalysisPipeline.STAGES:
+        if stage not in stored and stage not in RFPAnalysisPipeline.RAG_STAGES:
+            jobs[stage] = submit_stage(stage, *args)
+    st.session_state.jobs = jobs
+
+
+def source_path(filename):
+    # Ingest ka source; QueryAgent isi path par filter karta hai
+    return os.path.join(constants.UPLOAD_DIR, filename)
+
+
+def save_upload(uploaded_file):
+    """
+    Upload ko UPLOAD_DIR mein content hash ke naam se likhega, toh repo ki
+    files/ kabhi overwrite nahi hoti aur same PDF ka ek hi source banta hai.
+
+    Returns:
+        (filename, pdf_hash)
+    """
+
+    data = uploaded_file.getvalue()
+    pdf_hash = hashlib.sha256(data).hexdigest()
+    filename = f"{pdf_hash}.pdf"
+    path = source_path(filename)
+    if not os.path.exists(path):
+        os.makedirs(constants.UPLOAD_DIR, exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return filename, pdf_hash
+
+
+def submit_stage_job(stage):
+    st.session_state.jobs[stage] = submit_stage(
+        stage,
+        st.session_state.pdf_path,
+        st.session_state.pdf_hash,
+        get_company_profile(),
+        st.session_state.filename,
+    )
+    return st.session_state.jobs[stage]
+
+
+def rag_stage_job(stage):
+    """
+    Ingest ho chuka ho toh RAG stage ka job id (follow-up job par dedupe),
+    warna ingest ka status dikha kar None.
+    """
+
+    ingest_id = st.session_state.jobs.get("ingest")
+    ingest = get_analysis_queue().status(ingest_id) if ingest_id else None
+    if ingest is not None and ingest["status"] in ACTIVE_STATUSES:
+        st.info(f"{STAGE_LABELS['ingest']}: {ingest['status']}...")
+        return None
+    if ingest is not None and ingest["status"] == "error":
+        st.warning(f"Ingestion failed, using the existing index: {ingest['error']}")
+
+    return submit_stage_job(stage)
+
+
+def ensure_ingested():
+    """
+    Chat ke liye PDF index mein ho. Saare stages store se aaye ho toh upload
+    par ingest skip hua tha; same content ka ingest ek hi job par dedupe hota hai.
+    """
+
+    if "ingest" not in st.session_state.jobs:
+        st.session_state.jobs["ingest"] = submit_ingest(
+            source_path(st.session_state.filename), st.session_state.pdf_hash
+        )
+
+
+def job_result(stage):
+    """
+    Stage ka result: ResultStore mein ho toh wahi, warna job ka. Job abhi
+    queued/running ho toh status dikha kar None lautata hai; page baaki render
+    hota hai aur main() thodi der baad poll karta hai.
+    """
+
+    if st.session_state.stored_results is None and stage in RFPAnalysisPipeline.STAGES:
+        submit_analysis()
+    stored = st.session_state.stored_results or {}
+    if stage in stored:
+        return stored[stage]
+
+    job_id = st.session_state.jobs.get(stage)
+    if job_id is None and stage in RFPAnalysisPipeline.RAG_STAGES:
+        job_id = rag_stage_job(stage)
+        if job_id is None:
+            return None
+    elif job_id is None and stage in RFPAnalysisPipeline.STAGES:
+        # Pichhla job error ke baad hata tha, naya job (store pehle check hota hai)
+        job_id = submit_stage_job(stage)
+
+    job = get_analysis_queue().status(job_id) if job_id else None
+    if job is None:
+        st.session_state.jobs.pop(stage, None)
+        return {"error": f"{STAGE_LABELS[stage]} job not found, please retry."}
+
+    if job["status"] == "done":
+        return job["result"]
+    if job["status"] == "error":
+        # Agli baar naya job banega
+        st.session_state.jobs.pop(stage, None)
+        return {"error": job["error"]}
+
+    st.info(f"{STAGE_LABELS[stage]}: {job['status']}...")
+    return None
+
+
 def display_pdf_sidebar():
     with st.sidebar:
         pdf_viewer(st.session_state.pdf_path, width=800, height=600)
@@ -85,7 +262,7 @@ def display_compliance_results():
         st.subheader("Compliance Score")
 
         # st.write(f"Score Percentage: {score['score_percentage']}%")
-        if score["score_percentage"] < 50:
+        if score["score_percentage"] < constants.ELIGIBILITY_SCORE_THRESHOLD:
             st.write("**Ineligible**")
         else:
             st.write("**Eligible**")
@@ -119,6 +296,8 @@ def main():
     )
 
     stage = st.session_state.process_stage
+    # Koi job abhi chal raha hai toh page render ke baad poll karenge
+    waiting = False
 
     if stage == "upload_file":
         with st.sidebar:
@@ -126,15 +305,18 @@ def main():
             uploaded_file = st.file_uploader("Upload the RFP Document", type=["pdf"])
             if uploaded_file and st.button("Analyse RFP"):
                 with st.spinner("Processing..."):
-                    st.session_state.filename = uploaded_file.name
-                    save_path = os.path.abspath(
-                        os.path.join("temp_files", uploaded_file.name)
-                    )
-                    os.makedirs("temp_files", exist_ok=True)
-                    with open(save_path, "wb") as f:
-                        f.write(uploaded_file.read())
+                    # Same PDF pehle analyse ho chuka ho toh results store se aate hai
+                    filename, pdf_hash = save_upload(uploaded_file)
+                    save_path = os.path.abspath(source_path(filename))
+                    st.session_state.filename = filename
+                    st.session_state.pdf_hash = pdf_hash
                     st.session_state.pdf_path = save_path
                     st.session_state.pdf_text = extract_text_from_pdf(save_path)
+                    # Stored stages turant, baaki agents abhi se job queue mein
+                    st.session_state.jobs = {}
+                    st.session_state.stored_results = None
+                    if st.session_state.pdf_text and get_company_profile():
+                        submit_analysis()
                     st.success("Your RFP Document is uploaded.")
                     st.session_state.process_stage = "compliance_check"
                     st.rerun()
@@ -148,26 +330,51 @@ def main():
         if st.session_state.compliance_dict:
             display_compliance_results()
         else:
-            with st.spinner("Running compliance check..."):
-                if not st.session_state.pdf_text:
-                    st.error("No text extracted from the PDF.")
-                    return
-                if not st.session_state.company_profile:
-                    st.error("No company profile found.")
-                    return
-
-                result = ComplianceAgent().invoke(
-                    rfp_text=st.session_state.pdf_text,
-                    company_profile=st.session_state.company_profile,
-                    filename=st.session_state.filename,
-                )
-                if result.get("error"):
-                    st.error(result["error"])
-                    return
-
+            if not st.session_state.pdf_text:
+                st.error("No text extracted from the PDF.")
+                return
+            if not get_company_profile():
+                st.error("No company profile found.")
+                return
+
+            result = job_result("compliance")
+            if result is None:
+                waiting = True
+            elif result.get("error"):
+                st.error(result["error"])
+                return
+            else:
                 st.session_state.compliance_dict = result
                 display_compliance_results()
 
+        profiles = load_company_profiles()
+        if len(profiles) > 1 and st.button("Compare All Company Profiles"):
+            st.session_state.jobs["compare_profiles"] = submit_compare_profiles(
+                st.session_state.pdf_path, st.session_state.pdf_hash, profiles
+            )
+
+        results = None
+        if "compare_profiles" in st.session_state.jobs:
+            results = job_result("compare_profiles")
+            if results is None:
+                waiting = True
+            elif isinstance(results.get("error"), str):
+                st.error(results["error"])
+                results = None
+
+        for name, result in (results or {}).items():
+            if result.get("error"):
+                st.error(f"{name}: {result['error']}")
+                continue
+            score = result["score"]
+            with st.expander(
+                f"{name}: {score['score_percentage']}% "
+                f"({score['overall_eligibility_assessment']})"
+            ):
+                for criterion in result["report"]["compliance_criteria"]:
+                    icon = "✅" if criterion["matches"] else "❌"
+                    st.write(f"{icon} {criterion['criteria']}: {criterion['current']}")
+
         if st.button("Generate Checklist"):
             st.session_state.process_stage = "generate_checklist"
             st.rerun()
@@ -180,14 +387,20 @@ def main():
                     st.write(item["priority"])
                     st.write(f"Deadline: {item['deadline']}")
         else:
-            with st.spinner("Generating checklist..."):
-                result = ChecklistAgent().invoke(
-                    rfp_text=st.session_state.pdf_text,
-                    filename=st.session_state.filename,
+            # Ingest par bana index turant dikhao, LLM checklist baad mein aayegi
+            for item in get_requirement_index().deadlines(
+                constants.RAG_NAMESPACE, st.session_state.filename
+            ):
+                st.write(
+                    f"📅 {item['normalized'] or item['value']}: {item['description']}"
                 )
-                if result.get("error"):
-                    st.error(result["error"])
-                    return
+            result = job_result("checklist")
+            if result is None:
+                waiting = True
+            elif result.get("error"):
+                st.error(result["error"])
+                return
+            else:
                 st.session_state.checklist_agent_response = result
                 st.rerun()
 
@@ -204,15 +417,13 @@ def main():
         response = st.session_state.risk_analysis_response
 
         if not response:
-            with st.spinner("Analyzing risks..."):
-                result = RiskAnalysisAgent().invoke(
-                    rfp_text=st.session_state.pdf_text,
-                    company_profile=st.session_state.company_profile,
-                    filename=st.session_state.filename,
-                )
-                if result.get("error"):
-                    st.error(result["error"])
-                    return
+            result = job_result("risk_analysis")
+            if result is None:
+                waiting = True
+            elif result.get("error"):
+                st.error(result["error"])
+                return
+            else:
                 st.session_state.risk_analysis_response = result
                 st.rerun()
         else:
@@ -236,6 +447,7 @@ def main():
 
     elif stage == "chat_pdf":
         display_pdf_sidebar()
+        ensure_ingested()
 
         if st.button("Back to Risk Analysis"):
             st.session_state.process_stage = "analyze_risks"
@@ -258,25 +470,41 @@ def main():
                     )
 
     elif stage == "report_page":
-        if not st.session_state.report_pdf_path:
-            with st.spinner("Generating report..."):
-                references = get_references(st.session_state.pdf_text[:1000])
-                data = {
-                    "eligibility": st.session_state.compliance_dict,
-                    "checklist": st.session_state.checklist_agent_response,
-                    "risk_analysis": st.session_state.risk_analysis_response,
-                    "references": references,
-                }
-                report_agent = generate_pdf_report(data=data, filename="Report.pdf")
-                st.session_state.report_pdf_path = os.path.abspath("Report.pdf")
+        if not st.session_state.report_pdf:
+            references = job_result("references")
+            if references is None:
+                waiting = True
+            else:
+                if isinstance(references, dict):
+                    # References na mile toh bhi report banti hai
+                    references = []
+                if "report" not in st.session_state.jobs:
+                    data = {
+                        "eligibility": st.session_state.compliance_dict,
+                        "checklist": st.session_state.checklist_agent_response,
+                        "risk_analysis": st.session_state.risk_analysis_response,
+                        "references": references,
+                    }
+                    st.session_state.jobs["report"] = get_analysis_queue().submit(
+                        "report", {"data": data}
+                    )
 
-        with st.sidebar:
-            pdf_viewer(st.session_state.report_pdf_path, width=800, height=600)
+                result = job_result("report")
+                if result is None:
+                    waiting = True
+                elif isinstance(result, dict):
+                    st.error(result["error"])
+                else:
+                    # Report session mein bytes ki tarah, disk par shared file nahi
+                    st.session_state.report_pdf = result
+
+        if st.session_state.report_pdf:
+            with st.sidebar:
+                pdf_viewer(st.session_state.report_pdf, width=800, height=600)
 
-        with open(st.session_state.report_pdf_path, "rb") as f:
             st.download_button(
                 label="Download Report",
-                data=f,
+                data=st.session_state.report_pdf,
                 file_name="Report.pdf",
                 mime="application/pdf",
             )
@@ -288,6 +516,10 @@ def main():
             st.session_state.process_stage = "analyze_risks"
             st.rerun()
 
+    if waiting:
+        time.sleep(constants.JOB_POLL_INTERVAL)
+        st.rerun()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,249 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import constants
+from clients import connect_sqlite
+from result_store import json_default
+
+logger = logging.getLogger(__name__)
+
+# Queued/running job ka koi bhi duplicate submit isi job par collapse hota hai
+ACTIVE_STATUSES = ("queued", "running")
+
+# Is process ki pehchaan: container restart par pid wahi (e.g. 1) reh sakta hai,
+# isliye pid ke saath ek random boot id bhi
+BOOT_ID = uuid.uuid4().hex
+
+
+def _owner_alive(owner):
+    """`owner` ("<pid>:<boot id>") wala worker process abhi zinda hai kya"""
+
+    pid, _, boot_id = (owner or "").partition(":")
+    if not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        return boot_id == BOOT_ID
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Process hai, bas doosre user ka
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def make_dedupe_key(kind, payload):
+    body = json.dumps([kind, payload], sort_keys=True, default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class JobQueue:
+    """
+    Local job queue: SQLite job table aur ek fixed worker pool, koi external
+    broker nahi. UI jobs submit karke status poll karti hai, toh Streamlit
+    rerun kabhi agent call par block nahi hota.
+
+    Same dedupe key wala job queued/running ho (ya JOB_DONE_TTL ke andar done
+    hua ho) toh naya job nahi banta, wahi job id milti hai. Throughput worker
+    count se bounded hai, browser tabs ki ginti se nahi.
+    """
+
+    def __init__(self, path=None, workers=None, done_ttl=None):
+        self.done_ttl = done_ttl if done_ttl is not None else constants.JOB_DONE_TTL
+        self.conn = connect_sqlite(path or constants.JOB_QUEUE_DB)
+        self.lock = threading.Lock()
+        self.handlers = {}
+        self.owner = f"{os.getpid()}:{BOOT_ID}"
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers or constants.JOB_WORKERS,
+            thread_name_prefix="rfp-job",
+        )
+        with self.lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT, dedupe_key TEXT, status TEXT, "
+                "payload TEXT, result TEXT, result_blob BLOB, error TEXT, "
+                "created_at REAL, started_at REAL, finished_at REAL)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, status)"
+            )
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                self.conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+
+    def register(self, kind, handler):
+        """`kind` ke jobs `handler(**payload)` se chalenge"""
+
+        self.handlers[kind] = handler
+
+    def submit(self, kind, payload, dedupe_key=None):
+        """
+        Job queue karega aur uski id lautaega; duplicate ho toh existing id.
+
+        Args:
+            kind: registered handler ka naam
+            payload: JSON-serialisable kwargs
+            dedupe_key: default kind + payload ka hash
+        """
+
+        if kind not in self.handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+
+        dedupe_key = dedupe_key or make_dedupe_key(kind, payload)
+        now = time.time()
+
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Atka hua running job naye submits ko hamesha ke liye na nigle
+                self.conn.execute(
+                    "UPDATE jobs SET status='error', error=?, finished_at=? "
+                    "WHERE dedupe_key=? AND status='running' AND started_at < ?",
+                    (
+                        "Job timed out or its worker died.",
+                        now,
+                        dedupe_key,
+                        now - constants.JOB_STALE_AFTER,
+                    ),
+                )
+                row = self.conn.execute(
+                    "SELECT id FROM jobs WHERE dedupe_key=? AND "
+                    "(status IN (?, ?) OR (status='done' AND finished_at > ?)) "
+                    "ORDER BY created_at DESC LIMIT 1",
+                    (dedupe_key, *ACTIVE_STATUSES, now - self.done_ttl),
+                ).fetchone()
+                if row is not None:
+                    self.conn.commit()
+                    return row[0]
+
+                job_id = uuid.uuid4().hex
+                self.conn.execute(
+                    "INSERT INTO jobs (id, kind, dedupe_key, status, payload, "
+                    "created_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+                    (job_id, kind, dedupe_key, json.dumps(payload), now),
+                )
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+        self.executor.submit(self._run, job_id)
+        return job_id
+
+    def _run(self, job_id):
+        with self.lock, self.conn:
+            claimed = self.conn.execute(
+                "UPDATE jobs SET status='running', started_at=?, owner=? "
+                "WHERE id=? AND status='queued'",
+                (time.time(), self.owner, job_id),
+            ).rowcount
+            row = self.conn.execute(
+                "SELECT kind, payload FROM jobs WHERE id=?", (job_id,)
+            ).fetchone()
+        if not claimed:
+            # Kisi aur worker/process ne pehle hi utha liya
+            return
+
+        kind, payload = row
+        try:
+            result = self.handlers[kind](**json.loads(payload))
+            if isinstance(result, bytes):
+                self._finish(job_id, "done", blob=result)
+            else:
+                self._finish(
+                    job_id, "done", result=json.dumps(result, default=json_default)
+                )
+        except Exception as e:
+            logger.exception(f"Job {job_id} ({kind}) failed.")
+            try:
+                self._finish(job_id, "error", error=str(e))
+            except Exception:
+                # DB hi nahi likh paa rahe; submit() stale job ko baad mein pakad lega
+                logger.exception(f"Could not record failure of job {job_id}.")
+
+    def _finish(self, job_id, status, result=None, blob=None, error=None):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status=?, result=?, result_blob=?, error=?, "
+                "finished_at=? WHERE id=?",
+                (status, result, blob, error, time.time(), job_id),
+            )
+
+    def status(self, job_id):
+        """
+        Job ka status dict: id, kind, status, error aur (done hone par) result.
+        Unknown id par None.
+        """
+
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT kind, status, result, result_blob, error, created_at, "
+                "started_at, finished_at FROM jobs WHERE id=?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        kind, status, result, blob, error, created_at, started_at, finished_at = row
+        if status == "running" and started_at < time.time() - constants.JOB_STALE_AFTER:
+            # Poll karne wala UI atke hue job par hamesha intezaar na kare
+            status, error = "error", "Job timed out or its worker died."
+            self._finish(job_id, status, error=error)
+        job = {
+            "id": job_id,
+            "kind": kind,
+            "status": status,
+            "error": error,
+            "result": None,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+        }
+        if status == "done":
+            job["result"] = blob if blob is not None else json.loads(result)
+        return job
+
+    def resume(self):
+        """
+        Pichhle process ke adhoore jobs dobara chalaega: jin running jobs ka
+        owner process ab zinda nahi (ya JOB_STALE_AFTER se purane) woh wapas
+        queued, aur saare queued jobs workers ko.
+        """
+
+        cutoff = time.time() - constants.JOB_STALE_AFTER
+        with self.lock, self.conn:
+            running = self.conn.execute(
+                "SELECT id, owner, started_at FROM jobs WHERE status='running'"
+            ).fetchall()
+            orphaned = [
+                (job_id,)
+                for job_id, owner, started_at in running
+                if not _owner_alive(owner) or (started_at or 0) < cutoff
+            ]
+            self.conn.executemany(
+                "UPDATE jobs SET status='queued', owner=NULL "
+                "WHERE id=? AND status='running'",
+                orphaned,
+            )
+            rows = self.conn.execute(
+                "SELECT id, kind FROM jobs WHERE status='queued'"
+            ).fetchall()
+
+        if orphaned:
+            logger.info(f"Requeued {len(orphaned)} jobs whose worker is gone.")
+        resumed = [job_id for job_id, kind in rows if kind in self.handlers]
+        for job_id in resumed:
+            self.executor.submit(self._run, job_id)
+        if resumed:
+            logger.info(f"Resumed {len(resumed)} queued jobs.")
+        return len(resumed)
@@ -0,0 +1,280 @@
+import logging
+import os
+from functools import lru_cache, partial
+
+import constants
+from agents.checklist_agent_optimised import ChecklistAgent
+from agents.compliance_agent_optimised import ComplianceAgent
+from agents.prompts import CHECKLIST_RAG_PROMPT, RISK_ANALYSIS_RAG_PROMPT
+from agents.reference_agent import get_references
+from agents.risk_analysis_agent_optimised import RiskAnalysisAgent
+from clients import get_agent, get_query_agent, get_shared
+from company_profile import (
+    CompanyProfile,
+    load_company_profile,
+    load_company_profiles,
+)
+from job_queue import JobQueue, make_dedupe_key
+from PDFIngestor.ingestion_cache import hash_file
+from result_store import ResultStore, agent_version, get_result_store
+
+logger = logging.getLogger(__name__)
+
+
+class RFPAnalysisPipeline:
+    """
+    Ek RFP ke analysis stages: compliance, checklist, risk analysis aur
+    references. Har stage job queue ka alag job hai (`stage_job`), toh chaaron
+    concurrently chalte hai aur total time sabse slow call jitna hota hai.
+    Results ResultStore se aate/jaate hai.
+    """
+
+    STAGES = ("compliance", "checklist", "risk_analysis", "references")
+    # In stages ko PDF ke vectors chahiye, job queue inhe ingest ke baad chalati hai
+    RAG_STAGES = ("checklist", "risk_analysis")
+    RAG_PROMPTS = {
+        "checklist": CHECKLIST_RAG_PROMPT,
+        "risk_analysis": RISK_ANALYSIS_RAG_PROMPT,
+    }
+
+    def __init__(self, rfp_text, company_profile, filename=None, pdf_hash=None):
+        self.rfp_text = rfp_text
+        self.company_profile = company_profile
+        self.filename = filename
+        # PDF ka content hash ho toh results ResultStore se aate/jaate hai
+        self.pdf_hash = pdf_hash
+
+    def stored_results(self):
+        """Is PDF + profile ke jo stage results pehle se stored hai"""
+
+        if not (self.pdf_hash and constants.RESULT_STORE_ENABLED):
+            return {}
+        return get_result_store().get_many(
+            self.STAGES, self.pdf_hash, self.company_profile
+        )
+
+    def _runs(self):
+        return {
+            "compliance": self._run_compliance,
+            "checklist": self._run_checklist,
+            "risk_analysis": self._run_risk_analysis,
+            "references": self._run_references,
+        }
+
+    def run_stage(self, stage):
+        """
+        Sirf ek stage synchronously chalaega (job queue workers ke liye),
+        stored result ho toh wahi.
+        """
+
+        stored = self.stored_results()
+        if stage in stored:
+            return stored[stage]
+
+        result = self._runs()[stage]()
+        if self.pdf_hash and constants.RESULT_STORE_ENABLED:
+            get_result_store().put(stage, self.pdf_hash, self.company_profile, result)
+        return result
+
+    def profile_text(self):
+        """Prompts ke liye profile text; CompanyProfile ho toh compact form"""
+
+        if isinstance(self.company_profile, CompanyProfile):
+            return self.company_profile.prompt_text()
+        return self.company_profile
+
+    def _run_compliance(self):
+        return get_agent(ComplianceAgent).invoke(
+            rfp_text=self.rfp_text,
+            company_profile=self.company_profile,
+            filename=self.filename,
+        )
+
+    def _run_checklist(self):
+        return get_agent(ChecklistAgent).invoke(
+            rfp_text=self.rfp_text, filename=self.filename
+        )
+
+    def _run_risk_analysis(self):
+        return get_agent(RiskAnalysisAgent).invoke(
+            rfp_text=self.rfp_text,
+            company_profile=self.profile_text(),
+            filename=self.filename,
+        )
+
+    def _run_references(self):
+        return get_references(self.rfp_text[:1000])
+
+
+@lru_cache(maxsize=8)
+def _pdf_text(pdf_path, pdf_hash):
+    # Ek PDF ke saare stage jobs text ek hi baar nikalte hai
+    import pymupdf
+
+    with pymupdf.open(pdf_path) as doc:
+        return "".join(page.get_text() for page in doc)
+
+
+def stage_job(stage, pdf_path, filename=None, profile_path=None):
+    """Job handler: ek analysis stage, result store ke through"""
+
+    pdf_hash = hash_file(pdf_path)
+    pipeline = RFPAnalysisPipeline(
+        rfp_text=_pdf_text(pdf_path, pdf_hash),
+        company_profile=load_company_profile(profile_path),
+        filename=filename,
+        pdf_hash=pdf_hash,
+    )
+    result = pipeline.run_stage(stage)
+    # Error job ke roop mein record ho, taaki agla submit dobara try kare
+    if isinstance(result, dict) and result.get("error"):
+        raise RuntimeError(result["error"])
+    return result
+
+
+def prefetch_contexts(stages, filename, on_ready=None):
+    """
+    RAG stages ke contexts ek retrieve_many round mein (ek batched embed call)
+    query cache mein daal dega; agents ki apni retrieval phir cache se milegi.
+    `on_ready(stage)` har stage ka context aate hi, baaki ka intezaar kiye bina.
+    """
+
+    def resolve(i, _context):
+        if on_ready is not None:
+            on_ready(stages[i])
+
+    get_query_agent().retrieve_many(
+        [RFPAnalysisPipeline.RAG_PROMPTS[stage] for stage in stages],
+        constants.RAG_NAMESPACE,
+        filename,
+        token_budget=[constants.CONTEXT_TOKEN_BUDGETS[stage] for stage in stages],
+        on_result=resolve,
+    )
+
+
+def ingest_job(pdf_path, pdf_hash=None, follow_ups=()):
+    """
+    Job handler: PDF ko vector index mein ingest karega, phir `follow_ups`
+    (RAG stages ke job submissions) queue karega. Har follow-up apna context
+    prefetch hote hi queue hota hai. Ingest ya prefetch fail ho tab bhi
+    follow-ups jaate hai, woh index mein jo hai usi par chalenge.
+    """
+
+    from PDFIngestor.PDFIngestor import DataIngestor
+
+    queue = get_analysis_queue()
+    pending = {follow_up["kind"]: follow_up for follow_up in follow_ups}
+
+    def submit(stage):
+        follow_up = pending.pop(stage, None)
+        if follow_up is not None:
+            queue.submit(**follow_up)
+
+    try:
+        stats = get_shared("data_ingestor", DataIngestor).ingest_pdf(
+            pdf_path, constants.RFP_INDEX_NAME, constants.RAG_NAMESPACE
+        )
+        rag_stages = [
+            stage for stage in RFPAnalysisPipeline.RAG_STAGES if stage in pending
+        ]
+        if rag_stages:
+            try:
+                prefetch_contexts(rag_stages, os.path.basename(pdf_path), submit)
+            except Exception as e:
+                logger.warning(f"Context prefetch failed, agents will retrieve: {e}")
+    finally:
+        for stage in list(pending):
+            submit(stage)
+    return {"file": os.path.basename(pdf_path), **(stats or {})}
+
+
+def compare_profiles_job(pdf_path, profiles_dir=None):
+    """Job handler: ek RFP ka compliance saare company profiles ke against"""
+
+    profiles = load_company_profiles(profiles_dir)
+    rfp_text = _pdf_text(pdf_path, hash_file(pdf_path))
+    return get_agent(ComplianceAgent).evaluate_many(rfp_text, profiles)
+
+
+def report_job(data):
+    """Job handler: report PDF bytes"""
+
+    from agents.report_agent import build_pdf_report
+
+    return build_pdf_report(data)
+
+
+def get_analysis_queue():
+    """Process-wide job queue, saare stage/ingest/report handlers registered"""
+
+    def factory():
+        queue = JobQueue()
+        queue.register("ingest", ingest_job)
+        queue.register("report", report_job)
+        queue.register("compare_profiles", compare_profiles_job)
+        for stage in RFPAnalysisPipeline.STAGES:
+            queue.register(stage, partial(stage_job, stage))
+        queue.resume()
+        return queue
+
+    return get_shared("analysis_queue", factory)
+
+
+def stage_submission(stage, pdf_path, pdf_hash, company_profile, filename=None):
+    """
+    JobQueue.submit ke kwargs. Dedupe key wahi hai jo ResultStore ki key, toh
+    same PDF + profile + agent version ke saare submits ek hi job banate hai.
+    """
+
+    dedupe_key, _ = ResultStore.make_key(stage, pdf_hash, company_profile)
+    return {
+        "kind": stage,
+        "payload": {
+            "pdf_path": pdf_path,
+            "filename": filename,
+            "profile_path": getattr(company_profile, "path", None),
+        },
+        "dedupe_key": dedupe_key,
+    }
+
+
+def submit_stage(stage, pdf_path, pdf_hash, company_profile, filename=None):
+    """Stage job submit karega, job id lautaega"""
+
+    return get_analysis_queue().submit(
+        **stage_submission(stage, pdf_path, pdf_hash, company_profile, filename)
+    )
+
+
+def submit_ingest(source_path, pdf_hash, follow_ups=()):
+    """
+    Ingest job submit karega. `source_path` wahi hona chahiye jisse QueryAgent
+    filter karta hai (QueryAgent.SOURCE_DIRS mein se ek directory + filename);
+    same content ka dobara submit ek hi job.
+    """
+
+    return get_analysis_queue().submit(
+        "ingest",
+        {
+            "pdf_path": source_path,
+            "pdf_hash": pdf_hash,
+            "follow_ups": list(follow_ups),
+        },
+        dedupe_key=make_dedupe_key("ingest", [source_path, pdf_hash]),
+    )
+
+
+def submit_compare_profiles(pdf_path, pdf_hash, profiles):
+    """
+    Profile comparison job submit karega. Dedupe PDF, compliance agent version
+    aur har profile ke version par, toh koi profile badle toh naya job banta hai.
+    """
+
+    versions = sorted((name, profile.version) for name, profile in profiles.items())
+    return get_analysis_queue().submit(
+        "compare_profiles",
+        {"pdf_path": pdf_path},
+        dedupe_key=make_dedupe_key(
+            "compare_profiles", [pdf_hash, agent_version("compliance"), versions]
+        ),
+    )
@@ -0,0 +1,242 @@
+import re
+from datetime import datetime
+
+import pandas as pd
+
+# Deterministic pre-extraction: jo cheezein regex se pakdi ja sakti hai woh LLM
+# se nahi maangte. Saare patterns ek hi baar compile hote hai aur pandas ke
+# str.extractall se saare chunks par ek saath chalte hai.
+
+_MONTHS = (
+    r"(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|"
+    r"Aug(?:ust)?|Sep(?:t(?:ember)?)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\.?"
+)
+_NUMBER_WORDS = {
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+    "eleven": 11,
+    "twelve": 12,
+    "fifteen": 15,
+    "thirty": 30,
+    "sixty": 60,
+    "ninety": 90,
+}
+_NUMBER = r"(?:\d+|" + "|".join(_NUMBER_WORDS) + r")"
+
+PATTERNS = {
+    "date": re.compile(
+        rf"(?P<value>{_MONTHS}\s+\d{{1,2}}(?:st|nd|rd|th)?,?\s+\d{{4}}"
+        rf"|\d{{1,2}}(?:st|nd|rd|th)?\s+{_MONTHS},?\s+\d{{4}}"
+        r"|\d{1,2}/\d{1,2}/\d{4}"
+        r"|\d{4}-\d{2}-\d{2})",
+        re.IGNORECASE,
+    ),
+    "amount": re.compile(
+        r"(?P<value>(?:\$|USD\s?)\d{1,3}(?:,\d{3})*(?:\.\d+)?"
+        r"(?:\s?(?:million|billion|thousand|[MK])\b)?)",
+        re.IGNORECASE,
+    ),
+    "duration": re.compile(
+        rf"(?P<value>\b{_NUMBER}\s*(?:\(\d+\)\s*)?"
+        r"(?:calendar\s+|business\s+|working\s+)?(?:day|week|month|year)s?\b)",
+        re.IGNORECASE,
+    ),
+    "page_limit": re.compile(
+        r"(?P<value>(?:not\s+(?:to\s+)?exceed|maximum\s+of|limited\s+to|"
+        r"no\s+more\s+than|up\s+to)\s+\w+\s*(?:\(\d+\)\s*)?pages?\b"
+        r"|\b\d+[-\s]page\s+(?:limit|maximum)\b)",
+        re.IGNORECASE,
+    ),
+    "font": re.compile(
+        r"(?P<value>\b\d{1,2}(?:\.\d)?[-\s]?(?:pt|point)\b(?:\s+font)?"
+        r"|\b(?:Times New Roman|Arial|Calibri|Helvetica|Garamond|Courier New|"
+        r"Verdana|Cambria)\b)",
+        re.IGNORECASE,
+    ),
+    "form": re.compile(
+        r"(?P<value>\b(?:[A-Z]{2,}[\s-])?(?:Form|Exhibit|Attachment|Appendix|Schedule)"
+        r"\s+(?:[A-Z]{1,3}\b|\d[\w.\-]*)"
+        r"|\bW-?9\b|\bSF[-\s]?\d{2,4}\b)"
+    ),
+}
+
+_DATE_FORMATS = (
+    "%B %d %Y",
+    "%b %d %Y",
+    "%d %B %Y",
+    "%d %b %Y",
+    "%m/%d/%Y",
+    "%Y-%m-%d",
+)
+_MULTIPLIERS = {"thousand": 1e3, "k": 1e3, "million": 1e6, "m": 1e6, "billion": 1e9}
+
+
+def normalize_date(value):
+    """Date ko YYYY-MM-DD mein, parse na ho toh empty string"""
+
+    cleaned = re.sub(r"(?<=\d)(st|nd|rd|th)\b", "", value, flags=re.IGNORECASE)
+    cleaned = " ".join(cleaned.replace(",", " ").replace(".", " ").split())
+    if cleaned[:4].lower() == "sept":
+        cleaned = "Sep" + cleaned[4:]
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return ""
+
+
+def normalize_amount(value):
+    """'$1.5 million' -> '1500000'"""
+
+    match = re.search(r"(\d[\d,]*(?:\.\d+)?)\s?([A-Za-z]*)", value)
+    if not match:
+        return ""
+    amount = float(match.group(1).replace(",", ""))
+    amount *= _MULTIPLIERS.get(match.group(2).lower(), 1)
+    return f"{amount:.2f}".rstrip("0").rstrip(".")
+
+
+def _first_number(value):
+    digits = re.search(r"\d+", value)
+    if digits:
+        return int(digits.group())
+    word = re.search(r"[A-Za-z]+", value)
+    return _NUMBER_WORDS.get(word.group().lower()) if word else None
+
+
+def normalize_duration(value):
+    """'thirty (30) calendar days' -> '30 calendar days'"""
+
+    number = _first_number(value)
+    unit = re.search(
+        r"((?:calendar\s+|business\s+|working\s+)?(?:day|week|month|year))",
+        value,
+        re.IGNORECASE,
+    )
+    if number is None or not unit:
+        return ""
+    unit = " ".join(unit.group(1).lower().split())
+    return f"{number} {unit}{'s' if number != 1 else ''}"
+
+
+def normalize_page_limit(value):
+    # "not to exceed twenty (20) pages": bracket wala number sabse bharosemand hai
+    bracketed = re.search(r"\((\d+)\)", value)
+    if bracketed:
+        return bracketed.group(1)
+    number = re.search(
+        r"(\d+|" + "|".join(_NUMBER_WORDS) + r")\s*[-\s]?pages?",
+        value,
+        re.IGNORECASE,
+    )
+    if number is None:
+        number = re.search(r"(\d+)", value)
+    if number is None:
+        return ""
+    token = number.group(1).lower()
+    return str(_NUMBER_WORDS.get(token, token))
+
+
+def normalize_font(value):
+    size = re.match(r"(\d{1,2}(?:\.\d)?)", value)
+    if size:
+        return f"{size.group(1)}pt"
+    return value.title()
+
+
+def normalize_form(value):
+    return " ".join(value.split())
+
+
+NORMALIZERS = {
+    "date": normalize_date,
+    "amount": normalize_amount,
+    "duration": normalize_duration,
+    "page_limit": normalize_page_limit,
+    "font": normalize_font,
+    "form": normalize_form,
+}
+
+
+def extract_entities(texts, kinds=None):
+    """
+    Saare texts par regex extraction ek saath chalaega.
+
+    Args:
+        texts: chunk texts ki list (ya pandas Series)
+        kinds: sirf yeh kinds chahiye (default sab)
+
+    Returns:
+        pd.DataFrame: columns `chunk` (texts mein position), `kind`, `value`,
+        `normalized`; har (chunk, kind, normalized) sirf ek baar
+    """
+
+    series = pd.Series(list(texts), dtype="object").fillna("")
+    frames = []
+
+    for kind in kinds or PATTERNS:
+        found = series.str.extractall(PATTERNS[kind])
+        if found.empty:
+            continue
+        found = found.reset_index().rename(columns={"level_0": "chunk"})
+        found["value"] = found["value"].str.strip()
+        found["kind"] = kind
+        found["normalized"] = found["value"].map(NORMALIZERS[kind])
+        frames.append(found[["chunk", "kind", "value", "normalized"]])
+
+    if not frames:
+        return pd.DataFrame(columns=["chunk", "kind", "value", "normalized"])
+
+    entities = pd.concat(frames, ignore_index=True)
+    dedupe_on = entities["normalized"].where(
+        entities["normalized"] != "", entities["value"].str.lower()
+    )
+    return entities.loc[
+        ~entities.assign(key=dedupe_on).duplicated(["chunk", "kind", "key"])
+    ].reset_index(drop=True)
+
+
+def extract_items_by_chunk(texts, kinds=None):
+    """extract_entities ka result per-chunk requirement-index items ke form mein"""
+
+    items = [[] for _ in range(len(texts))]
+    for row in extract_entities(texts, kinds).itertuples(index=False):
+        items[row.chunk].append(
+            {
+                "kind": row.kind,
+                "value": row.value,
+                "normalized": row.normalized,
+                "description": "",
+            }
+        )
+    return items
+
+
+def format_hints(texts, kinds=None):
+    """Prompt mein daalne layak structured hints, kuch na mile toh empty string"""
+
+    entities = extract_entities(texts, kinds)
+    if entities.empty:
+        return ""
+
+    lines = []
+    for kind, group in entities.groupby("kind", sort=False):
+        values = (
+            group["normalized"]
+            .where(group["normalized"] != "", group["value"])
+            .drop_duplicates()
+        )
+        lines.append(f"- {kind}: " + "; ".join(values))
+
+    return "Deterministically extracted values (exact, prefer these):\n" + "\n".join(
+        lines
+    )
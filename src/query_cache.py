@@ -0,0 +1,139 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import constants
+from clients import connect_sqlite, get_shared
+
+
+class IndexVersions:
+    """
+    Har (namespace, filename) ka version counter. DataIngestor upsert/delete ke
+    baad bump karta hai, aur QueryCache key mein version hone se purane results
+    apne aap invalid ho jate hai, chahe ingest doosre process mein hua ho.
+    """
+
+    ALL_FILES = "*"
+
+    def __init__(self, path=None):
+        self.conn = connect_sqlite(path or constants.INDEX_VERSIONS_DB)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS index_versions ("
+                "namespace TEXT, filename TEXT, version INTEGER, "
+                "PRIMARY KEY (namespace, filename))"
+            )
+
+    def get(self, namespace, filename=None):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT version FROM index_versions WHERE namespace=? AND filename=?",
+                (namespace or "", filename or self.ALL_FILES),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, namespace, filenames):
+        """Files ke versions aur namespace-wide version badhaega"""
+
+        keys = [(namespace or "", name) for name in set(filenames)]
+        keys.append((namespace or "", self.ALL_FILES))
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO index_versions (namespace, filename, version) "
+                "VALUES (?, ?, 1) ON CONFLICT(namespace, filename) "
+                "DO UPDATE SET version = version + 1",
+                keys,
+            )
+
+
+class QueryCache:
+    """
+    QueryAgent ke retrieved context ka cache: in-process LRU tier (TTL ke saath)
+    aur optional SQLite disk tier jo sessions/processes ke beech share hota hai.
+    """
+
+    def __init__(self, max_entries=None, ttl=None, db_path=None):
+        self.max_entries = max_entries or constants.QUERY_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else constants.QUERY_CACHE_TTL
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.conn = connect_sqlite(db_path) if db_path else None
+        if self.conn is not None:
+            with self.lock, self.conn:
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS query_cache ("
+                    "key TEXT PRIMARY KEY, value TEXT, expires_at REAL)"
+                )
+
+    @staticmethod
+    def make_key(query, namespace, filename, top_k, version, model):
+        payload = json.dumps(
+            [query, namespace, filename, top_k, version, model], sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        now = time.time()
+
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self.memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.memory[key]
+
+            if self.conn is not None:
+                row = self.conn.execute(
+                    "SELECT value, expires_at FROM query_cache WHERE key=?", (key,)
+                ).fetchone()
+                if row and row[1] > now:
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        expires_at = time.time() + self.ttl
+
+        with self.lock:
+            self._remember(key, value, expires_at)
+            if self.conn is not None:
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO query_cache VALUES (?, ?, ?)",
+                        (key, value, expires_at),
+                    )
+                    self.conn.execute(
+                        "DELETE FROM query_cache WHERE expires_at <= ?", (time.time(),)
+                    )
+
+    def _remember(self, key, value, expires_at):
+        self.memory[key] = (expires_at, value)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+
+def get_index_versions():
+    """Process-wide IndexVersions instance"""
+
+    return get_shared("index_versions", IndexVersions)
+
+
+def get_query_cache():
+    """Process-wide QueryCache instance, saare QueryAgent isse share karte hai"""
+
+    return get_shared(
+        "query_cache", lambda: QueryCache(db_path=constants.QUERY_CACHE_DB or None)
+    )
@@ -0,0 +1,178 @@
+import threading
+
+import constants
+from clients import connect_sqlite, get_shared
+
+REQUIREMENT_KINDS = ("date", "amount", "form", "certification", "section")
+
+
+class RequirementIndex:
+    """
+    Per-file requirement index, ingest ke time ek baar banta hai.
+
+    Har row ek chunk ID se tagged hai, toh revised PDF par sirf naye chunks
+    extract hote hai aur stale chunks ki rows hat jaati hai. Agents LLM se
+    dobara dhoondhne ki jagah yahin se padh lete hai.
+    """
+
+    def __init__(self, path=None):
+        self.conn = connect_sqlite(path or constants.REQUIREMENT_INDEX_DB)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS indexed_chunks ("
+                "namespace TEXT, filename TEXT, chunk_id TEXT, "
+                "PRIMARY KEY (namespace, filename, chunk_id))"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS requirements ("
+                "namespace TEXT, filename TEXT, chunk_id TEXT, kind TEXT, "
+                "value TEXT, normalized TEXT, description TEXT)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS requirements_file "
+                "ON requirements (namespace, filename, kind)"
+            )
+
+    def indexed_chunk_ids(self, namespace, filename):
+        """Is file ke jin chunks ka extraction ho chuka hai (khali result wale bhi)"""
+
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT chunk_id FROM indexed_chunks "
+                "WHERE namespace = ? AND filename = ?",
+                (namespace, filename),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def add_chunks(self, namespace, filename, items_by_chunk):
+        """
+        Args:
+            items_by_chunk: chunk_id -> list of `{"kind", "value", "normalized",
+                "description"}`; khali list bhi chunk ko indexed mark karti hai
+        """
+
+        with self.lock, self.conn:
+            for cid, items in items_by_chunk.items():
+                self.conn.execute(
+                    "DELETE FROM requirements "
+                    "WHERE namespace = ? AND filename = ? AND chunk_id = ?",
+                    (namespace, filename, cid),
+                )
+                self.conn.executemany(
+                    "INSERT INTO requirements VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            namespace,
+                            filename,
+                            cid,
+                            item["kind"],
+                            item["value"],
+                            item.get("normalized") or "",
+                            item.get("description") or "",
+                        )
+                        for item in items
+                    ],
+                )
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO indexed_chunks VALUES (?, ?, ?)",
+                    (namespace, filename, cid),
+                )
+
+    def remove_chunks(self, namespace, filename, chunk_ids):
+        """Document se hat chuke chunks ki rows delete karega"""
+
+        params = [(namespace, filename, cid) for cid in chunk_ids]
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "DELETE FROM requirements "
+                "WHERE namespace = ? AND filename = ? AND chunk_id = ?",
+                params,
+            )
+            self.conn.executemany(
+                "DELETE FROM indexed_chunks "
+                "WHERE namespace = ? AND filename = ? AND chunk_id = ?",
+                params,
+            )
+
+    def has_file(self, namespace, filename):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM indexed_chunks "
+                "WHERE namespace = ? AND filename = ? LIMIT 1",
+                (namespace, filename),
+            ).fetchone()
+        return row is not None
+
+    def get(self, namespace, filename, kinds=None):
+        """File ki requirements, `kinds` se filter karke"""
+
+        query = (
+            "SELECT chunk_id, kind, value, normalized, description FROM requirements "
+            "WHERE namespace = ? AND filename = ?"
+        )
+        params = [namespace, filename]
+        if kinds:
+            query += " AND kind IN (%s)" % ", ".join("?" for _ in kinds)
+            params.extend(kinds)
+
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY rowid", params).fetchall()
+
+        return [
+            {
+                "chunk_id": cid,
+                "kind": kind,
+                "value": value,
+                "normalized": normalized,
+                "description": description,
+            }
+            for cid, kind, value, normalized, description in rows
+        ]
+
+    def deadlines(self, namespace, filename):
+        """Dates, normalised (YYYY-MM-DD) date ke order mein"""
+
+        return sorted(
+            self.get(namespace, filename, ["date"]),
+            key=lambda item: item["normalized"] or "9999",
+        )
+
+    def format_hints(self, namespace, filename, kinds=None):
+        """Prompt mein daalne layak compact text, index khali ho toh empty string"""
+
+        lines = []
+        seen = set()
+        for item in self.get(namespace, filename, kinds):
+            key = (item["kind"], item["normalized"] or item["value"])
+            if key in seen:
+                continue
+            seen.add(key)
+
+            value = item["value"]
+            if item["normalized"] and item["normalized"] != value:
+                value += f" ({item['normalized']})"
+            line = f"- [{item['kind']}] {value}"
+            if item["description"]:
+                line += f": {item['description']}"
+            lines.append(line)
+
+        return "\n".join(lines)
+
+
+def get_requirement_index():
+    """Process-wide RequirementIndex instance"""
+
+    return get_shared("requirement_index", RequirementIndex)
+
+
+def requirement_hints(filename, kinds=None, namespace=constants.RAG_NAMESPACE):
+    """Agent prompt ke liye hint block; index mein kuch na ho toh empty string"""
+
+    if not filename or not constants.REQUIREMENT_INDEX_ENABLED:
+        return ""
+
+    hints = get_requirement_index().format_hints(namespace, filename, kinds)
+    if not hints:
+        return ""
+    return "Requirements pre-extracted from the full RFP at ingest time:\n" + hints
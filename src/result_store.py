@@ -0,0 +1,145 @@
+import hashlib
+import importlib.util
+import json
+import logging
+import threading
+import time
+from enum import Enum
+from functools import lru_cache
+
+import constants
+from clients import connect_sqlite, get_shared
+
+logger = logging.getLogger(__name__)
+
+# Stage ka result in modules ke code/prompts par depend karta hai; inme se koi
+# bhi badla toh us stage ke stored results apne aap purane ho jaate hai
+STAGE_SOURCES = {
+    "compliance": (
+        "agents.compliance_agent_optimised",
+        "agents.compliance_reduce",
+        "agents.prompts",
+    ),
+    "checklist": ("agents.checklist_agent_optimised", "agents.prompts"),
+    "risk_analysis": ("agents.risk_analysis_agent_optimised", "agents.prompts"),
+    "references": ("agents.reference_agent",),
+}
+
+# Sirf in stages ka result company profile par depend karta hai
+PROFILE_STAGES = ("compliance", "risk_analysis")
+
+
+@lru_cache(maxsize=None)
+def agent_version(stage):
+    """Stage ke agent modules aur prompts ke source ka hash"""
+
+    digest = hashlib.sha256(str(constants.RESULT_STORE_VERSION).encode("utf-8"))
+    for module in STAGE_SOURCES[stage]:
+        spec = importlib.util.find_spec(module)
+        with open(spec.origin, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def profile_version(profile):
+    """CompanyProfile ka version, ya plain profile text ka hash"""
+
+    version = getattr(profile, "version", None)
+    if version:
+        return version
+    text = " ".join(str(profile or "").split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def json_default(value):
+    # Agent reports mein Enum members (importanceEnum) aur pydantic models aate hai
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ResultStore:
+    """
+    Server-side agent results ka store, key (PDF hash, profile version, agent
+    version). Sessions aur users ke beech share hota hai, toh pehle se analyse
+    hua RFP dobara khulne par bina LLM / vector DB call ke results mil jaate hai.
+    """
+
+    def __init__(self, path=None, ttl=None):
+        self.ttl = ttl if ttl is not None else constants.RESULT_STORE_TTL
+        self.conn = connect_sqlite(path or constants.RESULT_STORE_DB)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        with self.lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, stage TEXT, pdf_hash TEXT, "
+                "profile_version TEXT, agent_version TEXT, value TEXT, "
+                "created_at REAL)"
+            )
+
+    @staticmethod
+    def make_key(stage, pdf_hash, profile=None):
+        """(stage, PDF hash, profile version, agent version) ka key"""
+
+        version = profile_version(profile) if stage in PROFILE_STAGES else ""
+        parts = [stage, pdf_hash, version, agent_version(stage)]
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest(), parts
+
+    def get(self, stage, pdf_hash, profile=None):
+        key, _ = self.make_key(stage, pdf_hash, profile)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value, created_at FROM results WHERE key=?", (key,)
+            ).fetchone()
+
+            if row is None or row[1] + self.ttl <= time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def put(self, stage, pdf_hash, profile, value):
+        """
+        Sirf successful results store hote hai, errors dobara try honge.
+        Best-effort: store na ho paaye toh log karke aage, stage fail nahi hota.
+        """
+
+        if isinstance(value, dict) and value.get("error"):
+            return
+
+        try:
+            key, parts = self.make_key(stage, pdf_hash, profile)
+            body = json.dumps(value, default=json_default)
+            with self.lock, self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, *parts, body, time.time()),
+                )
+        except Exception as e:
+            logger.warning(f"Could not store {stage} result: {e}")
+
+    def get_many(self, stages, pdf_hash, profile=None):
+        """stage -> stored result, jo mile sirf woh"""
+
+        results = {}
+        for stage in stages:
+            value = self.get(stage, pdf_hash, profile)
+            if value is not None:
+                results[stage] = value
+        return results
+
+    def stats(self):
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+def get_result_store():
+    """Process-wide result store"""
+
+    return get_shared("result_store", ResultStore)
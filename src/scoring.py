@@ -1,3 +1,6 @@
+import numpy as np
+import pandas as pd
+
 # import json
 # import os
 # import logging
@@ -89,58 +92,119 @@
 #     }
 
 
-def calculate_compliance_score(compliance_dict):
+# Importance string mein jo key pehle mile (isi order mein) uska weight
+DEFAULT_WEIGHTS = {"high": 60, "medium": 30, "low": 10}
+# Importance missing ya pehchaan mein na aaye toh high jaisa hi maano
+DEFAULT_FALLBACK_WEIGHT = 60
+
+SCORE_COLUMNS = [
+    "overall_eligibility_assessment",
+    "total_criteria_evaluated",
+    "criteria_matched",
+    "score_percentage",
+]
+
+
+def criterion_weights(importance, weights=None, default_weight=None):
     """
-    Calculate a weighted compliance score based on importance levels.
+    Importance strings ke weights, vectorised.
+
+    `weights` ke keys substring ki tarah match hote hai, dict order mein (e.g.
+    "importanceEnum.HIGH" -> "high"); koi match na ho toh `default_weight`.
+    """
+
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    default_weight = (
+        DEFAULT_FALLBACK_WEIGHT if default_weight is None else default_weight
+    )
+
+    importance = pd.Series(importance, dtype="object").astype(str).str.lower()
+    if not weights:
+        # np.select khali condition list nahi leta; sab par default weight
+        return np.full(len(importance), default_weight, dtype=float)
+
+    conditions = [
+        importance.str.contains(key, regex=False).to_numpy() for key in weights
+    ]
+    return np.select(conditions, list(weights.values()), default=default_weight).astype(
+        float
+    )
+
+
+def score_reports(compliance_dicts, weights=None, default_weight=None):
+    """
+    Bahut saare ComplianceReport dicts ko ek pass mein score karega.
+
+    Criteria ek flat array mein aate hai aur per-report sums np.bincount se
+    nikalte hai, toh hazaaron reports par bhi Python loop sirf flattening ka hai.
 
     Args:
-        compliance_dict (dict): A dictionary following the structure of ComplianceReport.
+        compliance_dicts: ComplianceReport dicts ki list
+        weights: importance key -> weight (default DEFAULT_WEIGHTS)
+        default_weight: unmatched importance ka weight
 
     Returns:
-        dict: A structured report with compliance summary.
+        pd.DataFrame: har report ki ek row, SCORE_COLUMNS ke saath
+        `total_weight` aur `matched_weight`
     """
 
-    def give_weights(importance):
-        if "high" in importance:
-            return 60
-        elif "medium" in importance:
-            return 30
-        elif "low" in importance:
-            return 10
-        else:
-            return 60
-
-    # weights = {"high": 50, "low": 20, "medium": 30, "default": 60}
+    compliance_dicts = list(compliance_dicts)
+    n_reports = len(compliance_dicts)
 
-    total_weight = 0
-    matched_weight = 0
-    total_criteria = 0
-    matched_criteria = 0
+    report_index, importance, matches = [], [], []
+    for i, compliance_dict in enumerate(compliance_dicts):
+        for criterion in compliance_dict.get("compliance_criteria", []):
+            report_index.append(i)
+            importance.append(criterion.get("importance", ""))
+            matches.append(bool(criterion.get("matches", False)))
 
-    for criterion in compliance_dict.get("compliance_criteria", []):
-        importance = str(criterion.get("importance", "")).lower()
+    report_index = np.asarray(report_index, dtype=np.int64)
+    matched = np.asarray(matches, dtype=bool)
+    criterion_weight = criterion_weights(importance, weights, default_weight)
 
-        matches = criterion.get("matches", False)
+    total_weight = np.bincount(report_index, criterion_weight, minlength=n_reports)
+    matched_weight = np.bincount(
+        report_index, criterion_weight * matched, minlength=n_reports
+    )
+    total_criteria = np.bincount(report_index, minlength=n_reports)
+    matched_criteria = np.bincount(report_index, matched, minlength=n_reports)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = np.where(
+            total_weight > 0, np.round(matched_weight / total_weight * 100, 2), 0.0
+        )
+
+    return pd.DataFrame(
+        {
+            "overall_eligibility_assessment": [
+                d.get("overall_eligibility_assessment", "") for d in compliance_dicts
+            ],
+            "total_criteria_evaluated": total_criteria.astype(int),
+            "criteria_matched": matched_criteria.astype(int),
+            "score_percentage": score,
+            "total_weight": total_weight,
+            "matched_weight": matched_weight,
+        }
+    )
 
-        weight = give_weights(importance)
-        total_weight += weight
-        total_criteria += 1
 
-        if matches:
-            matched_weight += weight
-            matched_criteria += 1
+def calculate_compliance_score(compliance_dict, weights=None, default_weight=None):
+    """
+    Calculate a weighted compliance score based on importance levels.
 
-    score_percentage = (
-        round((matched_weight / total_weight) * 100, 2) if total_weight > 0 else 0.0
-    )
-    assessment = compliance_dict.get("overall_eligibility_assessment", "")
+    Args:
+        compliance_dict (dict): A dictionary following the structure of ComplianceReport.
+        weights (dict, optional): Importance key -> weight, see `score_reports`.
+        default_weight (int, optional): Weight for unrecognised importance.
 
-    # Extract company name from the assessment string if present
-    # company_name = extract_company_name_from_assessment(assessment)
+    Returns:
+        dict: A structured report with compliance summary.
+    """
 
+    row = score_reports([compliance_dict], weights, default_weight).iloc[0]
     return {
-        "overall_eligibility_assessment": assessment,
-        "total_criteria_evaluated": total_criteria,
-        "criteria_matched": matched_criteria,
-        "score_percentage": score_percentage,
+        "overall_eligibility_assessment": row["overall_eligibility_assessment"],
+        "total_criteria_evaluated": int(row["total_criteria_evaluated"]),
+        "criteria_matched": int(row["criteria_matched"]),
+        "score_percentage": float(row["score_percentage"]),
     }
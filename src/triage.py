@@ -0,0 +1,284 @@
+"""
+Headless batch triage: ek directory ke saare RFP PDFs par
+ingest -> compliance -> score -> risk chalata hai aur ranked summary likhta hai.
+
+    python src/triage.py files/ --output triage_out --workers 4
+
+Progress `<output>/progress.jsonl` mein likha jata hai; dobara chalane par jo
+PDFs (same content hash ke saath) pehle complete ho chuke hai woh skip hote hai.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pymupdf
+from dotenv import load_dotenv
+
+import constants
+from clients import get_agent, get_shared
+from company_profile import load_company_profile
+from PDFIngestor.ingestion_cache import hash_file
+from scoring import calculate_compliance_score
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_FIELDS = [
+    "rank",
+    "file",
+    "status",
+    "score_percentage",
+    "eligibility",
+    "criteria_matched",
+    "total_criteria_evaluated",
+    "high_risks",
+    "total_risks",
+    "ingest_s",
+    "compliance_s",
+    "scoring_s",
+    "risk_s",
+    "total_s",
+    "error",
+]
+
+
+class ProgressLog:
+    """Append-only JSONL progress file, har complete document ki ek line"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.records = {}
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Beech mein ruke run ki adhuri line
+                        continue
+                    self.records[record["file"]] = record
+
+    def is_done(self, path, sha256):
+        record = self.records.get(os.path.basename(path))
+        return (
+            record is not None
+            and record["status"] == "done"
+            and record["sha256"] == sha256
+        )
+
+    def append(self, record):
+        with self.lock:
+            self.records[record["file"]] = record
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+
+
+def extract_text(path):
+    with pymupdf.open(path) as doc:
+        return "".join(page.get_text() for page in doc)
+
+
+def triage_pdf(path, profile, skip_risk=False):
+    """Ek PDF ka poora triage, har stage ka time seconds mein"""
+
+    from PDFIngestor.PDFIngestor import DataIngestor
+    from agents.compliance_agent_optimised import ComplianceAgent
+    from agents.risk_analysis_agent_optimised import RiskAnalysisAgent
+
+    filename = os.path.basename(path)
+    record = {"file": filename, "path": path, "sha256": hash_file(path)}
+    timings = {}
+    started = time.perf_counter()
+
+    def timed(stage, run):
+        stage_started = time.perf_counter()
+        try:
+            return run()
+        finally:
+            timings[f"{stage}_s"] = round(time.perf_counter() - stage_started, 3)
+
+    try:
+        timed(
+            "ingest",
+            lambda: get_shared("data_ingestor", DataIngestor).ingest_pdf(
+                path, constants.RFP_INDEX_NAME, constants.RAG_NAMESPACE
+            ),
+        )
+
+        rfp_text = extract_text(path)
+        compliance = timed(
+            "compliance",
+            lambda: get_agent(ComplianceAgent).invoke(rfp_text, profile, filename),
+        )
+        if compliance.get("error"):
+            raise RuntimeError(compliance["error"])
+
+        score = timed("scoring", lambda: calculate_compliance_score(compliance))
+        record.update(
+            {
+                "score_percentage": score["score_percentage"],
+                "eligibility": score["overall_eligibility_assessment"],
+                "criteria_matched": score["criteria_matched"],
+                "total_criteria_evaluated": score["total_criteria_evaluated"],
+                "compliance": compliance,
+            }
+        )
+
+        if not skip_risk:
+            risk = timed(
+                "risk",
+                lambda: get_agent(RiskAnalysisAgent).invoke(
+                    rfp_text, profile.prompt_text(), filename
+                ),
+            )
+            if risk.get("error"):
+                raise RuntimeError(risk["error"])
+            risks = risk.get("identified_risks", [])
+            record.update(
+                {
+                    "total_risks": len(risks),
+                    "high_risks": sum(1 for r in risks if r["severity"] == "High"),
+                    "risk_analysis": risk,
+                }
+            )
+
+        record["status"] = "done"
+    except Exception as e:
+        logger.exception(f"Triage failed for {filename}.")
+        record["status"] = "error"
+        record["error"] = str(e)
+
+    timings["total_s"] = round(time.perf_counter() - started, 3)
+    record.update(timings)
+    return record
+
+
+def rank(records):
+    """Score sabse upar, barabar score par kam high risks wala pehle; errors last"""
+
+    ordered = sorted(
+        records,
+        key=lambda r: (
+            r["status"] != "done",
+            -(r.get("score_percentage") or 0),
+            r.get("high_risks") or 0,
+            r["file"],
+        ),
+    )
+    return [{**record, "rank": i} for i, record in enumerate(ordered, start=1)]
+
+
+def write_summary(records, output_dir):
+    ranked = rank(records)
+
+    with open(os.path.join(output_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(ranked, f, indent=2)
+
+    with open(
+        os.path.join(output_dir, "summary.csv"), "w", newline="", encoding="utf-8"
+    ) as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(ranked)
+
+    return ranked
+
+
+def run(directory, output_dir, workers=2, resume=True, skip_risk=False, profile=None):
+    """Directory ke saare PDFs triage karega, ranked summary lautaega"""
+
+    os.makedirs(output_dir, exist_ok=True)
+    profile = load_company_profile(profile)
+    progress = ProgressLog(os.path.join(output_dir, "progress.jsonl"))
+
+    paths = sorted(
+        os.path.relpath(os.path.join(directory, name))
+        for name in os.listdir(directory)
+        if name.lower().endswith(".pdf")
+    )
+    if not all(path.startswith("files" + os.sep) for path in paths):
+        # QueryAgent ka source filter "files/<name>" maanta hai
+        logger.warning(
+            "RAG retrieval filters on 'files/<name>'; run from the repo root "
+            "with PDFs under files/ for risk context to be found."
+        )
+
+    pending = [
+        path
+        for path in paths
+        if not (resume and progress.is_done(path, hash_file(path)))
+    ]
+    logger.info(
+        f"{len(paths)} PDFs found, {len(paths) - len(pending)} already done, "
+        f"{len(pending)} to triage with {workers} workers."
+    )
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(triage_pdf, path, profile, skip_risk): path for path in pending
+        }
+        for future in as_completed(futures):
+            record = future.result()
+            progress.append(record)
+            logger.info(
+                f"[{record['status']}] {record['file']} "
+                f"score={record.get('score_percentage')} total={record['total_s']}s"
+            )
+
+    current = {os.path.basename(path) for path in paths}
+    return write_summary(
+        [r for name, r in progress.records.items() if name in current], output_dir
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Batch-triage a directory of RFP PDFs: ingest, compliance, score, risk."
+    )
+    parser.add_argument("directory", help="Directory containing RFP PDFs (e.g. files/)")
+    parser.add_argument(
+        "--output", default="triage_out", help="Directory for progress and summaries"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=2, help="Documents processed in parallel"
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Re-run documents already finished in a previous run",
+    )
+    parser.add_argument(
+        "--skip-risk", action="store_true", help="Skip the risk analysis stage"
+    )
+    parser.add_argument(
+        "--profile", default=None, help="Company profile file (default: built-in)"
+    )
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    ranked = run(
+        args.directory,
+        args.output,
+        workers=args.workers,
+        resume=not args.no_resume,
+        skip_risk=args.skip_risk,
+        profile=args.profile,
+    )
+    for record in ranked:
+        print(
+            f"{record['rank']:>3}. {record['file']:<40} "
+            f"{record['status']:<6} score={record.get('score_percentage', '-')}"
+        )
+
+
+if __name__ == "__main__":
+    main()
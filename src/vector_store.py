@@ -0,0 +1,610 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import numpy as np
+
+import constants
+
+
+class VectorStore:
+    """Vector index ka common interface, ingest aur query dono ke liye"""
+
+    def upsert(self, records, namespace):
+        """records: list of (id, values, metadata)"""
+
+        raise NotImplementedError
+
+    def query(self, vector, top_k, namespace, filter=None):
+        """Top-k matches as list of {"id", "score", "metadata"}"""
+
+        raise NotImplementedError
+
+    def list_ids(self, prefix, namespace):
+        """Prefix se shuru hone wale saare IDs"""
+
+        raise NotImplementedError
+
+    def fetch(self, ids, namespace):
+        """id -> vector values"""
+
+        raise NotImplementedError
+
+    def delete(self, ids, namespace):
+        raise NotImplementedError
+
+    def describe(self):
+        """Index stats, logging ke liye"""
+
+        raise NotImplementedError
+
+
+class PineconeStore(VectorStore):
+    """Pinecone serverless index, jo sirf pehle write par banta hai"""
+
+    def __init__(self, index_name, dimension, pinecone_client=None):
+        from clients import get_pinecone_client
+
+        self.index_name = index_name
+        self.dimension = dimension
+        self.pc = pinecone_client or get_pinecone_client()
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _get_index(self, create=False):
+        if self._index is not None:
+            return self._index
+
+        with self._lock:
+            if self._index is None:
+                if create:
+                    self._create_if_missing()
+                self._index = self.pc.Index(self.index_name)
+        return self._index
+
+    def _create_if_missing(self):
+        from pinecone import ServerlessSpec
+
+        existing_indexes = [index_info["name"] for index_info in self.pc.list_indexes()]
+
+        if self.index_name not in existing_indexes:
+            self.pc.create_index(
+                name=self.index_name,
+                dimension=self.dimension,
+                metric="cosine",
+                spec=ServerlessSpec(
+                    cloud=os.getenv("PINECONE_CLOUD"),
+                    region=os.getenv("PINECONE_REGION"),
+                ),
+            )
+            while not self.pc.describe_index(self.index_name).status["ready"]:
+                time.sleep(1)
+
+    def upsert(self, records, namespace, batch_size=100):
+        index = self._get_index(create=True)
+        for start in range(0, len(records), batch_size):
+            index.upsert(
+                vectors=records[start : start + batch_size], namespace=namespace
+            )
+
+    def query(self, vector, top_k, namespace, filter=None):
+        response = self._get_index().query(
+            namespace=namespace,
+            vector=vector,
+            top_k=top_k,
+            include_values=False,
+            include_metadata=True,
+            filter=filter,
+        )
+        return [
+            {"id": match["id"], "score": match["score"], "metadata": match["metadata"]}
+            for match in response["matches"]
+        ]
+
+    def list_ids(self, prefix, namespace):
+        ids = set()
+        for page in self._get_index(create=True).list(
+            prefix=prefix, namespace=namespace
+        ):
+            ids.update(page)
+        return ids
+
+    def fetch(self, ids, namespace, batch_size=100):
+        index = self._get_index()
+        vectors = {}
+        for start in range(0, len(ids), batch_size):
+            response = index.fetch(
+                ids=ids[start : start + batch_size], namespace=namespace
+            )
+            for vector_id, vector in response.vectors.items():
+                vectors[vector_id] = vector.values
+        return vectors
+
+    def delete(self, ids, namespace, batch_size=1000):
+        index = self._get_index()
+        for start in range(0, len(ids), batch_size):
+            index.delete(ids=ids[start : start + batch_size], namespace=namespace)
+
+    def describe(self):
+        return self._get_index().describe_index_stats()
+
+
+def _filter_mask(segment, filter):
+    """
+    Pinecone-style metadata filter ka subset (equality, $eq, $ne, $in, $nin),
+    segment ke per-field columns par vectorised
+    """
+
+    mask = np.ones(len(segment.ids), dtype=bool)
+    for key, condition in filter.items():
+        column = segment.column(key)
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, operand in condition.items():
+            if op in ("$eq", "$ne"):
+                hits = column == operand
+            elif op in ("$in", "$nin"):
+                hits = np.zeros(len(column), dtype=bool)
+                for value in operand:
+                    hits |= column == value
+            else:
+                raise ValueError(f"Unsupported filter operator '{op}'")
+            mask &= ~hits if op in ("$ne", "$nin") else hits
+    return mask
+
+
+class _Segment:
+    """
+    Index ka ek immutable hissa: memory-mapped vectors.npy aur ids/metadata
+    sidecar. Upsert naya segment jodta hai, purane segments dobara nahi likhe
+    jaate.
+    """
+
+    def __init__(self, directory, name):
+        self.name = name
+        path = os.path.join(directory, name)
+        with open(os.path.join(path, "metadata.json"), "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        self.ids = sidecar["ids"]
+        self.metadata = sidecar["metadata"]
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self.columns = {}
+
+    @staticmethod
+    def write(directory, ids, vectors, metadata):
+        """Naya segment directory likhega aur uska naam lautaega"""
+
+        name = f"seg-{uuid.uuid4().hex}"
+        path = os.path.join(directory, name)
+        os.makedirs(path)
+        np.save(
+            os.path.join(path, "vectors.npy"),
+            np.ascontiguousarray(vectors, dtype=np.float32),
+        )
+        with open(os.path.join(path, "metadata.json"), "w", encoding="utf-8") as f:
+            json.dump({"ids": list(ids), "metadata": list(metadata)}, f)
+        return name
+
+    def column(self, key):
+        """Metadata field ki values ka object array, pehli baar banke cache"""
+
+        if key not in self.columns:
+            self.columns[key] = np.fromiter(
+                (metadata.get(key) for metadata in self.metadata),
+                dtype=object,
+                count=len(self.metadata),
+            )
+        return self.columns[key]
+
+
+class _Namespace:
+    """
+    Ek namespace ke segments aur unke deleted rows (tombstones).
+
+    Live segments ki list `MANIFEST.json` mein hai jo har write par ek hi
+    os.replace se badalta hai, toh crash ke baad bhi manifest hamesha poore
+    likhe hue segments ko point karta hai. Upsert/delete sirf naya segment ya
+    tombstones likhte hai; chhote segments aur zyada deleted rows wale
+    segments kabhi-kabhi compact hote hai, toh ingest ka I/O corpus size se
+    quadratic nahi hota.
+    """
+
+    def __init__(self, directory, dimension):
+        self.directory = directory
+        self.dimension = dimension
+        self.manifest_path = os.path.join(directory, "MANIFEST.json")
+        self.ann = None
+        # HNSW index query time par hi (dobara) banta hai, write par nahi
+        self.ann_dirty = True
+        self.checked_at = time.monotonic()
+
+        self.signature = self.disk_signature()
+        manifest = self._read_manifest()
+        self.segments = [_Segment(directory, name) for name in manifest["segments"]]
+        self.deleted = {
+            name: set(rows) for name, rows in manifest.get("deleted", {}).items()
+        }
+        # Pichhle write mein hataye segments; agle write par disk se mitenge
+        self.retired = manifest.get("retired", [])
+        self._index_positions()
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+
+        # Purane layouts: CURRENT pointer wala version dir, ya seedha flat files
+        current = os.path.join(self.directory, "CURRENT")
+        if os.path.exists(current):
+            with open(current, "r", encoding="utf-8") as f:
+                version = f.read().strip()
+            stray = [
+                name
+                for name in os.listdir(self.directory)
+                if name.startswith("v-") and name != version
+            ]
+            return {"segments": [version], "retired": stray}
+        if os.path.exists(os.path.join(self.directory, "metadata.json")):
+            return {"segments": ["."]}
+        return {"segments": []}
+
+    def disk_signature(self):
+        """Manifest (ya purane layout) ka stat; badla toh kisi aur process ne likha"""
+
+        for name in ("MANIFEST.json", "CURRENT", "metadata.json"):
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            return (name, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        return None
+
+    def _index_positions(self):
+        self.positions = {}
+        for segment in self.segments:
+            dead = self.deleted.get(segment.name, ())
+            for row, vector_id in enumerate(segment.ids):
+                if row not in dead:
+                    self.positions[vector_id] = (segment, row)
+        self.ann_dirty = True
+
+    def alive_mask(self, segment):
+        mask = np.ones(len(segment.ids), dtype=bool)
+        dead = self.deleted.get(segment.name)
+        if dead:
+            mask[list(dead)] = False
+        return mask
+
+    def tombstone(self, vector_id):
+        segment, row = self.positions.pop(vector_id)
+        self.deleted.setdefault(segment.name, set()).add(row)
+
+    def append(self, ids, vectors, metadata):
+        """Naye rows ek naye segment mein; same id ke purane rows tombstone"""
+
+        os.makedirs(self.directory, exist_ok=True)
+        for vector_id in ids:
+            if vector_id in self.positions:
+                self.tombstone(vector_id)
+        segment = _Segment(
+            self.directory, _Segment.write(self.directory, ids, vectors, metadata)
+        )
+        self.segments.append(segment)
+        for row, vector_id in enumerate(ids):
+            self.positions[vector_id] = (segment, row)
+
+    def commit(self):
+        """Zarurat ho toh compact karke naya manifest atomically live karega"""
+
+        retired = self._compact_if_needed()
+        self._remove_segments(
+            [name for name in self.retired if name not in self._live_names()]
+        )
+        self.retired = retired
+
+        manifest = {
+            "segments": self._live_names(),
+            "deleted": {
+                name: sorted(rows) for name, rows in self.deleted.items() if rows
+            },
+            "retired": retired,
+        }
+        # Yahi ek rename naye segments ko live karta hai
+        tmp_path = f"{self.manifest_path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+        try:
+            # Manifest aa gaya, purana CURRENT pointer ab kaam ka nahi
+            os.remove(os.path.join(self.directory, "CURRENT"))
+        except OSError:
+            pass
+
+        self.signature = self.disk_signature()
+        self.ann_dirty = True
+
+    def _live_names(self):
+        return [segment.name for segment in self.segments]
+
+    def _compact_if_needed(self):
+        """
+        Bahut zyada segments ho toh sabse chhote merge, aur jis segment ke
+        LOCAL_INDEX_MAX_DEAD_FRACTION se zyada rows deleted hai use dobara likho.
+        Hataye gaye segments ke naam lautaega.
+        """
+
+        merge = []
+        max_segments = constants.LOCAL_INDEX_MAX_SEGMENTS
+        if len(self.segments) > max_segments:
+            by_size = sorted(
+                self.segments,
+                key=lambda s: len(s.ids) - len(self.deleted.get(s.name, ())),
+            )
+            merge = by_size[: len(self.segments) - max_segments // 2]
+        merge += [
+            segment
+            for segment in self.segments
+            if segment not in merge
+            and len(self.deleted.get(segment.name, ()))
+            > constants.LOCAL_INDEX_MAX_DEAD_FRACTION * len(segment.ids)
+        ]
+        if not merge:
+            return []
+
+        ids, metadata, vectors = [], [], []
+        for segment in merge:
+            rows = np.flatnonzero(self.alive_mask(segment))
+            ids += [segment.ids[row] for row in rows]
+            metadata += [segment.metadata[row] for row in rows]
+            vectors.append(np.asarray(segment.vectors[rows], dtype=np.float32))
+
+        merged_names = {segment.name for segment in merge}
+        self.segments = [s for s in self.segments if s.name not in merged_names]
+        for name in merged_names:
+            self.deleted.pop(name, None)
+        if ids:
+            segment = _Segment(
+                self.directory,
+                _Segment.write(self.directory, ids, np.concatenate(vectors), metadata),
+            )
+            self.segments.append(segment)
+        self._index_positions()
+        return sorted(merged_names)
+
+    def _remove_segments(self, names):
+        for name in names:
+            if name == ".":
+                for legacy in ("vectors.npy", "metadata.json"):
+                    try:
+                        os.remove(os.path.join(self.directory, legacy))
+                    except OSError:
+                        pass
+            else:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Embedded vector index: har namespace ke liye memory-mapped NumPy segments
+    aur JSON metadata sidecars. Default exact search segment-wise matrix
+    multiply hai; `mode="hnsw"` mein hnswlib ka approximate index use hota hai.
+    """
+
+    def __init__(self, index_name, dimension, directory=None, mode=None):
+        self.dimension = dimension
+        self.directory = os.path.join(
+            directory or constants.LOCAL_INDEX_DIR, index_name
+        )
+        self.mode = mode or constants.LOCAL_INDEX_MODE
+        self._namespaces = {}
+        self._lock = threading.RLock()
+
+    def _namespace(self, namespace):
+        namespace = namespace or "__default__"
+        ns = self._namespaces.get(namespace)
+        now = time.monotonic()
+        if (
+            ns is not None
+            and now - ns.checked_at < constants.LOCAL_INDEX_RECHECK_INTERVAL
+        ):
+            return ns
+
+        # Doosre process ne likha ho (manifest badla) tabhi disk se reload
+        if ns is None or ns.disk_signature() != ns.signature:
+            ns = _Namespace(os.path.join(self.directory, namespace), self.dimension)
+            self._namespaces[namespace] = ns
+        ns.checked_at = now
+        return ns
+
+    @staticmethod
+    def _normalise(vectors):
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def upsert(self, records, namespace):
+        if not records:
+            return
+
+        # Ek call mein same id do baar aaye toh aakhri wala
+        latest = {}
+        for vector_id, values, metadata in records:
+            latest[vector_id] = (values, metadata)
+
+        with self._lock:
+            ns = self._namespace(namespace)
+            ids = list(latest)
+            ns.append(
+                ids,
+                self._normalise([latest[vector_id][0] for vector_id in ids]),
+                [latest[vector_id][1] for vector_id in ids],
+            )
+            ns.commit()
+
+    def _ann_index(self, ns):
+        if ns.ann is None or ns.ann_dirty:
+            # Optional dependency, sirf hnsw mode ke liye
+            import hnswlib
+
+            total = sum(len(segment.ids) for segment in ns.segments)
+            ann = hnswlib.Index(space="ip", dim=self.dimension)
+            ann.init_index(max_elements=max(total, 1), ef_construction=200, M=16)
+            offset = 0
+            for segment in ns.segments:
+                if len(segment.ids):
+                    ann.add_items(
+                        np.asarray(segment.vectors),
+                        np.arange(offset, offset + len(segment.ids)),
+                    )
+                offset += len(segment.ids)
+            ann.set_ef(100)
+            ns.ann = ann
+            ns.ann_dirty = False
+        return ns.ann
+
+    def _candidate_masks(self, ns, filter):
+        """Har segment ke liye alive (aur filter match) rows ka mask"""
+
+        masks = []
+        for segment in ns.segments:
+            mask = ns.alive_mask(segment)
+            if filter:
+                mask &= _filter_mask(segment, filter)
+            masks.append(mask)
+        return masks
+
+    def _exact_query(self, ns, query_vector, k, masks):
+        positions, scores = [], []
+        for segment, mask in zip(ns.segments, masks):
+            rows = np.flatnonzero(mask)
+            if rows.size == 0:
+                continue
+            matrix = (
+                segment.vectors if rows.size == mask.size else segment.vectors[rows]
+            )
+            segment_scores = matrix @ query_vector
+            top = np.argpartition(-segment_scores, min(k, rows.size) - 1)[:k]
+            positions += [(segment, row) for row in rows[top]]
+            scores.append(segment_scores[top])
+
+        scores = np.concatenate(scores)
+        order = np.argsort(-scores)[:k]
+        return [positions[i] for i in order], scores[order]
+
+    def _ann_query(self, ns, query_vector, k, masks):
+        ann = self._ann_index(ns)
+        mask = np.concatenate(masks)
+        labels, distances = ann.knn_query(
+            query_vector,
+            k=k,
+            filter=None if mask.all() else (lambda label: bool(mask[label])),
+        )
+        offsets = np.cumsum([0] + [len(segment.ids) for segment in ns.segments])
+        positions = []
+        for label in labels[0]:
+            index = int(np.searchsorted(offsets, label, side="right")) - 1
+            positions.append((ns.segments[index], int(label - offsets[index])))
+        return positions, 1.0 - distances[0]
+
+    def query(self, vector, top_k, namespace, filter=None):
+        with self._lock:
+            ns = self._namespace(namespace)
+            masks = self._candidate_masks(ns, filter)
+            candidates = int(sum(mask.sum() for mask in masks))
+            if candidates == 0:
+                return []
+
+            query_vector = self._normalise([vector])[0]
+            k = min(top_k, candidates)
+
+            result = None
+            if self.mode == "hnsw":
+                try:
+                    result = self._ann_query(ns, query_vector, k, masks)
+                except RuntimeError:
+                    # Filter ke baad graph mein k candidates na mile; exact search
+                    result = None
+            if result is None:
+                result = self._exact_query(ns, query_vector, k, masks)
+
+            positions, scores = result
+            return [
+                {
+                    "id": segment.ids[row],
+                    "score": float(score),
+                    "metadata": segment.metadata[row],
+                }
+                for (segment, row), score in zip(positions, scores)
+            ]
+
+    def list_ids(self, prefix, namespace):
+        with self._lock:
+            return {
+                vector_id
+                for vector_id in self._namespace(namespace).positions
+                if vector_id.startswith(prefix)
+            }
+
+    def fetch(self, ids, namespace):
+        with self._lock:
+            ns = self._namespace(namespace)
+            vectors = {}
+            for vector_id in ids:
+                if vector_id in ns.positions:
+                    segment, row = ns.positions[vector_id]
+                    vectors[vector_id] = segment.vectors[row].tolist()
+            return vectors
+
+    def delete(self, ids, namespace):
+        if not ids:
+            return
+
+        with self._lock:
+            ns = self._namespace(namespace)
+            dropped = [vector_id for vector_id in set(ids) if vector_id in ns.positions]
+            if not dropped:
+                return
+            for vector_id in dropped:
+                ns.tombstone(vector_id)
+            ns.commit()
+
+    def describe(self):
+        with self._lock:
+            namespaces = {}
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    namespaces[name] = {
+                        "vector_count": len(self._namespace(name).positions)
+                    }
+            return {"dimension": self.dimension, "namespaces": namespaces}
+
+
+VECTOR_STORES = {
+    "pinecone": PineconeStore,
+    "local": LocalVectorStore,
+}
+
+
+def get_vector_store(index_name, dimension, name=None, **kwargs):
+    """
+    Config ke hisaab se vector store dega. Har index ka store process mein
+    ek hi baar banta hai (clients registry se), taaki ingest aur query same
+    index handle / same local data share kare.
+    """
+
+    from clients import get_shared
+
+    name = name or constants.VECTOR_STORE
+    if name not in VECTOR_STORES:
+        raise ValueError(
+            f"Unknown vector store '{name}', expected one of {list(VECTOR_STORES)}"
+        )
+
+    key = ("vector_store", name, index_name, tuple(sorted(kwargs.items())))
+    return get_shared(key, lambda: VECTOR_STORES[name](index_name, dimension, **kwargs))
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules `src/` se top-level imports ki tarah aate hai, app ki tarah hi
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
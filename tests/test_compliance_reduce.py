@@ -0,0 +1,64 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langchain")
+
+from agents.compliance_reduce import assess_eligibility, merge_criteria  # noqa: E402
+
+
+def criterion(label, required, importance="HIGH", matches=True):
+    return SimpleNamespace(
+        criteria=label, required=required, importance=importance, matches=matches
+    )
+
+
+def test_merge_dedupes_on_label_or_requirement_and_keeps_order():
+    first = criterion("Insurance", "General liability of $1M")
+    merged = merge_criteria(
+        [
+            first,
+            criterion("W-9", "Submit a W-9 form"),
+            criterion("insurance!", "something else"),
+            criterion("Liability cover", "general liability of $1m"),
+        ]
+    )
+    assert [c.criteria for c in merged] == ["Insurance", "W-9"]
+    assert merged[0] is first
+
+
+def test_failing_duplicate_wins():
+    passing = criterion("Experience", "5 years", matches=True)
+    failing = criterion("Experience", "5 years", matches=False)
+    assert merge_criteria([passing, failing]) == [failing]
+    assert merge_criteria([failing, passing]) == [failing]
+
+
+def test_merge_keeps_highest_importance_without_mutating_inputs():
+    failing = criterion("Bond", "Bid bond", importance="LOW", matches=False)
+    passing = criterion("Bond", "Bid bond", importance="HIGH", matches=True)
+
+    (merged,) = merge_criteria([passing, failing])
+
+    assert merged.matches is False
+    assert merged.importance == "HIGH"
+    assert failing.importance == "LOW"
+
+
+def test_unjudged_criteria_compete_on_importance():
+    low = SimpleNamespace(criteria="Font", required="12pt", importance="LOW")
+    medium = SimpleNamespace(criteria="Font", required="12pt", importance="MEDIUM")
+    assert merge_criteria([low, medium]) == [medium]
+
+
+def test_assess_eligibility():
+    met = [criterion("A", "a"), criterion("B", "b", importance="LOW", matches=False)]
+    assert assess_eligibility(met, "Acme") == (
+        "Acme appears eligible: all 1 high-importance criteria are met."
+    )
+
+    unmet = [criterion(label, label, matches=False) for label in "ABCDE"]
+    unmet.append(criterion("F", "f", importance="unknown", matches=False))
+    summary = assess_eligibility(unmet)
+    assert summary.startswith("Company name not found appears ineligible: 6 of 6")
+    assert "(A, B, C and 3 more)" in summary
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+
+import pytest
+
+import constants
+from job_queue import BOOT_ID, JobQueue, _owner_alive, make_dedupe_key
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jobs.sqlite")
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.status(job_id)
+        if job["status"] in ("done", "error"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def insert_running(queue, job_id, owner, started_at):
+    with queue.conn:
+        queue.conn.execute(
+            "INSERT INTO jobs (id, kind, dedupe_key, status, payload, created_at, "
+            "started_at, owner) VALUES (?, 'echo', ?, 'running', '{\"x\": 1}', "
+            "?, ?, ?)",
+            (job_id, job_id, started_at, started_at, owner),
+        )
+
+
+def test_runs_handler_and_returns_json_or_bytes(db_path):
+    queue = JobQueue(path=db_path, workers=2)
+    queue.register("add", lambda a, b: {"sum": a + b})
+    queue.register("blob", lambda: b"%PDF")
+
+    assert wait_for(queue, queue.submit("add", {"a": 1, "b": 2}))["result"] == {
+        "sum": 3
+    }
+    assert wait_for(queue, queue.submit("blob", {}))["result"] == b"%PDF"
+    assert queue.status("missing") is None
+
+
+def test_unknown_kind_and_handler_errors(db_path):
+    queue = JobQueue(path=db_path, workers=1)
+    with pytest.raises(ValueError):
+        queue.submit("nope", {})
+
+    def boom():
+        raise RuntimeError("agent failed")
+
+    queue.register("boom", boom)
+    job = wait_for(queue, queue.submit("boom", {}))
+    assert job["status"] == "error"
+    assert job["error"] == "agent failed"
+
+
+def test_duplicate_submits_collapse_while_active(db_path):
+    release = threading.Event()
+    calls = []
+
+    def slow(x):
+        calls.append(x)
+        release.wait(5)
+        return x
+
+    queue = JobQueue(path=db_path, workers=2)
+    queue.register("slow", slow)
+
+    first = queue.submit("slow", {"x": 1})
+    assert queue.submit("slow", {"x": 1}) == first
+    assert queue.submit("slow", {"x": 2}) != first
+    same_key = make_dedupe_key("slow", {"x": 1})
+    assert queue.submit("slow", {"x": 3}, dedupe_key=same_key) == first
+
+    release.set()
+    wait_for(queue, first)
+    assert sorted(calls) == [1, 2]
+
+
+def test_done_jobs_are_reused_only_within_ttl(db_path):
+    queue = JobQueue(path=db_path, workers=1, done_ttl=3600)
+    queue.register("echo", lambda x: x)
+    first = queue.submit("echo", {"x": 1})
+    wait_for(queue, first)
+    assert queue.submit("echo", {"x": 1}) == first
+
+    expired = JobQueue(path=db_path, workers=1, done_ttl=0)
+    expired.register("echo", lambda x: x)
+    assert expired.submit("echo", {"x": 1}) != first
+
+
+def test_stale_running_job_does_not_block_resubmit(db_path, monkeypatch):
+    queue = JobQueue(path=db_path, workers=1)
+    queue.register("echo", lambda x: x)
+    insert_running(queue, "stuck", queue.owner, 0)
+
+    monkeypatch.setattr(constants, "JOB_STALE_AFTER", 60)
+    assert queue.status("stuck")["status"] == "error"
+    assert queue.submit("echo", {"x": 1}, dedupe_key="stuck") != "stuck"
+
+
+def test_owner_alive():
+    assert _owner_alive(f"{os.getpid()}:{BOOT_ID}")
+    # Same pid, doosra boot: container restart ke baad pid 1 dobara mil jata hai
+    assert not _owner_alive(f"{os.getpid()}:previous-boot")
+    assert not _owner_alive(None)
+    assert not _owner_alive("not-a-pid")
+
+
+def test_resume_requeues_only_orphaned_jobs(db_path):
+    queue = JobQueue(path=db_path, workers=1)
+    now = time.time()
+    insert_running(queue, "dead-owner", f"{os.getpid()}:previous-boot", now)
+    insert_running(queue, "no-owner", None, now)
+    insert_running(queue, "live-owner", queue.owner, now)
+    insert_running(queue, "stale", queue.owner, now - constants.JOB_STALE_AFTER - 1)
+
+    restarted = JobQueue(path=db_path, workers=2)
+    restarted.register("echo", lambda x: x)
+    assert restarted.resume() == 3
+
+    for job_id in ("dead-owner", "no-owner", "stale"):
+        assert wait_for(restarted, job_id)["result"] == 1
+    assert restarted.status("live-owner")["status"] == "running"
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from agents import llm_cache
+from agents.llm_cache import LLMResponseCache
+
+
+class Answer(BaseModel):
+    text: str
+
+
+class Other(BaseModel):
+    text: str
+    score: int = 0
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache, "time", clock)
+    return clock
+
+
+def make_cache(tmp_path, **kwargs):
+    return LLMResponseCache(db_path=str(tmp_path / "llm.sqlite"), **kwargs)
+
+
+def test_key_depends_on_model_prompt_and_schema():
+    key = LLMResponseCache.make_key("gpt@0", "prompt", Answer)
+    assert key == LLMResponseCache.make_key("gpt@0", "prompt", Answer)
+    assert key != LLMResponseCache.make_key("gpt@0.2", "prompt", Answer)
+    assert key != LLMResponseCache.make_key("gpt@0", "prompt!", Answer)
+    assert key != LLMResponseCache.make_key("gpt@0", "prompt", Other)
+
+
+def test_round_trip_and_stats(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    assert cache.get("k", Answer) is None
+
+    cache.put("k", Answer(text="yes"))
+
+    assert cache.get("k", Answer) == Answer(text="yes")
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl=60)
+    cache.put("old", Answer(text="old"))
+
+    clock.now += 59
+    assert cache.get("old", Answer) is not None
+    clock.now += 1
+    assert cache.get("old", Answer) is None
+
+    # Agla put expired rows saaf kar deta hai
+    cache.put("new", Answer(text="new"))
+    assert cache.stats()["entries"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, Answer(text=key))
+        clock.now += 1
+
+    # "a" padha gaya, toh "b" sabse purana use hua entry hai
+    cache.get("a", Answer)
+    clock.now += 1
+    cache.put("c", Answer(text="c"))
+
+    assert cache.get("b", Answer) is None
+    assert cache.get("a", Answer) == Answer(text="a")
+    assert cache.get("c", Answer) == Answer(text="c")
+    assert cache.stats()["entries"] == 2
+
+
+class FakePrompt:
+    def __init__(self, template):
+        self.template = template
+
+    def format(self, **inputs):
+        return self.template.format(**inputs)
+
+    def __or__(self, llm):
+        return llm
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, inputs):
+        self.calls += 1
+        return Answer(text=inputs["question"].upper())
+
+    async def ainvoke(self, inputs):
+        return self.invoke(inputs)
+
+
+def test_invoke_cached_calls_the_model_once(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path)
+    monkeypatch.setattr(llm_cache, "get_llm_cache", lambda: cache)
+    prompt, llm = FakePrompt("Q: {question}"), FakeLLM()
+
+    for _ in range(2):
+        answer = llm_cache.invoke_cached(prompt, llm, Answer, "m", {"question": "why"})
+        assert answer == Answer(text="WHY")
+    assert asyncio.run(
+        llm_cache.ainvoke_cached(prompt, llm, Answer, "m", {"question": "why"})
+    ) == Answer(text="WHY")
+    assert llm.calls == 1
+
+    asyncio.run(llm_cache.ainvoke_cached(prompt, llm, Answer, "m", {"question": "how"}))
+    assert llm.calls == 2
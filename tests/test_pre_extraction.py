@@ -0,0 +1,81 @@
+import pytest
+
+from pre_extraction import (
+    extract_entities,
+    extract_items_by_chunk,
+    format_hints,
+    normalize_amount,
+    normalize_date,
+    normalize_duration,
+    normalize_page_limit,
+)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("March 15th, 2024", "2024-03-15"),
+        ("Sept. 3, 2024", "2024-09-03"),
+        ("15 January 2025", "2025-01-15"),
+        ("04/30/2024", "2024-04-30"),
+        ("2024-06-01", "2024-06-01"),
+        ("31/31/2024", ""),
+    ],
+)
+def test_normalize_date(value, expected):
+    assert normalize_date(value) == expected
+
+
+@pytest.mark.parametrize(
+    "normalizer, value, expected",
+    [
+        (normalize_amount, "$1.5 million", "1500000"),
+        (normalize_amount, "USD 25,000", "25000"),
+        (normalize_duration, "thirty (30) calendar days", "30 calendar days"),
+        (normalize_duration, "one year", "1 year"),
+        (normalize_page_limit, "not to exceed twenty (20) pages", "20"),
+        (normalize_page_limit, "no more than ten pages", "10"),
+        (normalize_page_limit, "25-page limit", "25"),
+    ],
+)
+def test_normalizers(normalizer, value, expected):
+    assert normalizer(value) == expected
+
+
+TEXTS = [
+    "Proposals are due March 15, 2024 and again on 03/15/2024.",
+    "Budget is $2 million. Use 12 pt Times New Roman, not to exceed 20 pages.",
+    "",
+    "Attach Form B and the W-9 within 30 days.",
+]
+
+
+def test_extract_entities_dedupes_per_chunk_on_normalized_value():
+    entities = extract_entities(TEXTS)
+
+    dates = entities[entities["kind"] == "date"]
+    assert dates["chunk"].tolist() == [0]
+    assert dates["normalized"].tolist() == ["2024-03-15"]
+
+    by_kind = entities.groupby("kind")["normalized"].apply(set).to_dict()
+    assert by_kind["amount"] == {"2000000"}
+    assert by_kind["page_limit"] == {"20"}
+    assert by_kind["font"] == {"12pt", "Times New Roman"}
+    assert by_kind["form"] == {"Form B", "W-9"}
+    assert by_kind["duration"] == {"30 days"}
+
+
+def test_extract_entities_empty_and_kind_filter():
+    assert extract_entities(["nothing to see"]).empty
+    assert set(extract_entities(TEXTS, kinds=["amount"])["kind"]) == {"amount"}
+
+
+def test_items_by_chunk_and_hints():
+    items = extract_items_by_chunk(TEXTS, kinds=["date", "form"])
+    assert len(items) == len(TEXTS)
+    assert items[2] == []
+    assert {item["normalized"] for item in items[3]} == {"Form B", "W-9"}
+
+    hints = format_hints(TEXTS, kinds=["date"])
+    assert hints.splitlines()[-1] == "- date: 2024-03-15"
+    assert format_hints(["nothing"]) == ""
@@ -0,0 +1,85 @@
+import enum
+
+import pytest
+
+import constants
+import result_store
+from company_profile import CompanyProfile
+from result_store import ResultStore, agent_version, profile_version
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(path=str(tmp_path / "results.sqlite"))
+
+
+def test_profile_only_keys_profile_dependent_stages():
+    for stage in ("compliance", "risk_analysis"):
+        assert (
+            ResultStore.make_key(stage, "pdf", "profile A")[0]
+            != ResultStore.make_key(stage, "pdf", "profile B")[0]
+        )
+    for stage in ("checklist", "references"):
+        assert (
+            ResultStore.make_key(stage, "pdf", "profile A")[0]
+            == ResultStore.make_key(stage, "pdf", "profile B")[0]
+        )
+
+
+def test_key_covers_stage_pdf_and_agent_version():
+    key, parts = ResultStore.make_key("compliance", "pdf", "profile")
+    assert parts == ["compliance", "pdf", profile_version("profile"), parts[3]]
+    assert parts[3] == agent_version("compliance")
+    assert key != ResultStore.make_key("compliance", "other-pdf", "profile")[0]
+    assert key != ResultStore.make_key("risk_analysis", "pdf", "profile")[0]
+
+
+def test_agent_version_changes_with_store_version(monkeypatch):
+    before = agent_version("checklist")
+    monkeypatch.setattr(constants, "RESULT_STORE_VERSION", "bumped")
+    agent_version.cache_clear()
+    try:
+        assert agent_version("checklist") != before
+    finally:
+        agent_version.cache_clear()
+
+
+def test_profile_version_prefers_parsed_profile_version():
+    profile = CompanyProfile("Legal Name: Acme")
+    assert profile_version(profile) == profile.version
+    assert profile_version("a  b\n") == profile_version("a b")
+    assert profile_version(None) == profile_version("")
+
+
+def test_put_get_round_trip_and_get_many(store):
+    class Level(enum.Enum):
+        HIGH = "high"
+
+    store.put("checklist", "pdf", None, {"items": [Level.HIGH]})
+    store.put("compliance", "pdf", "profile A", {"score": 1})
+
+    assert store.get("checklist", "pdf", "any profile") == {"items": ["high"]}
+    assert store.get_many(
+        ["checklist", "compliance", "references"], "pdf", "profile A"
+    ) == {"checklist": {"items": ["high"]}, "compliance": {"score": 1}}
+    assert store.get("compliance", "pdf", "profile B") is None
+
+
+def test_errors_are_not_stored_and_unserialisable_values_are_skipped(store):
+    store.put("checklist", "pdf", None, {"error": "LLM timed out"})
+    store.put("references", "pdf", None, {"value": object()})
+
+    assert store.get_many(["checklist", "references"], "pdf") == {}
+    assert store.stats()["entries"] == 0
+
+
+def test_expired_results_miss(tmp_path):
+    store = ResultStore(path=str(tmp_path / "results.sqlite"), ttl=0)
+    store.put("checklist", "pdf", None, {"items": []})
+    assert store.get("checklist", "pdf") is None
+    assert store.stats() == {"hits": 0, "misses": 1, "entries": 1}
+
+
+def test_stage_sources_exist():
+    for stage in result_store.STAGE_SOURCES:
+        assert len(agent_version(stage)) == 16
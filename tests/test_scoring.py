@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from scoring import calculate_compliance_score, criterion_weights, score_reports
+
+
+def loop_score(compliance_dict):
+    """Purana per-criterion loop, parity ke reference ke liye"""
+
+    def give_weights(importance):
+        if "high" in importance:
+            return 60
+        elif "medium" in importance:
+            return 30
+        elif "low" in importance:
+            return 10
+        else:
+            return 60
+
+    total_weight = matched_weight = total_criteria = matched_criteria = 0
+    for criterion in compliance_dict.get("compliance_criteria", []):
+        weight = give_weights(str(criterion.get("importance", "")).lower())
+        total_weight += weight
+        total_criteria += 1
+        if criterion.get("matches", False):
+            matched_weight += weight
+            matched_criteria += 1
+
+    return {
+        "overall_eligibility_assessment": compliance_dict.get(
+            "overall_eligibility_assessment", ""
+        ),
+        "total_criteria_evaluated": total_criteria,
+        "criteria_matched": matched_criteria,
+        "score_percentage": (
+            round((matched_weight / total_weight) * 100, 2) if total_weight else 0.0
+        ),
+    }
+
+
+def random_report(rng):
+    importances = ["High", "importanceEnum.MEDIUM", "low", "", None, "critical"]
+    criteria = [
+        {"importance": rng.choice(importances), "matches": rng.random() < 0.5}
+        for _ in range(rng.randint(0, 12))
+    ]
+    for criterion in criteria:
+        if criterion["importance"] is None:
+            del criterion["importance"]
+    return {
+        "overall_eligibility_assessment": f"report {rng.random()}",
+        "compliance_criteria": criteria,
+    }
+
+
+def test_calculate_compliance_score_matches_loop():
+    rng = random.Random(7)
+    for _ in range(200):
+        report = random_report(rng)
+        assert calculate_compliance_score(report) == loop_score(report)
+
+
+def test_score_reports_matches_per_report_scores():
+    rng = random.Random(11)
+    reports = [random_report(rng) for _ in range(50)] + [{}]
+    frame = score_reports(reports)
+
+    assert len(frame) == len(reports)
+    for report, (_, row) in zip(reports, frame.iterrows()):
+        expected = loop_score(report)
+        assert row["total_criteria_evaluated"] == expected["total_criteria_evaluated"]
+        assert row["criteria_matched"] == expected["criteria_matched"]
+        assert row["score_percentage"] == expected["score_percentage"]
+
+
+def test_criterion_weights_use_first_matching_key():
+    weights = criterion_weights(
+        ["HIGH", "importanceEnum.medium", "Low", "unknown", "high-low"]
+    )
+    assert weights.tolist() == [60, 30, 10, 60, 60]
+
+
+def test_criterion_weights_custom_and_empty_weights():
+    assert criterion_weights(["a", "b"], {"a": 5}, default_weight=1).tolist() == [5, 1]
+    assert criterion_weights(["high", "low"], {}, default_weight=7).tolist() == [7, 7]
+
+
+@pytest.mark.parametrize("weights", [None, {}])
+def test_empty_report_scores_zero(weights):
+    assert calculate_compliance_score({}, weights)["score_percentage"] == 0.0
@@ -0,0 +1,166 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import constants
+from vector_store import LocalVectorStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalVectorStore("index", 4, directory=str(tmp_path), mode="exact")
+
+
+def unit(i):
+    vector = [0.0] * 4
+    vector[i] = 1.0
+    return vector
+
+
+def records():
+    return [
+        ("a#0", unit(0), {"source": "files/a.pdf", "page": 1}),
+        ("a#1", unit(1), {"source": "files/a.pdf", "page": 2}),
+        ("b#0", [0.9, 0.1, 0, 0], {"source": "files/b.pdf", "page": 1}),
+        ("c#0", unit(2), {"source": "files/c.pdf"}),
+    ]
+
+
+def ids(matches):
+    return [match["id"] for match in matches]
+
+
+def test_query_orders_by_cosine_score(store):
+    store.upsert(records(), "ns")
+
+    matches = store.query([2.0, 0, 0, 0], 2, "ns")
+
+    assert ids(matches) == ["a#0", "b#0"]
+    assert matches[0]["score"] == pytest.approx(1.0)
+    assert matches[0]["metadata"] == {"source": "files/a.pdf", "page": 1}
+
+
+@pytest.mark.parametrize(
+    "filter, expected",
+    [
+        ({"source": "files/b.pdf"}, {"b#0"}),
+        ({"source": {"$eq": "files/a.pdf"}}, {"a#0", "a#1"}),
+        ({"source": {"$ne": "files/a.pdf"}}, {"b#0", "c#0"}),
+        ({"source": {"$in": ["files/b.pdf", "files/c.pdf"]}}, {"b#0", "c#0"}),
+        ({"source": {"$nin": ["files/a.pdf"]}, "page": 1}, {"b#0"}),
+        ({"page": {"$in": [2]}}, {"a#1"}),
+        ({"source": "files/missing.pdf"}, set()),
+    ],
+)
+def test_metadata_filters(store, filter, expected):
+    store.upsert(records(), "ns")
+    assert set(ids(store.query(unit(0), 10, "ns", filter=filter))) == expected
+
+
+def test_unsupported_filter_operator(store):
+    store.upsert(records(), "ns")
+    with pytest.raises(ValueError):
+        store.query(unit(0), 1, "ns", filter={"page": {"$gt": 1}})
+
+
+def test_upsert_replaces_and_delete_hides_ids(store):
+    store.upsert(records(), "ns")
+    store.upsert([("a#0", unit(3), {"source": "files/a.pdf", "page": 9})], "ns")
+    store.delete(["b#0", "unknown"], "ns")
+
+    assert store.list_ids("a#", "ns") == {"a#0", "a#1"}
+    assert store.list_ids("", "ns") == {"a#0", "a#1", "c#0"}
+    assert store.fetch(["a#0", "b#0"], "ns") == {"a#0": unit(3)}
+    assert ids(store.query(unit(3), 1, "ns")) == ["a#0"]
+    assert "b#0" not in ids(store.query(unit(0), 10, "ns"))
+    assert store.describe()["namespaces"]["ns"]["vector_count"] == 3
+
+
+def test_namespaces_are_isolated(store):
+    store.upsert(records()[:1], "one")
+    store.upsert(records()[1:2], "two")
+
+    assert store.list_ids("", "one") == {"a#0"}
+    assert ids(store.query(unit(0), 5, "two")) == ["a#1"]
+    assert store.query(unit(0), 5, "empty") == []
+
+
+def test_other_process_writes_are_picked_up(tmp_path, store, monkeypatch):
+    store.upsert(records(), "ns")
+    assert store.list_ids("", "ns") == {"a#0", "a#1", "b#0", "c#0"}
+
+    writer = LocalVectorStore("index", 4, directory=str(tmp_path))
+    writer.delete(["a#0"], "ns")
+    writer.upsert([("d#0", unit(3), {})], "ns")
+
+    # Recheck interval ke andar cached namespace hi dikhta hai
+    assert "d#0" not in store.list_ids("", "ns")
+    monkeypatch.setattr(constants, "LOCAL_INDEX_RECHECK_INTERVAL", 0)
+    assert store.list_ids("", "ns") == {"a#1", "b#0", "c#0", "d#0"}
+
+
+def test_compaction_bounds_segments_and_keeps_data(tmp_path, store, monkeypatch):
+    monkeypatch.setattr(constants, "LOCAL_INDEX_MAX_SEGMENTS", 3)
+    for i in range(10):
+        store.upsert([(f"doc{i}", unit(i % 4), {"i": i})], "ns")
+    store.delete([f"doc{i}" for i in range(0, 10, 2)], "ns")
+
+    directory = os.path.join(str(tmp_path), "index", "ns")
+    with open(os.path.join(directory, "MANIFEST.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert len(manifest["segments"]) <= 3
+
+    # Retired segments agle write tak hi disk par rehte hai
+    store.upsert([("extra", unit(0), {})], "ns")
+    segments = {name for name in os.listdir(directory) if name.startswith("seg-")}
+    with open(os.path.join(directory, "MANIFEST.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert segments == set(manifest["segments"]) | set(manifest["retired"])
+
+    reopened = LocalVectorStore("index", 4, directory=str(tmp_path))
+    expected = {f"doc{i}" for i in range(1, 10, 2)} | {"extra"}
+    assert reopened.list_ids("", "ns") == expected
+    assert len(reopened.query(unit(1), 10, "ns")) == len(expected)
+
+
+def write_flat(directory, ids, vectors):
+    os.makedirs(directory)
+    np.save(os.path.join(directory, "vectors.npy"), np.asarray(vectors, np.float32))
+    with open(os.path.join(directory, "metadata.json"), "w", encoding="utf-8") as f:
+        json.dump({"ids": ids, "metadata": [{} for _ in ids]}, f)
+
+
+def test_loads_and_migrates_versioned_layout(tmp_path, store):
+    directory = os.path.join(str(tmp_path), "index", "ns")
+    write_flat(os.path.join(directory, "v-old"), ["x"], [unit(0)])
+    with open(os.path.join(directory, "CURRENT"), "w", encoding="utf-8") as f:
+        f.write("v-old")
+
+    assert ids(store.query(unit(0), 1, "ns")) == ["x"]
+
+    store.upsert([("y", unit(1), {})], "ns")
+    assert not os.path.exists(os.path.join(directory, "CURRENT"))
+    assert LocalVectorStore("index", 4, directory=str(tmp_path)).list_ids("", "ns") == {
+        "x",
+        "y",
+    }
+
+
+def test_loads_flat_layout(tmp_path, store):
+    write_flat(os.path.join(str(tmp_path), "index", "ns"), ["x", "y"], np.eye(2, 4))
+    store.delete(["y"], "ns")
+    assert ids(store.query(unit(1), 5, "ns")) == ["x"]
+
+
+def test_hnsw_mode_respects_filters_and_deletes(tmp_path):
+    pytest.importorskip("hnswlib")
+    store = LocalVectorStore("index", 4, directory=str(tmp_path), mode="hnsw")
+    store.upsert(records(), "ns")
+    store.upsert([("d#0", unit(3), {"source": "files/d.pdf"})], "ns")
+    store.delete(["a#0"], "ns")
+
+    assert ids(store.query(unit(0), 1, "ns")) == ["b#0"]
+    matches = store.query(unit(0), 5, "ns", filter={"source": "files/a.pdf"})
+    assert ids(matches) == ["a#1"]
@@ -0,0 +1,68 @@
+import os
+
+from agents.verdict_cache import VerdictCache, normalise_requirement
+from company_profile import CompanyProfile, load_company_profile
+
+PROFILE = """Company Legal Name
+Acme Staffing LLC
+NAICS Codes
+561320, 561311
+Company Length of Existence
+12 years
+Minority Business Certification
+Not certified
+Texas HUB License
+Active
+Serves all of Texas"""
+
+
+def test_profile_parse_and_structured_fields():
+    profile = CompanyProfile(PROFILE)
+
+    assert profile.legal_name == "Acme Staffing LLC"
+    assert profile.naics_codes == ["561320", "561311"]
+    assert profile.years_in_business == 12.0
+    assert profile.certifications == ["Texas HUB License: Active"]
+    assert profile.notes == ["Serves all of Texas"]
+    assert CompanyProfile("Legal Name: Acme\nDUNS: 123").get("duns") == "123"
+
+
+def test_profile_version_ignores_whitespace_only_edits():
+    assert CompanyProfile(PROFILE).version == CompanyProfile(PROFILE + "\n\n").version
+    assert CompanyProfile(PROFILE).version != CompanyProfile(PROFILE + "!").version
+
+
+def test_load_company_profile_reparses_on_mtime_change(tmp_path):
+    path = tmp_path / "profile.txt"
+    path.write_text(PROFILE, encoding="utf-8")
+
+    first = load_company_profile(str(path))
+    assert load_company_profile(str(path)) is first
+
+    path.write_text(PROFILE.replace("Acme", "Apex"), encoding="utf-8")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    assert load_company_profile(str(path)).legal_name == "Apex Staffing LLC"
+
+
+def test_normalise_requirement_drops_filler_and_punctuation():
+    assert normalise_requirement(
+        "The bidder must have a minimum of 3 years experience."
+    ) == normalise_requirement("minimum 3 years experience")
+    assert normalise_requirement("$1.5M coverage") == "$1.5m coverage"
+
+
+def test_verdict_cache_keys_on_requirement_and_profile_version(tmp_path):
+    cache = VerdictCache(db_path=str(tmp_path / "verdicts.sqlite"))
+    verdict = {"matches": True, "reason": "on file"}
+
+    cache.put("Offeror shall submit a W-9.", "v1", verdict)
+
+    assert cache.get("submit W-9", "v1") == verdict
+    assert cache.get("submit W-9", "v2") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_verdict_cache_ttl(tmp_path):
+    cache = VerdictCache(db_path=str(tmp_path / "verdicts.sqlite"), ttl=0)
+    cache.put("Submit a W-9", "v1", {"matches": False})
+    assert cache.get("Submit a W-9", "v1") is None